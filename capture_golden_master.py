@@ -196,6 +196,7 @@ def run_multi_agent_scenario():
         obs = env._get_obs()
         random.shuffle(agents)
         
+        batch = []
         for agent in agents:
             # We assume agent.decide() returns an action dict
             # Standardizing agent interface is part of refactor, but here we use what exists
@@ -205,17 +206,19 @@ def run_multi_agent_scenario():
             if action['type'] == 'LIMIT':
                 action['id'] = f"{agent.agent_id}_{t}_{random.randint(100,999)}"
             
-            # Step
             if action['type'] != 'HOLD':
-                obs_res, _, _, info = env.step(action)
-                
-                interaction_logger.log_interaction(
-                    agent_id=agent.agent_id,
-                    action=action['type'],
-                    state=obs['mid_price'],
-                    reward=0,
-                    metadata={"full_action": action, "info": info}
-                )
+                batch.append((agent, action))
+        
+        # Step: every agent decided on the same obs, so match the tick as one batch
+        _, infos = env.step_many([action for _, action in batch])
+        for (agent, action), info in zip(batch, infos):
+            interaction_logger.log_interaction(
+                agent_id=agent.agent_id,
+                action=action['type'],
+                state=obs['mid_price'],
+                reward=0,
+                metadata={"full_action": action, "info": info}
+            )
 
     save_final_state(path, {
         "mid_price": env._get_mid_price(),
@@ -266,15 +269,19 @@ def run_stress_scenario():
     for t in range(config["steps"]):
         obs = env._get_obs()
         # No shock, just chaotic trading
+        batch = []
         for agent in agents:
             # Force high activity? 
             # Normal logic for now, verifying determinism of "many agents"
             action = agent.decide(obs)
             if action['type'] == 'LIMIT':
                 action['id'] = f"{agent.agent_id}_{t}_{random.randint(1000,9999)}"
-                obs_res, _, _, info = env.step(action)
-                if info.get('trades'):
-                     interaction_logger.log_interaction(agent.agent_id, "TRADE", obs['mid_price'], 0, info)
+                batch.append((agent, action))
+        
+        _, infos = env.step_many([action for _, action in batch])
+        for (agent, action), info in zip(batch, infos):
+            if info.get('trades'):
+                 interaction_logger.log_interaction(agent.agent_id, "TRADE", obs['mid_price'], 0, info)
                      
     save_final_state(path, env.portfolios)
     logger.info(f"Finished {scenario_name}")
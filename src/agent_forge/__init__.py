@@ -2,7 +2,7 @@ __version__ = "0.2.0"
 
 # Explicitly export the public API
 from agent_forge.environments.grid_world import GridWorld
-from agent_forge.environments.order_book_env import OrderBookEnv, OrderBook
+from agent_forge.environments.order_book_env import OrderBookEnv, OrderBook, PriceLevelOrderBook
 from agent_forge.agents.learning_agent import LearningGridAgent
 from agent_forge.agents.strategy_agents import MomentumTrader, MeanReversionTrader
 from agent_forge.models.decision_model import GridDecisionModel, ModelConfig
@@ -13,6 +13,7 @@ __all__ = [
     "GridWorld",
     "OrderBookEnv",
     "OrderBook",
+    "PriceLevelOrderBook",
     "LearningGridAgent",
     "MomentumTrader",
     "MeanReversionTrader",
@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
+from agent_forge.environments.order_book_env import MarketDataBook
 import numpy as np
 
 class StrategyAgent(BaseAgent):
@@ -10,6 +11,12 @@ class StrategyAgent(BaseAgent):
         # or we just blindly emit orders for this simple test.
         self.last_price = 100.0
         self.price_history = []
+        # Local L2 view, maintained when the env runs in delta mode
+        self.market = MarketDataBook()
+        # Market view of the current decision
+        self.mid_price: Optional[float] = None
+        self.best_bid: Optional[float] = None
+        self.best_ask: Optional[float] = None
 
     async def process_task(self, task: Any) -> Dict[str, Any]:
         # Task is essentially "Market Update" -> "Action"
@@ -21,8 +28,21 @@ class StrategyAgent(BaseAgent):
     def decide(self, obs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Synchronous decision method for the manual test loop.
+        Accepts full observations or OrderBookEnv delta-mode frames. Frames only
+        carry the levels that changed, so those decisions read the maintained book;
+        while it is out of sync (a missed frame) the agent holds.
         """
-        mid = obs['mid_price']
+        if 'type' in obs:
+            if not self.market.apply(obs):
+                return self._hold()
+            self.best_bid, self.best_ask = self.market.best_bid(), self.market.best_ask()
+            mid = self.market.mid_price
+        else:
+            snapshot = obs['market_snapshot']
+            self.best_bid = snapshot['bids'][0]['price'] if snapshot['bids'] else None
+            self.best_ask = snapshot['asks'][0]['price'] if snapshot['asks'] else None
+            mid = obs['mid_price']
+        self.mid_price = mid
         self.price_history.append(mid)
         if len(self.price_history) > 20:
             self.price_history.pop(0)
@@ -31,16 +51,19 @@ class StrategyAgent(BaseAgent):
         self.last_price = mid
         return action
 
-    def _strategy_logic(self, obs: Dict[str, Any]) -> Dict[str, Any]:
+    def _hold(self) -> Dict[str, Any]:
         return {'type': 'HOLD', 'id': 'noop', 'agent_id': self.agent_id}
 
+    def _strategy_logic(self, obs: Dict[str, Any]) -> Dict[str, Any]:
+        return self._hold()
+
 class MomentumTrader(StrategyAgent):
     def __init__(self, agent_id: str, start_cash: float, threshold: float = 0.5, message_bus=None):
         super().__init__(agent_id, start_cash, message_bus=message_bus)
         self.threshold = threshold
 
     def _strategy_logic(self, obs: Dict[str, Any]) -> Dict[str, Any]:
-        mid = obs['mid_price']
+        mid = self.mid_price
         change = mid - self.last_price
         
         # If price rose significantly, BUY (Herding)
@@ -67,7 +90,7 @@ class MeanReversionTrader(StrategyAgent):
             return {'type': 'HOLD', 'id': 'noop', 'agent_id': self.agent_id}
             
         avg = np.mean(self.price_history[-self.window:])
-        mid = obs['mid_price']
+        mid = self.mid_price
         
         # If Price > Avg + Dev, SELL (Overvalued)
         if mid > avg + self.deviation:
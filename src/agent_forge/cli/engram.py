@@ -13,9 +13,20 @@ def cli():
 
 
 @cli.command()
-def tui():
+@click.option('--simulate', type=int, default=0, help='Run a live simulation with N agents inside the TUI')
+@click.option('--justice-log', type=click.Path(), default=None,
+              help='Justice Log for incidents (recorded to when simulating, read-only otherwise)')
+def tui(simulate, justice_log):
     """Launch the Terminal UI (default interface)"""
-    run_tui()
+    if simulate:
+        from agent_forge.core.runner import HeadlessRunner
+        config = {"justice_log": justice_log} if justice_log else None
+        run_tui(runner=HeadlessRunner(), num_agents=simulate, config=config)
+    elif justice_log:
+        from agent_forge.core.justice_log import JusticeLogger
+        run_tui(justice_log=JusticeLogger(justice_log, readonly=True))
+    else:
+        run_tui()
 
 
 @cli.command()
@@ -52,13 +63,16 @@ def verify_pird(pird_file, public_key):
 
 
 @cli.command()
-def verify_logs():
+@click.option('--full', is_flag=True, help='Audit every segment instead of resuming from the last checkpoint')
+@click.option('--workers', type=int, default=None, help='Processes for a full audit (default: CPU count)')
+def verify_logs(full, workers):
     """Verify integrity of the Justice Log (hash chain)"""
-    from agent_forge.core.justice_log import get_justice_logger
+    from agent_forge.core.justice_log import JusticeLogger
     
     click.echo("Verifying Justice Log integrity...")
-    justice_log = get_justice_logger()
-    result = justice_log.verify_integrity()
+    # Read-only: a running simulation may be appending to the same log
+    justice_log = JusticeLogger(readonly=True)
+    result = justice_log.verify_integrity(full=full, workers=workers)
     
     if result['valid']:
         click.echo(click.style(f"✓ VERIFIED", fg='green', bold=True))
@@ -75,10 +89,10 @@ def verify_logs():
 @click.option('--output', type=click.Path(), help='Output path for manifest (optional)')
 def seal_logs(output):
     """Seal logs and generate tamper-proof manifest"""
-    from agent_forge.core.justice_log import get_justice_logger
+    from agent_forge.core.justice_log import JusticeLogger
     
     click.echo("Sealing Justice Log...")
-    justice_log = get_justice_logger()
+    justice_log = JusticeLogger(readonly=True)
     manifest = justice_log.seal()
     
     click.echo(click.style("✓ Log sealed successfully", fg='green'))
@@ -60,15 +60,22 @@ class BaseAgent(ABC):
         import yaml
         
         db_path = "data/memory.db"
+        storage = {}
         try:
             with open("config/settings.yaml", "r") as f:
                 config = yaml.safe_load(f)
                 if "storage" in config:
-                    db_path = config["storage"].get("path", db_path)
+                    storage = config["storage"] or {}
+                    db_path = storage.get("path", db_path)
         except Exception:
             pass # Use default
             
-        self.memory_module = Memory(db_path=db_path)
+        # Group commit: agents sharing the DB file coalesce their activity rows into periodic transactions
+        self.memory_module = Memory(
+            db_path=db_path,
+            group_commit=storage.get("group_commit", False),
+            commit_interval=storage.get("commit_interval", 0.05)
+        )
 
     async def stop(self):
         """Stops the agent and cleans up subscriptions."""
@@ -28,6 +28,24 @@ class BaseEnvironment(ABC):
         """
         pass
 
+    def step_batch(self, actions: Dict[str, Any]) -> Dict[str, Tuple[Any, float, bool, Dict[str, Any]]]:
+        """
+        Executes one lockstep tick for several agents.
+        Args:
+            actions: Mapping of agent_id -> action, applied in insertion order.
+        Returns:
+            Mapping of agent_id -> (observation, reward, done, info).
+        Environments that can update all agents at once should override this;
+        the default simply steps each agent in turn.
+        """
+        results = {}
+        for agent_id, action in actions.items():
+            try:
+                results[agent_id] = self.step(action, agent_id=agent_id)
+            except TypeError:
+                results[agent_id] = self.step(action)
+        return results
+
     def render(self):
         """Optional method to visualize the environment."""
         pass
@@ -1,6 +1,10 @@
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 import logging
+import time
+
+import numpy as np
 
 logger = logging.getLogger("Compliance")
 
@@ -12,74 +16,251 @@ class Violation:
     context: Dict[str, Any]
     severity: str = "warning" # warning, error, critical
 
-class ComplianceAuditor:
-    def __init__(self, grid_size: int = 10):
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Declarative invariant on one field of an agent state.
+    check: "lt"          -> violated when value < limit
+           "out_of_grid" -> violated when a position is outside 0..grid_size-1
+    message is formatted with value, grid_size and grid_max.
+    """
+    rule_id: str
+    field: str
+    check: str
+    limit: float = 0.0
+    severity: str = "warning"
+    message: str = ""
+    default: Any = None # Value used when the field is missing (None = rule skipped)
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    # Physics: Battery must be >= 0.0. Allow 0.0 (Dead), but not negative.
+    Rule("PHYSICS_BATTERY_NEGATIVE", "battery", "lt", 0.0, "critical", "Battery level negative: {value:.2f}", default=0.0),
+    Rule("PHYSICS_BATTERY_LOW", "battery", "lt", 15.0, "warning", "Battery level low: {value:.2f}%", default=0.0),
+    Rule("PHYSICS_BATTERY_DEGRADED", "battery", "lt", 30.0, "warning", "Battery level degraded: {value:.2f}%", default=0.0),
+    # Boundary: 0 <= x < size, 0 <= y < size
+    Rule("BOUNDARY_OUT_OF_BOUNDS", "position", "out_of_grid",
+         message="Position {value} is out of grid bounds (0-{grid_max})"),
+)
+
+_CHECKS = ("lt", "out_of_grid")
+
+
+class CompiledRules:
+    """
+    A rule set compiled once for a grid size.
+    Scalar path (one state): per field, a single comparison against the loosest
+    "lt" limit skips all of that field's threshold rules for healthy agents.
+    Batch path (many states): each rule is one vectorized predicate over columns.
+    Hits are always reported in rule order.
+    """
+    def __init__(self, rules: Sequence[Rule], grid_size: int):
+        for rule in rules:
+            if rule.check not in _CHECKS:
+                raise ValueError(f"Rule {rule.rule_id}: unknown check '{rule.check}'")
+        self.rules = tuple(rules)
         self.grid_size = grid_size
-        self.violations: List[Violation] = []
+        self.fields = tuple(dict.fromkeys(rule.field for rule in self.rules))
+        self.defaults = {rule.field: rule.default for rule in self.rules}
+        self.grid_fields = {rule.field for rule in self.rules if rule.check == "out_of_grid"}
+        self._check = self._compile_scalar()
+
+    def _compile_scalar(self):
+        """
+        Builds one predicate for the whole rule set from per-field plans:
+        (field, default, ceiling, ((order, limit), ...), grid rule orders).
+        A field's loosest "lt" limit is its ceiling; values at or above it can't
+        violate any of that field's threshold rules, so healthy states cost one
+        lookup and one comparison per field.
+        """
+        plans = []
+        for field in self.fields:
+            limits = tuple((order, rule.limit) for order, rule in enumerate(self.rules)
+                           if rule.field == field and rule.check == "lt")
+            grid_orders = tuple(order for order, rule in enumerate(self.rules)
+                                if rule.field == field and rule.check == "out_of_grid")
+            ceiling = max(limit for _, limit in limits) if limits else None
+            plans.append((field, self.defaults[field], ceiling, limits, grid_orders))
+        plans = tuple(plans)
+        grid_size = self.grid_size
+
+        def check(state: Dict[str, Any]) -> Optional[List[Tuple[int, Any]]]:
+            hits = None
+            for field, default, ceiling, limits, grid_orders in plans:
+                value = state.get(field, default)
+                if limits and value is not None and value < ceiling:
+                    hits = hits or []
+                    for order, limit in limits:
+                        if value < limit:
+                            hits.append((order, value))
+                if grid_orders and value:
+                    x, y = value
+                    if not (0 <= x < grid_size and 0 <= y < grid_size):
+                        hits = hits or []
+                        hits.extend((order, value) for order in grid_orders)
+            return hits
+
+        return check
+
+    def evaluate(self, state: Dict[str, Any]) -> List[Tuple[Rule, Any]]:
+        """(rule, value) for each rule the state violates"""
+        hits = self._check(state)
+        if not hits:
+            return []
+        if len(hits) > 1:
+            hits.sort(key=lambda hit: hit[0])
+        return [(self.rules[order], value) for order, value in hits]
+
+    def evaluate_columns(self, columns: Dict[str, np.ndarray]) -> List[Tuple[Rule, np.ndarray]]:
+        """
+        (rule, indexes of violating rows) for each rule with hits.
+        Columns: scalar fields as float arrays (NaN = missing), "position" as an (N, 2) array.
+        """
+        hits = []
+        for rule in self.rules:
+            column = columns.get(rule.field)
+            if column is None:
+                continue
+            if rule.check == "lt":
+                mask = column < rule.limit # NaN compares False
+            else:
+                mask = ((column < 0) | (column >= self.grid_size)).any(axis=1)
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                hits.append((rule, rows))
+        return hits
+
+
+class _RateLimitedLog:
+    """
+    Logs the first occurrence of each (agent, rule) and then at most once per
+    interval, with a count of the repeats suppressed in between.
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._last: Dict[Tuple[str, str], float] = {}
+        self._suppressed: Counter = Counter()
+
+    def emit(self, v: Violation, now: float):
+        key = (v.agent_id, v.rule_id)
+        last = self._last.get(key)
+        if last is not None and now - last < self.interval:
+            self._suppressed[key] += 1
+            return
+        self._last[key] = now
+        repeats = self._suppressed.pop(key, 0)
+        suffix = f" (+{repeats} repeats suppressed)" if repeats else ""
+        logger.error(f"[AUDIT VIOLATION] Agent:{v.agent_id} Rule:{v.rule_id} Msg:{v.message}{suffix}")
+
+    def reset(self):
+        self._last.clear()
+        self._suppressed.clear()
+
+
+class ComplianceAuditor:
+    def __init__(self, grid_size: int = 10, rules: Optional[Sequence[Rule]] = None,
+                 max_violations: int = 1000, log_interval: float = 5.0, batch_threshold: int = 32):
+        self._rules = tuple(DEFAULT_RULES if rules is None else rules)
+        self._grid_size = grid_size
+        self.compiled = CompiledRules(self._rules, grid_size)
+        # Most recent violations only; totals are kept per rule
+        self.violations: deque = deque(maxlen=max_violations)
+        self.violation_counts: Counter = Counter()
+        self._log = _RateLimitedLog(log_interval)
+        # Below this many states, audit_batch uses the scalar path (numpy setup costs more)
+        self.batch_threshold = batch_threshold
+
+    @property
+    def grid_size(self) -> int:
+        return self._grid_size
+
+    @grid_size.setter
+    def grid_size(self, value: int):
+        self._grid_size = value
+        self.compiled = CompiledRules(self._rules, value)
+
+    def set_rules(self, rules: Sequence[Rule]):
+        """Replaces the rule set (compiled once, here)"""
+        self._rules = tuple(rules)
+        self.compiled = CompiledRules(self._rules, self._grid_size)
+
+    def _violation(self, agent_id: str, rule: Rule, value: Any) -> Violation:
+        if rule.check == "out_of_grid":
+            context = {rule.field: value, "grid_size": self._grid_size}
+        else:
+            context = {rule.field: value}
+        message = rule.message.format(value=value, grid_size=self._grid_size, grid_max=self._grid_size - 1)
+        return Violation(agent_id=agent_id, rule_id=rule.rule_id, message=message,
+                         context=context, severity=rule.severity)
+
+    def _record(self, found: Iterable[Violation]):
+        now = time.monotonic()
+        for v in found:
+            self._log.emit(v, now)
+            self.violations.append(v)
+            self.violation_counts[v.rule_id] += 1
 
     def audit_state(self, agent_id: str, state: Dict[str, Any]) -> List[Violation]:
         """
         Checks a single agent state for invariant violations.
         Returns a list of violations found.
         """
-        current_violations = []
-        
-        # 1. Physics: Battery Check
-        # Invariant: Battery must be >= 0.0
-        # Allow 0.0 (Dead), but not negative.
-        battery = state.get("battery", 0.0)
-        if battery < 0.0:
-            v = Violation(
-                agent_id=agent_id,
-                rule_id="PHYSICS_BATTERY_NEGATIVE",
-                message=f"Battery level negative: {battery:.2f}",
-                context={"battery": battery},
-                severity="critical"
-            )
-            current_violations.append(v)
-        if battery < 15.0:
-            v = Violation(
-                agent_id=agent_id,
-                rule_id="PHYSICS_BATTERY_LOW",
-                message=f"Battery level low: {battery:.2f}%",
-                context={"battery": battery},
-                severity="warning"
-            )
-            current_violations.append(v)
-        if battery < 30.0:
-            v = Violation(
-                agent_id=agent_id,
-                rule_id="PHYSICS_BATTERY_DEGRADED",
-                message=f"Battery level degraded: {battery:.2f}%",
-                context={"battery": battery},
-                severity="warning"
-            )
-            current_violations.append(v)
-        
-        # Log Violations
-        # To avoid double-logging if multiple hit, maybe we filter? 
-        # But for RiskMonitor, we WANT multiple hits.
-            
-        # 2. Boundary: Position Check
-        # Invariant: 0 <= x < size, 0 <= y < size
-        pos = state.get("position")
-        if pos:
-            x, y = pos
-            if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
-                v = Violation(
-                    agent_id=agent_id,
-                    rule_id="BOUNDARY_OUT_OF_BOUNDS",
-                    message=f"Position {pos} is out of grid bounds (0-{self.grid_size-1})",
-                    context={"position": pos, "grid_size": self.grid_size}
-                )
-                current_violations.append(v)
-                
-        # Log Violations
-        for v in current_violations:
-            logger.error(f"[AUDIT VIOLATION] Agent:{v.agent_id} Rule:{v.rule_id} Msg:{v.message}")
-            self.violations.append(v)
-            
+        hits = self.compiled.evaluate(state)
+        if not hits:
+            return []
+        current_violations = [self._violation(agent_id, rule, value) for rule, value in hits]
+        self._record(current_violations)
         return current_violations
 
+    def audit_batch(self, states: Dict[str, Dict[str, Any]]) -> Dict[str, List[Violation]]:
+        """
+        Checks many agent states in one pass.
+        Returns agent_id -> violations (in the same order audit_state would produce).
+        """
+        if len(states) < self.batch_threshold:
+            return {agent_id: self.audit_state(agent_id, state) for agent_id, state in states.items()}
+
+        agent_ids = list(states)
+        rows = [states[a] for a in agent_ids]
+        columns = {}
+        for field in self.compiled.fields:
+            if field in self.compiled.grid_fields:
+                # Missing positions are skipped by the scalar path; (0, 0) never violates
+                columns[field] = np.array([row.get(field) or (0, 0) for row in rows], dtype=float)
+            else:
+                default = self.compiled.defaults[field]
+                values = (row.get(field, default) for row in rows)
+                columns[field] = np.fromiter((np.nan if v is None else v for v in values),
+                                             dtype=float, count=len(rows))
+        return self.audit_arrays(agent_ids, columns, states)
+
+    def audit_arrays(self, agent_ids: Sequence[str], columns: Dict[str, np.ndarray],
+                     states: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, List[Violation]]:
+        """
+        Checks agent states given as columns (see CompiledRules.evaluate_columns).
+        Returns agent_id -> violations for every agent in agent_ids.
+        """
+        hits_by_row: Dict[int, List[Violation]] = {}
+        for rule, rows in self.compiled.evaluate_columns(columns):
+            column = columns[rule.field]
+            for row in rows.tolist():
+                agent_id = agent_ids[row]
+                if states is not None:
+                    value = states[agent_id].get(rule.field, rule.default)
+                elif column.ndim > 1:
+                    value = tuple(column[row].tolist())
+                else:
+                    value = float(column[row])
+                hits_by_row.setdefault(row, []).append(self._violation(agent_id, rule, value))
+
+        result = {agent_id: [] for agent_id in agent_ids}
+        for row in sorted(hits_by_row):
+            result[agent_ids[row]] = hits_by_row[row]
+            self._record(hits_by_row[row])
+        return result
+
     def reset(self):
-        self.violations = []
+        self.violations.clear()
+        self.violation_counts.clear()
+        self._log.reset()
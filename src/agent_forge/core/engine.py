@@ -2,13 +2,15 @@ import time
 import random
 import asyncio
 import inspect
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set
 from agent_forge.core.base_env import BaseEnvironment
 from agent_forge.utils.interaction_logger import InteractionLogger
 from agent_forge.utils.logger import get_logger
 from agent_forge.core.adversarial import AdversarialMiddleware, AdversarialConfig
 from agent_forge.core.compliance import ComplianceAuditor
 from agent_forge.core.risk import RiskMonitor
+from agent_forge.core.step_executor import StepExecutor, step_env, step_batch
+from agent_forge.core.state_delta import StateDeltaEncoder
 
 sys_logger = get_logger("Engine")
 
@@ -16,9 +18,27 @@ class SimulationEngine:
     def __init__(self, 
                  env: Optional[BaseEnvironment] = None, 
                  logger: Optional[InteractionLogger] = None,
-                 stress_config: Optional[Dict[str, Any]] = None):
+                 stress_config: Optional[Dict[str, Any]] = None,
+                 lockstep: bool = False,
+                 tick_timeout: Optional[float] = None,
+                 step_mode: str = "thread",
+                 step_workers: int = 4,
+                 delta_updates: bool = False):
         """
-        ...
+        Args:
+            env: The underlying environment to simulate.
+            logger: Optional logger for persisting interactions.
+            stress_config: Configuration for stress testing (latency, failures).
+            lockstep: If True, perform_action waits until every registered agent
+                      has submitted an action and applies them in one env.step_batch call.
+            tick_timeout: Optional max seconds a lockstep tick waits for stragglers
+                          before running with the actions it has.
+            step_mode: How env.step runs: "thread" (bounded pool, enforces step_timeout),
+                       "inline" (on the loop) or "auto" (opt-in: inline vs thread, picked
+                       from measured step cost; inline steps can't time out).
+            step_workers: Size of the step thread pool.
+            delta_updates: If True, on_step_callback receives compact "delta" frames
+                           (changed agent fields + events) instead of full step updates.
         """
         self.env = env
         self.logger = logger
@@ -47,19 +67,47 @@ class SimulationEngine:
             drop_rate=stress_config.get("drop_rate", 0.0) if stress_config else 0.0,  # Separate from failure_rate
         )
         self.adversary = AdversarialMiddleware(adv_conf)
+
+        # Step execution (inline / thread pool)
+        self.executor = StepExecutor(mode=step_mode, max_workers=step_workers)
         
+        # Live feed encoding
+        self.delta_updates = delta_updates
+        self._deltas = StateDeltaEncoder()
+
         # State cache for agents
         self._current_observation = None
         self._last_reward = 0.0
         self._last_done = False
         self._last_info = {}
         
+        # Lockstep tick state
+        self.lockstep = lockstep
+        self.tick_timeout = tick_timeout
+        self._registered_agents: Set[str] = set()
+        self._pending_actions: Dict[str, Any] = {}
+        self._pending_results: Dict[str, asyncio.Future] = {}
+        self._tick_timer: Optional[asyncio.TimerHandle] = None
+        self._tick_running = False
+        self._agent_feedback: Dict[str, Dict[str, Any]] = {}
+
         # Initialize
         self._sequence_id = 0
         self._pause_event = asyncio.Event()
         self._pause_event.set() # Start unpaused
         self.reset()
 
+    def set_step_mode(self, mode: str, max_workers: Optional[int] = None):
+        """Replaces the step executor, e.g. when a session is reconfigured."""
+        # Built first, so an invalid mode leaves the current executor in place
+        executor = StepExecutor(mode=mode, max_workers=max_workers or self.executor.max_workers)
+        self.executor.close()
+        self.executor = executor
+
+    def shutdown(self):
+        """Releases the step executor's worker threads."""
+        self.executor.close()
+
     def set_env(self, env: BaseEnvironment):
         """Swaps the environment and resets the state."""
         self.env = env
@@ -82,8 +130,34 @@ class SimulationEngine:
         self._last_reward = 0.0
         self._last_done = False
         self._last_info = {}
+        self._agent_feedback = {}
+        self._deltas.reset()
         return self._current_observation
 
+    def register_agent(self, agent_id: str):
+        """Adds an agent to the lockstep barrier."""
+        self._registered_agents.add(agent_id)
+
+    def unregister_agent(self, agent_id: str):
+        """Removes an agent from the lockstep barrier, releasing a tick that only waited on it."""
+        self._registered_agents.discard(agent_id)
+        if self._pending_actions and self._registered_agents.issubset(self._pending_actions):
+            asyncio.ensure_future(self._flush_tick())
+
+    def clear_agents(self):
+        """Empties the lockstep barrier, e.g. before a session registers a new agent set."""
+        self._registered_agents.clear()
+
+    def is_occupied(self, pos: Any, exclude_agent: Optional[str] = None) -> bool:
+        """Collision-avoidance query, answered by the env's occupancy index when it has one."""
+        if hasattr(self.env, "is_occupied"):
+            return self.env.is_occupied(pos, exclude_agent=exclude_agent)
+        # Fallback: linear scan for envs without an index
+        for aid, state in getattr(self.env, "agents", {}).items():
+            if aid != exclude_agent and isinstance(state, dict) and state.get("position") == pos:
+                return True
+        return False
+
     async def _apply_stress(self):
         """Applies artificial latency or failures based on config."""
         # Latency
@@ -127,23 +201,19 @@ class SimulationEngine:
             
             # Check Pause
             await self._pause_event.wait()
+
+            if self.lockstep:
+                return await self._submit_lockstep(agent_id, action)
             
             if self._last_done:
                 return False
 
             # Execute step
             step_timeout = self.stress_config.get("step_timeout", 60.0) # Default 60s
-            
-            def _step_wrapper():
-                 try:
-                     return self.env.step(action, agent_id=agent_id)
-                 except TypeError:
-                     return self.env.step(action)
 
             try:
-                obs, reward, done, info = await asyncio.wait_for(
-                    asyncio.to_thread(_step_wrapper), 
-                    timeout=step_timeout
+                obs, reward, done, info = await self.executor.run(
+                    self.env, step_env, agent_id, action, timeout=step_timeout
                 )
             except asyncio.TimeoutError:
                 raise Exception(f"Agent {agent_id} Deadlocked: Step timeout after {step_timeout}s")
@@ -152,30 +222,7 @@ class SimulationEngine:
             info["duration"] = duration
             
             # Audit Check
-            violations = self.auditor.audit_state(agent_id, obs)
-            if violations:
-                # Risk Trace Integration
-                violation_dicts = []
-                for v in violations:
-                    violation_dicts.append({
-                        "rule": v.rule_id, 
-                        "message": v.message, 
-                        "context": v.context, 
-                        "severity": v.severity,
-                        "step_duration": info.get("duration")
-                    })
-                self.risk_monitor.record_violations(agent_id, violation_dicts)
-
-                # Convert Violation objects to dicts for JSON serialization
-                info["violations"] = [
-                    {"rule": v.rule_id, "msg": v.message, "context": v.context, "severity": v.severity} 
-                    for v in violations
-                ]
-
-                # Check for critical violations
-                critical_violations = [v for v in violations if v.severity == "critical"]
-                if critical_violations:
-                    raise Exception(f"Critical Compliance Violation: {critical_violations[0].message}")
+            self._audit_step(agent_id, obs, info)
             
             # Update internal state
             self._current_observation = obs
@@ -198,7 +245,12 @@ class SimulationEngine:
                     state_hash=state_hash
                 )
 
-            if self.on_step_callback:
+            if self.on_step_callback and self.delta_updates:
+                self._sequence_id += 1
+                update = self._deltas.frame(self._sequence_id, {agent_id: obs}, {agent_id: info})
+                if update:
+                    await self._emit(update)
+            elif self.on_step_callback:
                 # Broadcast the full state delta or snapshot
                 # For MVP, we send the agent's observation update
                 # Ideally we send the Full Env State if possible
@@ -215,10 +267,7 @@ class SimulationEngine:
                     "info": info,
                     "timestamp": time.time()
                 }
-                if inspect.iscoroutinefunction(self.on_step_callback):
-                    await self.on_step_callback(update)
-                else:
-                    self.on_step_callback(update)
+                await self._emit(update)
                 
             return not done
             
@@ -226,11 +275,201 @@ class SimulationEngine:
             await self._broadcast_error(agent_id, e, "engine_critical_failure")
             return False
 
+    def _audit_step(self, agent_id: str, obs: Any, info: Dict[str, Any]):
+        """Runs the compliance audit for one agent step, raising on critical violations."""
+        self._handle_violations(agent_id, self.auditor.audit_state(agent_id, obs), info)
+
+    def _handle_violations(self, agent_id: str, violations: List[Any], info: Dict[str, Any]):
+        """Reports an agent's violations to the risk monitor and info, raising on critical ones."""
+        if violations:
+            # Risk Trace Integration
+            violation_dicts = []
+            for v in violations:
+                violation_dicts.append({
+                    "rule": v.rule_id, 
+                    "message": v.message, 
+                    "context": v.context, 
+                    "severity": v.severity,
+                    "step_duration": info.get("duration")
+                })
+            self.risk_monitor.record_violations(agent_id, violation_dicts)
+
+            # Convert Violation objects to dicts for JSON serialization
+            info["violations"] = [
+                {"rule": v.rule_id, "msg": v.message, "context": v.context, "severity": v.severity} 
+                for v in violations
+            ]
+
+            # Check for critical violations
+            critical_violations = [v for v in violations if v.severity == "critical"]
+            if critical_violations:
+                raise Exception(f"Critical Compliance Violation: {critical_violations[0].message}")
+
+    async def _submit_lockstep(self, agent_id: str, action: Any) -> bool:
+        """Queues an action for the current tick and waits for the tick to run."""
+        if agent_id not in self._registered_agents:
+            self.register_agent(agent_id)
+
+        # One action per agent per tick: a second submission waits for the next tick
+        while agent_id in self._pending_results:
+            await asyncio.shield(self._pending_results[agent_id])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_actions[agent_id] = action
+        self._pending_results[agent_id] = future
+
+        if self._registered_agents.issubset(self._pending_actions):
+            await self._flush_tick()
+        else:
+            self._arm_tick_timer()
+        return await future
+
+    def _arm_tick_timer(self):
+        if self.tick_timeout is not None and self._tick_timer is None:
+            self._tick_timer = asyncio.get_running_loop().call_later(
+                self.tick_timeout, lambda: asyncio.ensure_future(self._flush_tick())
+            )
+
+    async def _flush_tick(self):
+        """Runs the pending lockstep tick and resolves every waiting agent."""
+        if self._tick_timer:
+            self._tick_timer.cancel()
+            self._tick_timer = None
+        # One tick at a time: actions queued meanwhile are picked up when it finishes
+        if self._tick_running or not self._pending_actions:
+            return
+
+        actions, futures = self._pending_actions, self._pending_results
+        self._pending_actions, self._pending_results = {}, {}
+
+        self._tick_running = True
+        results: Dict[str, bool] = {}
+        try:
+            results = await self.step_tick(actions)
+        finally:
+            self._tick_running = False
+            # Resolve every waiter, even if this flush was cancelled mid-tick
+            for agent_id, future in futures.items():
+                if not future.done():
+                    future.set_result(results.get(agent_id, False))
+            if self._pending_actions:
+                if self._registered_agents.issubset(self._pending_actions):
+                    asyncio.ensure_future(self._flush_tick())
+                else:
+                    self._arm_tick_timer()
+
+    async def step_tick(self, actions: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Applies one action per agent as a single lockstep tick:
+        one env.step_batch call, one audit pass, one batched log write and one callback.
+        Returns agent_id -> True if the agent is still alive (as perform_action does).
+        """
+        results = {agent_id: False for agent_id in actions}
+        try:
+            await self._pause_event.wait()
+
+            live_actions = {
+                agent_id: action for agent_id, action in actions.items()
+                if not self._agent_feedback.get(agent_id, {}).get("done")
+            }
+            if not live_actions:
+                return results
+
+            start = time.time()
+            step_timeout = self.stress_config.get("step_timeout", 60.0)
+
+            try:
+                outcomes = await self.executor.run(
+                    self.env, step_batch, live_actions, timeout=step_timeout
+                )
+            except asyncio.TimeoutError:
+                raise Exception(f"Tick Deadlocked: step_batch timeout after {step_timeout}s")
+
+            duration = time.time() - start
+            log_entries = []
+            observations = {}
+            failed = []
+
+            # One audit pass over the whole tick; falls back to per-agent audits
+            # (which report errors per agent) if a state can't be batched
+            try:
+                audits = self.auditor.audit_batch({agent_id: outcome[0] for agent_id, outcome in outcomes.items()})
+            except Exception:
+                audits = None
+
+            for agent_id, (obs, reward, done, info) in outcomes.items():
+                info["duration"] = duration
+                try:
+                    if audits is None:
+                        self._audit_step(agent_id, obs, info)
+                    else:
+                        self._handle_violations(agent_id, audits[agent_id], info)
+                except Exception as e:
+                    failed.append((agent_id, e))
+                    # A failed agent gets False and stops submitting, like a finished one
+                    self._registered_agents.discard(agent_id)
+                    continue
+
+                self._agent_feedback[agent_id] = {"reward": reward, "done": done, "info": info}
+                observations[agent_id] = obs
+                results[agent_id] = not done
+                if done:
+                    # Dead agents stop submitting; don't let them hold the barrier
+                    self._registered_agents.discard(agent_id)
+
+                if self.logger:
+                    log_entries.append({
+                        "agent_id": agent_id,
+                        "action": str(live_actions[agent_id]),
+                        "state": obs,
+                        "reward": reward,
+                        "metadata": info,
+                        "state_hash": str(hash(str(obs)))
+                    })
+
+            if self.logger:
+                self.logger.log_interactions(log_entries)
+
+            if self.on_step_callback and observations and self.delta_updates:
+                self._sequence_id += 1
+                update = self._deltas.frame(
+                    self._sequence_id, observations,
+                    {agent_id: self._agent_feedback[agent_id]["info"] for agent_id in observations}
+                )
+                if update:
+                    await self._emit(update)
+            elif self.on_step_callback and observations:
+                self._sequence_id += 1
+                update = {
+                    "type": "tick",
+                    "seq_id": self._sequence_id,
+                    "step_count": self._sequence_id,
+                    "agent_positions": getattr(self.env, "agent_positions", {}),
+                    "grid_state": getattr(self.env, "grid", []),
+                    "stats": {"agents": len(observations), "duration": duration},
+                    "observations": observations,
+                    "info": {agent_id: self._agent_feedback[agent_id]["info"] for agent_id in observations},
+                    "timestamp": time.time()
+                }
+                await self._emit(update)
+
+            for agent_id, e in failed:
+                await self._broadcast_error(agent_id, e, "engine_critical_failure")
+
+            return results
+
+        except Exception as e:
+            await self._broadcast_error("engine", e, "engine_critical_failure")
+            return {agent_id: False for agent_id in actions}
+
     async def get_feedback(self, agent_id: str, include_stress: bool = True) -> Dict[str, Any]:
         """Returns the feedback (reward, done, info) from the last action."""
         try:
             if include_stress:
                 await self._apply_stress()
+            if self.lockstep and agent_id in self._agent_feedback:
+                return self._agent_feedback[agent_id]
             return {
                 "reward": self._last_reward,
                 "done": self._last_done,
@@ -240,6 +479,12 @@ class SimulationEngine:
             await self._broadcast_error(agent_id, e, "engine_exception")
             raise e
 
+    async def _emit(self, update: Dict[str, Any]):
+        if inspect.iscoroutinefunction(self.on_step_callback):
+            await self.on_step_callback(update)
+        else:
+            self.on_step_callback(update)
+
     async def _broadcast_error(self, agent_id: str, e: Exception, event_type: str):
         """Internal helper to log and broadcast engine errors."""
         self.pause()
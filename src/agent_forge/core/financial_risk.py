@@ -57,7 +57,14 @@ class SystemicRiskMonitor:
         # Agent Activity: AgentID -> Volume
         self.agent_volume: Dict[str, float] = {}
 
-    def update(self, obs: Dict[str, Any], trades: List[Dict[str, Any]]):
+    def update(self, obs: Dict[str, Any], trades: List[Dict[str, Any]] = None):
+        """
+        Records the mid price and per-agent volume.
+        `obs` may be a full observation or an OrderBookEnv delta-mode frame,
+        in which case the frame's own 'trades' are used when none are passed.
+        """
+        if trades is None:
+            trades = obs.get('trades', obs.get('last_trades', []))
         mid = obs['mid_price']
         self.prices.append(mid)
         if len(self.prices) > self.vol_window:
@@ -0,0 +1,307 @@
+"""
+Checkpointed, parallel verification of the Justice Log hash chain.
+
+Segments (fixed entry ranges, see justice_store.py) are the unit of work:
+
+    - each segment is verified on its own (signatures and linkage inside it),
+      so a full audit fans segments out over a process pool; the parent then
+      checks the links between segments, so the chain is still verified end
+      to end from GENESIS
+    - each complete segment gets a Merkle leaf: sha256 over its entries'
+      signatures. The leaves' Merkle root summarizes the chain
+
+Checkpoints are appended to <log>.ckpt as JSON lines:
+    {"index": n, "chain_hash": <signature of entry n-1>, "leaves": [...],
+     "merkle_root": ..., "created_at": ..., "mac": HMAC-SHA256}
+The MAC key is taken from ENGRAM_JUSTICE_KEY or a per-log key file
+(<log>.key, created when the first checkpoint is written). Checkpoints whose
+MAC doesn't match are ignored. Routine verification then only re-hashes the
+tail after the last checkpoint, after checking that entry n-1 still has the
+checkpointed hash. Verifying a read-only store never writes either file.
+"""
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("JusticeAudit")
+
+GENESIS = "GENESIS"
+KEY_ENV = "ENGRAM_JUSTICE_KEY"
+
+
+def canonical_data(data: Dict[str, Any]) -> str:
+    """The serialization of an entry's data that its signature covers"""
+    return json.dumps(data, sort_keys=True)
+
+
+def canonical_hash(entry_id: str, timestamp: float, previous_hash: str, data_json: str) -> str:
+    """entry_hash for data already serialized with canonical_data"""
+    return hashlib.sha256(f"{entry_id}|{timestamp}|{previous_hash}|{data_json}".encode()).hexdigest()
+
+
+def entry_hash(entry_id: str, timestamp: float, previous_hash: str, data: Dict[str, Any]) -> str:
+    """SHA-256 signature of one entry (the chain's hashing rule)"""
+    return canonical_hash(entry_id, timestamp, previous_hash, canonical_data(data))
+
+
+def merkle_root(leaves: List[str]) -> str:
+    """Binary Merkle root over hex leaves (odd nodes are promoted unchanged)"""
+    if not leaves:
+        return hashlib.sha256(b"").hexdigest()
+    level = leaves
+    while len(level) > 1:
+        paired = []
+        for i in range(0, len(level) - 1, 2):
+            paired.append(hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest())
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def verify_block(block: bytes, start_index: int, expected_previous: Optional[str]) -> Dict[str, Any]:
+    """
+    Verifies consecutive entries (raw JSONL bytes) starting at chain position start_index.
+    expected_previous=None skips the check of the first link (the caller checks it).
+    Returns first_previous, last_signature, count and the Merkle leaf, or the failure.
+    """
+    leaf = hashlib.sha256()
+    expected = expected_previous
+    first_previous = None
+    signature = None
+    index = start_index
+    for line in block.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if first_previous is None:
+            first_previous = entry["previous_hash"]
+        if expected is not None and entry["previous_hash"] != expected:
+            return {"valid": False, "failed_at_index": index, "failed_entry_id": entry["entry_id"],
+                    "message": f"Hash chain broken at entry {index}. Expected previous_hash={expected}, got={entry['previous_hash']}"}
+        signature = entry_hash(entry["entry_id"], entry["timestamp"], entry["previous_hash"], entry["data"])
+        if signature != entry["signature"]:
+            return {"valid": False, "failed_at_index": index, "failed_entry_id": entry["entry_id"],
+                    "message": f"Signature mismatch at entry {index}. Entry has been tampered with."}
+        leaf.update(signature.encode())
+        expected = signature
+        index += 1
+    return {"valid": True, "first_previous": first_previous, "last_signature": signature,
+            "count": index - start_index, "leaf": leaf.hexdigest()}
+
+
+def _verify_segment_file(log_path: str, offset: int, length: int, start_index: int) -> Dict[str, Any]:
+    """Worker: reads one segment straight from the log file and verifies it"""
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        return verify_block(f.read(length), start_index, None)
+
+
+class ChainAuditor:
+    """Checkpoints and verification for one ChainStore"""
+    def __init__(self, store, key: Optional[bytes] = None):
+        self.store = store
+        self.checkpoint_path = store.log_path + ".ckpt"
+        self._key = key
+        self._checkpoint: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        self._lock = threading.RLock() # Background checkpoints vs. explicit verification
+
+    # --- Checkpoints ---
+
+    def _load_key(self, create: bool) -> Optional[bytes]:
+        if self._key is None:
+            env_key = os.environ.get(KEY_ENV)
+            if env_key:
+                self._key = env_key.encode()
+            else:
+                key_path = self.store.log_path + ".key"
+                if not os.path.exists(key_path):
+                    if not create:
+                        return None
+                    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(os.urandom(32).hex().encode())
+                with open(key_path, "rb") as f:
+                    self._key = f.read().strip()
+        return self._key
+
+    @property
+    def key(self) -> bytes:
+        return self._load_key(create=True)
+
+    def _mac(self, checkpoint: Dict[str, Any], key: Optional[bytes] = None) -> str:
+        body = {k: v for k, v in checkpoint.items() if k != "mac"}
+        return hmac.new(key or self.key, json.dumps(body, sort_keys=True).encode(), hashlib.sha256).hexdigest()
+
+    @property
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Latest checkpoint with a valid MAC (None if there is none)"""
+        if not self._loaded:
+            self._loaded = True
+            key = self._load_key(create=False)
+            if key is None and os.path.exists(self.checkpoint_path):
+                logger.warning(f"No key for {self.checkpoint_path}; ignoring its checkpoints")
+            elif key is not None and os.path.exists(self.checkpoint_path):
+                with open(self.checkpoint_path, "rb") as f:
+                    lines = f.read().splitlines()
+                for line in reversed(lines):
+                    try:
+                        candidate = json.loads(line)
+                    except ValueError:
+                        continue
+                    if hmac.compare_digest(candidate.get("mac", ""), self._mac(candidate, key)):
+                        self._checkpoint = candidate
+                        break
+                    logger.warning(f"Ignoring checkpoint with bad MAC at index {candidate.get('index')}")
+        return self._checkpoint
+
+    def _write_checkpoint(self, index: int, chain_hash: str, leaves: List[str]):
+        checkpoint = {
+            "index": index,
+            "chain_hash": chain_hash,
+            "segment_size": self.store.segment_size,
+            "leaves": leaves,
+            "merkle_root": merkle_root(leaves),
+            "created_at": time.time()
+        }
+        checkpoint["mac"] = self._mac(checkpoint)
+        with open(self.checkpoint_path, "a") as f:
+            f.write(json.dumps(checkpoint) + "\n")
+        self._checkpoint = checkpoint
+        self._loaded = True
+
+    def _usable_checkpoint(self) -> Optional[Dict[str, Any]]:
+        checkpoint = self.checkpoint
+        if checkpoint is None or checkpoint.get("segment_size") != self.store.segment_size:
+            return None
+        return checkpoint
+
+    # --- Verification ---
+
+    def _verify_range(self, start: int, stop: int, expected_previous: str, leaves: List[str]) -> Dict[str, Any]:
+        """Sequentially verifies [start, stop), appending leaves of segments completed in it"""
+        position = start
+        expected = expected_previous
+        while position < stop:
+            segment = position // self.store.segment_size
+            seg_start, seg_stop = self.store.segment_bounds(segment)
+            chunk_stop = min(stop, seg_stop)
+            completes = chunk_stop - seg_start == self.store.segment_size
+            if completes and seg_start < position:
+                # A leaf covers the whole segment: re-verify its checkpointed prefix too,
+                # anchored to the checkpoint by the hash of entry position-1
+                result = self._verify_segment_inline(seg_start, chunk_stop, None)
+                if result["valid"] and self.store.read(position - 1)["signature"] != expected:
+                    entry = self.store.read(position - 1)
+                    return {"valid": False, "failed_at_index": position - 1, "failed_entry_id": entry["entry_id"],
+                            "message": f"Checkpoint mismatch at entry {position - 1}. Entry has been tampered with."}
+            else:
+                result = self._verify_segment_inline(position, chunk_stop, expected)
+            if not result["valid"]:
+                return result
+            if completes:
+                leaves.append(result["leaf"])
+            expected = result["last_signature"]
+            position = chunk_stop
+        return {"valid": True, "last_signature": expected}
+
+    def _verify_segment_inline(self, start: int, stop: int, expected_previous: Optional[str]) -> Dict[str, Any]:
+        return verify_block(self.store.read_block(start, stop), start, expected_previous)
+
+    def verify(self, full: bool = False, workers: Optional[int] = None,
+               persist: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Verifies the chain. By default only the tail after the last checkpoint is
+        re-hashed; full=True audits every segment (in parallel when workers != 1).
+        A successful verification writes a checkpoint at the tip if `persist`
+        (default: unless the store is read-only).
+        """
+        if persist is None:
+            persist = not self.store.readonly
+        with self._lock:
+            return self._verify(full, workers, persist)
+
+    def _verify(self, full: bool, workers: Optional[int], persist: bool) -> Dict[str, Any]:
+        self.store.commit() # Pool workers read the file itself
+        total = len(self.store)
+        checkpoint = self._usable_checkpoint()
+        if checkpoint and checkpoint["index"] > total:
+            return {"valid": False, "total_entries": total, "failed_at_index": total,
+                    "message": f"Chain truncated: checkpoint covers {checkpoint['index']} entries, log has {total}"}
+
+        if full or checkpoint is None or checkpoint["index"] == 0:
+            result = self._full_audit(workers, total)
+            if not result["valid"]:
+                result["total_entries"] = total
+                return result
+            leaves = result["leaves"]
+            if checkpoint:
+                # Segments sealed by the checkpoint must still hash to the same leaves
+                for segment, (old, new) in enumerate(zip(checkpoint["leaves"], leaves)):
+                    if old != new:
+                        start, _ = self.store.segment_bounds(segment)
+                        return {"valid": False, "total_entries": total, "failed_at_index": start,
+                                "failed_segment": segment,
+                                "message": f"Segment {segment} no longer matches checkpoint (Merkle leaf mismatch)"}
+            verified_from, tip = 0, result["last_signature"]
+        else:
+            index = checkpoint["index"]
+            tip_entry = self.store.read(index - 1)
+            if tip_entry["signature"] != checkpoint["chain_hash"]:
+                return {"valid": False, "total_entries": total, "failed_at_index": index - 1,
+                        "failed_entry_id": tip_entry["entry_id"],
+                        "message": f"Checkpoint mismatch at entry {index - 1}. Entry has been tampered with."}
+            leaves = list(checkpoint["leaves"])
+            result = self._verify_range(index, total, checkpoint["chain_hash"], leaves)
+            if not result["valid"]:
+                result["total_entries"] = total
+                return result
+            verified_from, tip = index, result["last_signature"]
+
+        if persist and total and (checkpoint is None or checkpoint["index"] != total):
+            self._write_checkpoint(total, tip, leaves)
+        return {
+            "valid": True,
+            "total_entries": total,
+            "verified_from": verified_from,
+            "merkle_root": merkle_root(leaves),
+            "message": "All entries verified. Chain is intact." if verified_from == 0 else
+                       f"Entries {verified_from}..{total - 1} verified against checkpoint at {verified_from}. Chain is intact."
+        }
+
+    def _full_audit(self, workers: Optional[int], total: int) -> Dict[str, Any]:
+        """Verifies every segment of the first `total` entries (possibly in parallel) then the links between them"""
+        size = self.store.segment_size
+        # Bounded by `total`: the writer may keep appending while a checkpoint runs
+        segments = [(start, min(total, start + size)) for start in range(0, total, size)]
+        if workers is None:
+            workers = min(len(segments), os.cpu_count() or 1)
+        if workers > 1 and len(segments) > 1:
+            blocks = [self.store.byte_range(start, stop) for start, stop in segments]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_verify_segment_file, [self.store.log_path] * len(segments),
+                                        [b[0] for b in blocks], [b[1] for b in blocks],
+                                        [start for start, _ in segments]))
+        else:
+            results = [self._verify_segment_inline(start, stop, None) for start, stop in segments]
+
+        expected = GENESIS
+        leaves = []
+        for (start, stop), result in zip(segments, results):
+            if not result["valid"]:
+                return result
+            if result["first_previous"] != expected:
+                return {"valid": False, "failed_at_index": start,
+                        "failed_entry_id": self.store.read(start)["entry_id"],
+                        "message": f"Hash chain broken at entry {start}. Expected previous_hash={expected}, got={result['first_previous']}"}
+            if stop - start == self.store.segment_size:
+                leaves.append(result["leaf"])
+            expected = result["last_signature"]
+        return {"valid": True, "last_signature": expected, "leaves": leaves}
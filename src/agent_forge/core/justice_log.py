@@ -5,11 +5,17 @@ Immutable, tamper-proof logging system for forensic evidence
 
 import hashlib
 import json
+import threading
 import time
-import os
-from typing import Dict, Any, List, Optional
+import weakref
+from typing import Dict, Any, Iterator, List, Optional
 from dataclasses import dataclass, asdict
 
+from agent_forge.core.justice_audit import ChainAuditor, canonical_data, canonical_hash, entry_hash
+from agent_forge.core.justice_store import ChainStore
+from agent_forge.utils.logger import get_logger
+sys_logger = get_logger("JusticeLog")
+
 
 @dataclass
 class LogEntry:
@@ -30,73 +36,144 @@ class LogEntry:
         return cls(**d)
 
 
+class ChainView:
+    """
+    Read-only, list-like view of the on-disk chain.
+    Entries are decoded on access; nothing is held in memory.
+    """
+    def __init__(self, store: ChainStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __bool__(self) -> bool:
+        return len(self._store) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._store))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return [LogEntry.from_dict(d) for d in self._store.iter_range(start, stop)]
+        return LogEntry.from_dict(self._store.read(index))
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        for d in self._store.iter_range():
+            yield LogEntry.from_dict(d)
+
+
 class JusticeLogger:
     """
     Hash-chained immutable logger for forensic evidence.
     Each entry references the hash of the previous entry, making tampering detectable.
+    Entries live on disk (see justice_store.py) and are read lazily; verification
+    is checkpointed and parallel (see justice_audit.py).
+    One writer per log: tools that only read or verify it (possibly next to a live
+    writer) open it with readonly=True, which never writes the log or its indexes.
     """
     
-    def __init__(self, log_path: str = "justice_log.jsonl"):
+    def __init__(self, log_path: str = "justice_log.jsonl", segment_size: int = 65536,
+                 checkpoint_interval: Optional[int] = None, batch_size: int = 64,
+                 flush_interval: float = 0.1, fsync: bool = False, readonly: bool = False):
         self.log_path = log_path
-        self.chain: List[LogEntry] = []
-        self.last_hash = "GENESIS"  # Genesis block
+        self.store = ChainStore(log_path, segment_size=segment_size, readonly=readonly)
+        self.chain = ChainView(self.store)
+        self.auditor = ChainAuditor(self.store)
+        # Entries between automatic checkpoints (0 disables them)
+        self.checkpoint_interval = segment_size if checkpoint_interval is None else checkpoint_interval
         
-        # Load existing chain if present
-        if os.path.exists(log_path):
-            self._load_chain()
+        # Only the tip is needed to keep appending
+        self.last_hash = self.store.read(-1)["signature"] if len(self.store) else "GENESIS"
+        
+        # Group commit: appends are written out every batch_size entries or once the
+        # oldest unwritten entry is flush_interval seconds old (batch_size=1 writes each entry)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = threading.RLock() # Serializes appends: chain order == file order
+        self._oldest_pending: Optional[float] = None
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._checkpointer: Optional[threading.Thread] = None
+        # Buffered entries are written out even if the logger is never closed
+        weakref.finalize(self, _close_quietly, self.store, self._lock, self._stop_flusher)
     
     def _compute_hash(self, entry_id: str, timestamp: float, previous_hash: str, data: Dict[str, Any]) -> str:
         """Compute SHA-256 hash of entry"""
-        content = f"{entry_id}|{timestamp}|{previous_hash}|{json.dumps(data, sort_keys=True)}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        return entry_hash(entry_id, timestamp, previous_hash, data)
     
     def log(self, event_type: str, agent_id: str, data: Dict[str, Any]) -> LogEntry:
         """
         Add a new entry to the Justice Log.
-        Returns the created entry.
+        Returns the created entry (durable once flushed, see flush()).
         """
-        entry_id = f"{event_type}_{int(time.time() * 1000000)}"
-        timestamp = time.time()
-        
-        # Compute signature
-        signature = self._compute_hash(entry_id, timestamp, self.last_hash, data)
+        # Serialized once: the same text is signed and written
+        data_json = canonical_data(data)
         
-        # Create entry
-        entry = LogEntry(
-            entry_id=entry_id,
-            timestamp=timestamp,
-            previous_hash=self.last_hash,
-            data=data,
-            signature=signature
-        )
-        
-        # Append to chain
-        self.chain.append(entry)
-        self.last_hash = signature
-        
-        # Write to disk (append-only)
-        self._append_to_disk(entry)
+        with self._lock:
+            entry_id = f"{event_type}_{int(time.time() * 1000000)}"
+            timestamp = time.time()
+            previous_hash = self.last_hash
+            signature = canonical_hash(entry_id, timestamp, previous_hash, data_json)
+            
+            line = (f'{{"entry_id": {json.dumps(entry_id)}, "timestamp": {json.dumps(timestamp)}, '
+                    f'"previous_hash": "{previous_hash}", "data": {data_json}, "signature": "{signature}"}}\n')
+            # Agent queries index the signed data's agent_id, so a rebuilt index agrees
+            position = self.store.append(line.encode(), entry_id, timestamp, data.get("agent_id"))
+            self.last_hash = signature
+            
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            if (self.store.pending >= self.batch_size
+                    or time.monotonic() - self._oldest_pending >= self.flush_interval):
+                self._commit()
+            elif self._flusher is None and self.flush_interval > 0:
+                self._start_flusher()
+            
+            # Periodic checkpoint: verifies only the entries since the previous one,
+            # on its own thread so appends don't wait for the re-hash
+            if self.checkpoint_interval and (position + 1) % self.checkpoint_interval == 0:
+                self._commit()
+                self._start_checkpoint()
         
-        return entry
-    
-    def _append_to_disk(self, entry: LogEntry):
-        """Append entry to disk in JSONL format"""
-        with open(self.log_path, 'a') as f:
-            f.write(json.dumps(entry.to_dict()) + '\n')
-    
-    def _load_chain(self):
-        """Load existing chain from disk"""
-        with open(self.log_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    entry_dict = json.loads(line)
-                    entry = LogEntry.from_dict(entry_dict)
-                    self.chain.append(entry)
-                    self.last_hash = entry.signature
-    
-    def verify_integrity(self) -> Dict[str, Any]:
+        return LogEntry(entry_id=entry_id, timestamp=timestamp, previous_hash=previous_hash,
+                        data=data, signature=signature)
+    
+    def _commit(self):
+        self.store.commit(fsync=self.fsync)
+        self._oldest_pending = None
+    
+    def flush(self):
+        """Write out buffered entries now (fsync'd if the logger was created with fsync=True)"""
+        with self._lock:
+            self._commit()
+    
+    def _start_flusher(self):
+        # Holds only a weak reference so an unclosed logger can still be collected
+        self._flusher = threading.Thread(target=_flush_loop, args=(weakref.ref(self), self._stop_flusher),
+                                         name="justice-log-flush", daemon=True)
+        self._flusher.start()
+    
+    def _start_checkpoint(self):
+        if self._checkpointer is not None and self._checkpointer.is_alive():
+            return # Its verification resumes from the previous checkpoint; the next interval catches up
+        self._checkpointer = threading.Thread(target=_checkpoint, args=(weakref.ref(self),),
+                                              name="justice-log-checkpoint", daemon=True)
+        self._checkpointer.start()
+    
+    def wait_for_checkpoint(self, timeout: Optional[float] = None):
+        """Wait for a background checkpoint started by log() to finish"""
+        checkpointer = self._checkpointer
+        if checkpointer is not None and checkpointer is not threading.current_thread():
+            checkpointer.join(timeout)
+    
+    def verify_integrity(self, full: bool = False, workers: Optional[int] = None) -> Dict[str, Any]:
         """
-        Verify the integrity of the entire chain.
+        Verify the integrity of the chain.
+        Only entries after the last checkpoint are re-hashed unless full=True, in which
+        case every segment is audited (across `workers` processes) and compared with
+        the checkpointed Merkle leaves.
         Returns a dict with verification results.
         """
         if not self.chain:
@@ -106,45 +183,11 @@ class JusticeLogger:
                 "message": "Empty chain (valid)"
             }
         
-        expected_previous = "GENESIS"
-        
-        for idx, entry in enumerate(self.chain):
-            # Check previous hash linkage
-            if entry.previous_hash != expected_previous:
-                return {
-                    "valid": False,
-                    "total_entries": len(self.chain),
-                    "failed_at_index": idx,
-                    "failed_entry_id": entry.entry_id,
-                    "message": f"Hash chain broken at entry {idx}. Expected previous_hash={expected_previous}, got={entry.previous_hash}"
-                }
-            
-            # Recompute signature
-            computed_sig = self._compute_hash(
-                entry.entry_id,
-                entry.timestamp,
-                entry.previous_hash,
-                entry.data
-            )
-            
-            if computed_sig != entry.signature:
-                return {
-                    "valid": False,
-                    "total_entries": len(self.chain),
-                    "failed_at_index": idx,
-                    "failed_entry_id": entry.entry_id,
-                    "message": f"Signature mismatch at entry {idx}. Entry has been tampered with."
-                }
-            
-            expected_previous = entry.signature
-        
-        return {
-            "valid": True,
-            "total_entries": len(self.chain),
-            "first_entry": self.chain[0].entry_id if self.chain else None,
-            "last_entry": self.chain[-1].entry_id if self.chain else None,
-            "message": "All entries verified. Chain is intact."
-        }
+        result = self.auditor.verify(full=full, workers=workers)
+        if result["valid"]:
+            result["first_entry"] = self.chain[0].entry_id
+            result["last_entry"] = self.chain[-1].entry_id
+        return result
     
     def seal(self) -> Dict[str, Any]:
         """
@@ -159,19 +202,25 @@ class JusticeLogger:
                 "message": "No entries to seal"
             }
         
-        # Compute hash of entire chain
-        chain_content = "".join([entry.signature for entry in self.chain])
-        chain_hash = hashlib.sha256(chain_content.encode()).hexdigest()
+        # Compute hash of entire chain (streamed; same digest as hashing the joined signatures)
+        chain_hasher = hashlib.sha256()
+        for entry in self.store.iter_range():
+            chain_hasher.update(entry["signature"].encode())
+        chain_hash = chain_hasher.hexdigest()
+        first, last = self.chain[0], self.chain[-1]
+        verification = self.verify_integrity()
         
         manifest = {
             "sealed_at": time.time(),
             "sealed_at_iso": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             "total_entries": len(self.chain),
-            "first_entry_id": self.chain[0].entry_id,
-            "first_timestamp": self.chain[0].timestamp,
-            "last_entry_id": self.chain[-1].entry_id,
-            "last_timestamp": self.chain[-1].timestamp,
+            "first_entry_id": first.entry_id,
+            "first_timestamp": first.timestamp,
+            "last_entry_id": last.entry_id,
+            "last_timestamp": last.timestamp,
             "chain_hash": chain_hash,
+            "merkle_root": verification.get("merkle_root"),
+            "verified": verification["valid"],
             "log_file": self.log_path
         }
         
@@ -189,11 +238,37 @@ class JusticeLogger:
         return self.chain[offset:offset+limit]
     
     def get_entry_by_id(self, entry_id: str) -> Optional[LogEntry]:
-        """Find entry by ID"""
-        for entry in self.chain:
-            if entry.entry_id == entry_id:
-                return entry
-        return None
+        """Find entry by ID (hash index lookup)"""
+        index = self.store.find(entry_id)
+        return self.chain[index] if index is not None else None
+    
+    def query(self, start_time: Optional[float] = None, end_time: Optional[float] = None,
+              event_type: Optional[str] = None, agent_id: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0, newest_first: bool = False) -> List[LogEntry]:
+        """
+        Entries with start_time <= timestamp < end_time, of an event type (the entry_id
+        prefix passed to log()) and/or for an agent (the agent_id in the entry's data,
+        which is signed). Filters run on the on-disk index columns; only the matching
+        page of entries is read.
+        """
+        positions = self.store.select(start_time, end_time, event_type, agent_id)
+        if newest_first:
+            positions = positions[::-1]
+        stop = None if limit is None else offset + limit
+        return [self.chain[int(position)] for position in positions[offset:stop]]
+    
+    def count(self, start_time: Optional[float] = None, end_time: Optional[float] = None,
+              event_type: Optional[str] = None, agent_id: Optional[str] = None) -> int:
+        """Number of entries query() would return without a limit"""
+        return len(self.store.select(start_time, end_time, event_type, agent_id))
+    
+    def event_types(self) -> List[str]:
+        """Event types present in the log"""
+        return self.store.keys("event")
+    
+    def agents(self) -> List[str]:
+        """Agents present in the log"""
+        return self.store.keys("agent")
     
     def export_audit_trail(self, output_path: str):
         """Export human-readable audit trail"""
@@ -221,6 +296,52 @@ class JusticeLogger:
             f.write(f"Total Entries: {verification['total_entries']}\n")
             f.write(f"Message: {verification['message']}\n")
             f.write("=" * 80 + "\n")
+    
+    def close(self):
+        """Flush pending entries and release file handles and mappings"""
+        self.wait_for_checkpoint()
+        _close_quietly(self.store, self._lock, self._stop_flusher)
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=1.0)
+
+
+def _flush_loop(logger_ref, stop: threading.Event):
+    """Background group-commit timer: writes out batches that have waited flush_interval"""
+    while True:
+        logger = logger_ref()
+        if logger is None:
+            return
+        interval = logger.flush_interval
+        del logger
+        if stop.wait(interval):
+            return
+        logger = logger_ref()
+        if logger is None:
+            return
+        with logger._lock:
+            if logger._oldest_pending is not None and time.monotonic() - logger._oldest_pending >= interval:
+                logger._commit()
+        del logger
+
+
+def _checkpoint(logger_ref):
+    """Background periodic checkpoint (verifies the tail and records it)"""
+    logger = logger_ref()
+    if logger is None or logger.store.closed:
+        return
+    try:
+        result = logger.auditor.verify()
+        if not result["valid"]:
+            sys_logger.error(f"Justice Log checkpoint failed: {result['message']}")
+    except Exception as e:
+        sys_logger.error(f"Justice Log checkpoint failed: {e}")
+
+
+def _close_quietly(store: ChainStore, lock, stop: threading.Event):
+    stop.set()
+    with lock:
+        if not store.closed:
+            store.close()
 
 
 # Global singleton instance
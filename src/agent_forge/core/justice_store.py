@@ -0,0 +1,581 @@
+"""
+Indexed, lazily loaded storage for the Justice Log hash chain.
+
+The chain itself stays one append-only JSONL file (justice_log.jsonl), so
+existing readers and tamper analysis keep working. Next to it:
+
+    <log>.idx   entry offset index: one <QI record (byte offset, length) per
+                entry, in chain order -> O(1) access to entry #n, O(k) pages
+    <log>.ids   entry_id -> position, an on-disk open-addressing hash table
+                (<QI slots: 64-bit key hash, position + 1) -> O(1) lookup by ID
+    <log>.attr  query columns: one <dII record (timestamp, event type id, agent id)
+                per entry, scanned with numpy for time / event type / agent filters
+    <log>.keys  the event type and agent dictionaries for .attr (JSON lines)
+
+Both are memory-mapped and only the parts touched are paged in, so opening a
+log costs a stat and a few mmaps instead of parsing every entry. Segments are
+fixed ranges of `segment_size` entries (byte ranges of the JSONL via the
+offset index); they are the unit of verification and checkpointing.
+
+The indexes are derived data: if they are missing, or behind the JSONL
+(e.g. a crash between the two appends), the missing tail is indexed on open.
+Only the writer does that. A read-only store (verification tools, the TUI, a
+second process next to a live writer) never touches the side files: it serves
+the indexed prefix from them and indexes any unindexed tail in memory, since
+the writer's own buffered index records for that tail may land at any time.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("JusticeStore")
+
+_OFFSET = struct.Struct("<QI")
+_ID_HEADER = struct.Struct("<8sQQ")
+_ID_SLOT = struct.Struct("<QI")
+_ID_MAGIC = b"JLIDS001"
+_MIN_ID_CAPACITY = 1024
+_MAX_ID_LOAD = 0.6
+_ATTR = struct.Struct("<dII")
+_ATTR_DTYPE = np.dtype([("timestamp", "<f8"), ("event", "<u4"), ("agent", "<u4")])
+
+
+def _key_hash(entry_id: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(entry_id.encode(), digest_size=8).digest(), "little")
+    return value or 1 # 0 marks an empty slot
+
+
+def event_type_of(entry_id: str) -> str:
+    """Entry IDs are f"{event_type}_{microseconds}" """
+    return entry_id.rsplit("_", 1)[0]
+
+
+def _agent_of(entry: Dict[str, Any]) -> Optional[str]:
+    data = entry.get("data")
+    agent_id = data.get("agent_id") if isinstance(data, dict) else None
+    return None if agent_id is None else str(agent_id)
+
+
+class _MappedFile:
+    """
+    Buffered append handle plus a read-only mmap that is re-mapped as the file grows.
+    Appends stay in the write buffer until flush(); reads of unflushed bytes flush first.
+    Read-only: no append handle, and `size` stays what it was on open (0 if missing).
+    """
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self._append = None if readonly else open(path, "ab", buffering=1 << 16)
+        self._read = open(path, "rb") if not readonly or os.path.exists(path) else None
+        self._map: Optional[mmap.mmap] = None
+        self.size = os.fstat(self._read.fileno()).st_size if self._read else 0
+        self._flushed = self.size
+
+    def view(self, offset: int, length: int) -> memoryview:
+        end = offset + length
+        if end > self.size:
+            raise IndexError(f"{self.path}: read past end ({end} > {self.size})")
+        if not length:
+            return memoryview(b"")
+        if end > self._flushed:
+            self.flush()
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._read.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)[offset:end]
+
+    def append(self, data: bytes) -> int:
+        """Appends and returns the offset the data was written at."""
+        offset = self.size
+        self._append.write(data)
+        self.size += len(data)
+        return offset
+
+    def flush(self):
+        if self._append is not None:
+            self._append.flush()
+        self._flushed = self.size
+
+    def fsync(self):
+        self.flush()
+        os.fsync(self._append.fileno())
+
+    def truncate(self, size: int):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._append.truncate(size)
+        self._append.seek(size)
+        self.size = self._flushed = size
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._append is not None:
+            self._append.close() # Flushes the buffer
+        if self._read is not None:
+            self._read.close()
+
+
+class _IdIndex:
+    """
+    Memory-mapped open-addressing hash table: entry_id hash -> chain position.
+    Read-only: a missing or corrupt table raises ValueError instead of being created.
+    """
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        if readonly:
+            if not os.path.exists(path):
+                raise ValueError(f"No id index {path}")
+            self._file = open(path, "rb")
+        else:
+            if not os.path.exists(path) or os.path.getsize(path) < _ID_HEADER.size:
+                self._create(path, _MIN_ID_CAPACITY)
+            self._file = open(path, "r+b")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+            magic, self.capacity, self.count = _ID_HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"Corrupt id index {path}")
+        if magic != _ID_MAGIC or len(self._map) != _ID_HEADER.size + self.capacity * _ID_SLOT.size:
+            self.close()
+            raise ValueError(f"Corrupt id index {path}")
+
+    @staticmethod
+    def _create(path: str, capacity: int):
+        with open(path, "wb") as f:
+            f.write(_ID_HEADER.pack(_ID_MAGIC, capacity, 0))
+            f.truncate(_ID_HEADER.size + capacity * _ID_SLOT.size)
+
+    def _slot(self, index: int) -> Tuple[int, int]:
+        return _ID_SLOT.unpack_from(self._map, _ID_HEADER.size + index * _ID_SLOT.size)
+
+    def candidates(self, entry_id: str) -> Iterator[int]:
+        """Positions whose id hash matches, in insertion order (caller confirms the id)."""
+        key = _key_hash(entry_id)
+        index = key % self.capacity
+        while True:
+            slot_key, position = self._slot(index)
+            if slot_key == 0:
+                return
+            if slot_key == key:
+                yield position - 1
+            index = (index + 1) % self.capacity
+
+    def add(self, entry_id: str, position: int):
+        if (self.count + 1) > self.capacity * _MAX_ID_LOAD:
+            self._grow()
+        self._insert(self._map, self.capacity, _key_hash(entry_id), position + 1)
+        self.count += 1
+        _ID_HEADER.pack_into(self._map, 0, _ID_MAGIC, self.capacity, self.count)
+
+    @staticmethod
+    def _insert(buffer, capacity: int, key: int, value: int):
+        index = key % capacity
+        while True:
+            offset = _ID_HEADER.size + index * _ID_SLOT.size
+            if _ID_SLOT.unpack_from(buffer, offset)[0] == 0:
+                _ID_SLOT.pack_into(buffer, offset, key, value)
+                return
+            index = (index + 1) % capacity
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        tmp_path = self.path + ".tmp"
+        self._create(tmp_path, capacity)
+        with open(tmp_path, "r+b") as f:
+            new_map = mmap.mmap(f.fileno(), 0)
+            # Re-insert in old table order so duplicate ids keep first-wins probing
+            for index in range(self.capacity):
+                key, value = self._slot(index)
+                if key:
+                    self._insert(new_map, capacity, key, value)
+            _ID_HEADER.pack_into(new_map, 0, _ID_MAGIC, capacity, self.count)
+            new_map.flush()
+            new_map.close()
+        self._map.close()
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.capacity = capacity
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if self._file.mode != "rb":
+            self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def reset(cls, path: str):
+        cls._create(path, _MIN_ID_CAPACITY)
+
+
+class _KeyTable:
+    """
+    Dictionary encoding for the .attr columns: (kind, key) -> small int, 0 = none.
+    Append-only JSON lines [kind, key]; ids are line order within each kind.
+    Read-only: keys first seen in an unindexed tail get ids in memory only.
+    """
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self._ids: Dict[str, Dict[str, int]] = {"event": {}, "agent": {}}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        kind, key = json.loads(line)
+                    except ValueError:
+                        break # Torn last line
+                    table = self._ids.setdefault(kind, {})
+                    table.setdefault(key, len(table) + 1)
+        self._file = None if readonly else open(path, "a")
+
+    def lookup(self, kind: str, key: Optional[str]) -> Optional[int]:
+        return self._ids[kind].get(key)
+
+    def id_for(self, kind: str, key: Optional[str]) -> int:
+        if key is None:
+            return 0
+        table = self._ids[kind]
+        key_id = table.get(key)
+        if key_id is None:
+            key_id = table[key] = len(table) + 1
+            if self._file is not None:
+                # Written through: .attr records must never reference an unknown id
+                self._file.write(json.dumps([kind, key]) + "\n")
+                self._file.flush()
+        return key_id
+
+    def keys(self, kind: str):
+        return list(self._ids[kind])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ChainStore:
+    """
+    Append-only JSONL chain with offset and id indexes. Positions are 0-based chain indexes.
+
+    There must be one writer per log. Every other opener passes readonly=True: it sees
+    the chain as it was on open and never writes the log or its indexes.
+    """
+    def __init__(self, log_path: str, segment_size: int = 65536, readonly: bool = False):
+        self.log_path = log_path
+        self.segment_size = segment_size
+        self.readonly = readonly
+        self.pending = 0 # Appends not yet committed
+        self.closed = False
+        self._lock = threading.RLock() # Reads may flush the write buffer; keep them off concurrent appends
+        # Read-only: positions >= _indexed are served from this in-memory tail index
+        self._indexed = 0
+        self._tail_offsets: List[Tuple[int, int]] = []
+        self._tail_ids: Dict[str, int] = {}
+        self._tail_attrs = bytearray()
+        if not readonly:
+            if os.path.dirname(log_path):
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            for path in (log_path, self.offsets_path):
+                if not os.path.exists(path):
+                    open(path, "ab").close()
+
+        self._data = _MappedFile(log_path, readonly)
+        self._offsets = _MappedFile(self.offsets_path, readonly)
+        self._attrs = _MappedFile(self.attrs_path, readonly) # Sized before the keys: its records only use known keys
+        self._keys = _KeyTable(self.keys_path, readonly)
+        self._ids: Optional[_IdIndex] = None
+        try:
+            self._ids = _IdIndex(self.ids_path, readonly)
+        except ValueError as e:
+            if not readonly:
+                logger.warning(f"{e}; rebuilding")
+                _IdIndex.reset(self.ids_path)
+                self._ids = _IdIndex(self.ids_path)
+        if readonly:
+            self._index_tail()
+        else:
+            self._recover()
+
+    @property
+    def offsets_path(self) -> str:
+        return self.log_path + ".idx"
+
+    @property
+    def ids_path(self) -> str:
+        return self.log_path + ".ids"
+
+    @property
+    def attrs_path(self) -> str:
+        return self.log_path + ".attr"
+
+    @property
+    def keys_path(self) -> str:
+        return self.log_path + ".keys"
+
+    def __len__(self) -> int:
+        if self.readonly:
+            return self._indexed + len(self._tail_offsets)
+        return self._offsets.size // _OFFSET.size
+
+    # --- Recovery ---
+
+    def _recover(self):
+        """Brings the indexes up to date with the JSONL (indexing only the missing tail)."""
+        if self._offsets.size % _OFFSET.size:
+            self._offsets.truncate(self._offsets.size - self._offsets.size % _OFFSET.size)
+        count = len(self)
+        indexed_end = 0
+        if count:
+            offset, length = self._offset(count - 1)
+            indexed_end = offset + length
+        if indexed_end > self._data.size:
+            # JSONL is shorter than the index claims: rebuild everything
+            logger.warning(f"{self.offsets_path} is ahead of {self.log_path}; rebuilding indexes")
+            self._offsets.truncate(0)
+            self._ids.close()
+            _IdIndex.reset(self.ids_path)
+            self._ids = _IdIndex(self.ids_path)
+            count, indexed_end = 0, 0
+
+        if indexed_end < self._data.size:
+            tail = bytes(self._data.view(indexed_end, self._data.size - indexed_end))
+            position = indexed_end
+            for line in tail.splitlines(keepends=True):
+                if line.strip():
+                    try:
+                        entry_id = json.loads(line)["entry_id"]
+                    except (ValueError, KeyError):
+                        logger.error(f"Unreadable entry at byte {position} of {self.log_path}; indexing stopped there")
+                        break
+                    self._offsets.append(_OFFSET.pack(position, len(line)))
+                    count += 1
+                position += len(line)
+            self._offsets.flush()
+
+        if self._ids.count > count:
+            self._ids.close()
+            _IdIndex.reset(self.ids_path)
+            self._ids = _IdIndex(self.ids_path)
+        for index in range(self._ids.count, count):
+            self._ids.add(self.read(index)["entry_id"], index)
+
+        attr_count = self._attrs.size // _ATTR.size
+        if attr_count > count or self._attrs.size % _ATTR.size:
+            self._attrs.truncate(0 if attr_count > count else attr_count * _ATTR.size)
+            attr_count = self._attrs.size // _ATTR.size
+        for index in range(attr_count, count):
+            entry = self.read(index)
+            self._append_attrs(entry["entry_id"], entry.get("timestamp", float("nan")), _agent_of(entry))
+        self._attrs.flush()
+
+    def _index_tail(self):
+        """
+        Read-only counterpart of _recover: trusts the on-disk indexes up to the first
+        position any of them lacks and indexes the rest of the JSONL in memory.
+        """
+        indexed = min(self._offsets.size // _OFFSET.size, self._attrs.size // _ATTR.size,
+                      self._ids.count if self._ids is not None else 0)
+        # A live writer may have flushed index records ahead of their JSONL lines
+        while indexed and sum(self._file_offset(indexed - 1)) > self._data.size:
+            indexed -= 1
+        self._indexed = indexed
+
+        position = sum(self._file_offset(indexed - 1)) if indexed else 0
+        tail = bytes(self._data.view(position, self._data.size - position))
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break # Partly written by the writer
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                    entry_id = entry["entry_id"]
+                except (ValueError, KeyError):
+                    logger.error(f"Unreadable entry at byte {position} of {self.log_path}; indexing stopped there")
+                    break
+                index = len(self)
+                self._tail_offsets.append((position, len(line)))
+                self._tail_ids.setdefault(entry_id, index)
+                self._tail_attrs += _ATTR.pack(
+                    entry.get("timestamp", float("nan")),
+                    self._keys.id_for("event", event_type_of(entry_id)),
+                    self._keys.id_for("agent", _agent_of(entry)))
+            position += len(line)
+
+    # --- Reads ---
+
+    def _file_offset(self, index: int) -> Tuple[int, int]:
+        return _OFFSET.unpack(self._offsets.view(index * _OFFSET.size, _OFFSET.size))
+
+    def _offset(self, index: int) -> Tuple[int, int]:
+        if self.readonly and index >= self._indexed:
+            return self._tail_offsets[index - self._indexed]
+        return self._file_offset(index)
+
+    def _attr_bytes(self, start: int, stop: int) -> bytes:
+        if not self.readonly:
+            return bytes(self._attrs.view(start * _ATTR.size, (stop - start) * _ATTR.size))
+        split = max(start, min(stop, self._indexed))
+        head = bytes(self._attrs.view(start * _ATTR.size, (split - start) * _ATTR.size))
+        tail = self._tail_attrs[(split - self._indexed) * _ATTR.size:(stop - self._indexed) * _ATTR.size]
+        return head + bytes(tail)
+
+    def read_bytes(self, index: int) -> bytes:
+        with self._lock:
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(f"Chain position {index} out of range")
+            offset, length = self._offset(index)
+            return bytes(self._data.view(offset, length))
+
+    def read(self, index: int) -> Dict[str, Any]:
+        return json.loads(self.read_bytes(index))
+
+    def byte_range(self, start: int, stop: int) -> Tuple[int, int]:
+        """(offset, length) of entries [start, stop) in the JSONL file"""
+        with self._lock:
+            first_offset, _ = self._offset(start)
+            last_offset, last_length = self._offset(stop - 1)
+            return first_offset, last_offset + last_length - first_offset
+
+    def read_block(self, start: int, stop: int) -> bytes:
+        """Raw JSONL lines of entries [start, stop), as one contiguous slice"""
+        with self._lock:
+            offset, length = self.byte_range(start, stop)
+            return bytes(self._data.view(offset, length))
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Entries [start, stop) in chain order, read one segment-sized slice at a time."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        while start < stop:
+            chunk_stop = min(stop, start + self.segment_size)
+            for line in self.read_block(start, chunk_stop).splitlines():
+                if line.strip():
+                    yield json.loads(line)
+            start = chunk_stop
+
+    def select(self, start_time: Optional[float] = None, end_time: Optional[float] = None,
+               event_type: Optional[str] = None, agent_id: Optional[str] = None,
+               start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Positions in [start, stop) with start_time <= timestamp < end_time and the given
+        event type (entry_id prefix) / agent, ascending. Scans only the .attr columns.
+        """
+        with self._lock:
+            stop = len(self) if stop is None else min(stop, len(self))
+            if start >= stop:
+                return np.empty(0, dtype=np.int64)
+            event = agent = None
+            if event_type is not None:
+                event = self._keys.lookup("event", event_type)
+                if event is None:
+                    return np.empty(0, dtype=np.int64)
+            if agent_id is not None:
+                agent = self._keys.lookup("agent", str(agent_id))
+                if agent is None:
+                    return np.empty(0, dtype=np.int64)
+            raw = self._attr_bytes(start, stop)
+        columns = np.frombuffer(raw, dtype=_ATTR_DTYPE)
+        mask = np.ones(len(columns), dtype=bool)
+        if start_time is not None:
+            mask &= columns["timestamp"] >= start_time
+        if end_time is not None:
+            mask &= columns["timestamp"] < end_time
+        if event is not None:
+            mask &= columns["event"] == event
+        if agent is not None:
+            mask &= columns["agent"] == agent
+        return np.flatnonzero(mask) + start
+
+    def keys(self, kind: str):
+        """Known event types ("event") or agents ("agent")"""
+        return self._keys.keys(kind)
+
+    def find(self, entry_id: str) -> Optional[int]:
+        """Chain position of the first entry with this id, or None."""
+        with self._lock:
+            if self._ids is not None:
+                # A read-only store's table may hold the live writer's newer positions
+                indexed = self._indexed if self.readonly else len(self)
+                for index in self._ids.candidates(entry_id):
+                    if index < indexed and self.read(index)["entry_id"] == entry_id:
+                        return index
+            return self._tail_ids.get(entry_id)
+
+    def segment_bounds(self, segment: int) -> Tuple[int, int]:
+        """[start, stop) entry positions of a segment."""
+        start = segment * self.segment_size
+        return start, min(len(self), start + self.segment_size)
+
+    @property
+    def segment_count(self) -> int:
+        return -(-len(self) // self.segment_size)
+
+    # --- Writes ---
+
+    def _append_attrs(self, entry_id: str, timestamp: float, agent_id: Optional[str]):
+        self._attrs.append(_ATTR.pack(timestamp, self._keys.id_for("event", event_type_of(entry_id)),
+                                      self._keys.id_for("agent", agent_id)))
+
+    def append(self, line: bytes, entry_id: str, timestamp: float = float("nan"),
+               agent_id: Optional[str] = None) -> int:
+        """
+        Appends one serialized entry (a full line) and indexes it. Returns its position.
+        The write is buffered: it becomes visible to other processes on commit().
+        """
+        if self.readonly:
+            raise PermissionError(f"{self.log_path} was opened read-only")
+        with self._lock:
+            index = len(self)
+            offset = self._data.append(line)
+            self._offsets.append(_OFFSET.pack(offset, len(line)))
+            self._ids.add(entry_id, index)
+            self._append_attrs(entry_id, timestamp, None if agent_id is None else str(agent_id))
+            self.pending += 1
+            return index
+
+    def commit(self, fsync: bool = False):
+        """
+        Writes out buffered appends: the JSONL first, then the indexes, so a crash
+        in between leaves an index behind the log (repaired on open), never ahead of it.
+        """
+        with self._lock:
+            if not self.pending:
+                return
+            if fsync:
+                self._data.fsync()
+                self._offsets.fsync()
+                self._attrs.fsync()
+                self._ids.flush()
+            else:
+                self._data.flush()
+                self._offsets.flush()
+                self._attrs.flush()
+            self.pending = 0
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.commit()
+            if self._ids is not None:
+                self._ids.close()
+            self._attrs.close()
+            self._keys.close()
+            self._offsets.close()
+            self._data.close()
+            self.closed = True
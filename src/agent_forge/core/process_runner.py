@@ -0,0 +1,248 @@
+"""
+HeadlessRunner hosted in its own worker process.
+
+ProcessSessionRunner has the same async control surface as HeadlessRunner
+(setup / start / stop / pause / resume / fail / get_snapshot / get_bus_metrics,
+plus status, is_running and error_message), but the simulation, its event loop
+and its GIL live in a child process. Engine updates are streamed back over a pipe and
+handed to `on_step_callback` on the parent's loop, so a busy session can't
+stall the server or other sessions. The worker also pushes status changes made
+outside a call (e.g. a session failing on its own). Both sides read the pipe on
+a thread, so a partly written message never blocks a loop and no platform
+specific loop support is needed.
+"""
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("ProcessRunner")
+
+STATUS_POLL_INTERVAL = 0.2
+
+_METHODS = frozenset(("setup", "start", "stop", "pause", "resume", "fail", "get_snapshot", "get_bus_metrics"))
+
+
+def _recv(conn) -> Optional[tuple]:
+    try:
+        return conn.recv()
+    except (EOFError, OSError):
+        return None
+
+
+def _session_worker(conn):
+    """Child process entry point."""
+    asyncio.run(_serve_session(conn))
+
+
+async def _serve_session(conn):
+    from agent_forge.core.runner import HeadlessRunner
+
+    runner = HeadlessRunner()
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    def read_pipe():
+        # A thread rather than loop.add_reader, which the Proactor loop on Windows lacks
+        while True:
+            msg = _recv(conn)
+            try:
+                loop.call_soon_threadsafe(inbox.put_nowait, msg)
+            except RuntimeError: # Loop closed
+                return
+            if msg is None or msg[0] == "close": # Parent gone or done
+                return
+
+    def forward(update: Dict[str, Any]):
+        try:
+            conn.send(("update", update))
+        except (BrokenPipeError, OSError):
+            pass
+
+    last_status = None
+
+    def send_status(kind: str, *head):
+        nonlocal last_status
+        last_status = (runner.status, runner.is_running, runner.error_message)
+        conn.send((kind, *head, last_status))
+
+    async def watch_status():
+        while True:
+            await asyncio.sleep(STATUS_POLL_INTERVAL)
+            if (runner.status, runner.is_running, runner.error_message) != last_status:
+                try:
+                    send_status("status")
+                except (BrokenPipeError, OSError):
+                    return
+
+    threading.Thread(target=read_pipe, daemon=True, name="session-pipe").start()
+    watcher = asyncio.ensure_future(watch_status())
+    try:
+        while True:
+            msg = await inbox.get()
+            if msg is None or msg[0] == "close":
+                break
+            _, req_id, method, args, kwargs = msg
+            try:
+                if method not in _METHODS:
+                    raise AttributeError(f"Unknown runner method '{method}'")
+                value, ok = await getattr(runner, method)(*args, **kwargs), True
+                if method == "setup":
+                    runner.engine.on_step_callback = forward
+            except Exception as e:
+                value, ok = e, False
+            send_status("reply", req_id, ok, value)
+    finally:
+        watcher.cancel()
+        if runner.is_running:
+            await runner.stop()
+        conn.close()
+
+
+class ProcessSessionRunner:
+    """Parent-side proxy for a HeadlessRunner running in a worker process."""
+    def __init__(self, start_method: str = "spawn"):
+        self.start_method = start_method
+        self.status = "IDLE" # IDLE, RUNNING, STOPPED, FAILED
+        self.is_running = False
+        self.error_message: Optional[str] = None
+        self.on_step_callback: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[threading.Thread] = None
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    def _ensure_process(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        ctx = multiprocessing.get_context(self.start_method)
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_session_worker, args=(child,), daemon=True, name="session-worker")
+        self._process.start()
+        child.close()
+        self._loop = asyncio.get_running_loop()
+        self._reader = threading.Thread(
+            target=self._read_pipe, args=(self._conn, self._loop), daemon=True, name="session-pipe"
+        )
+        self._reader.start()
+
+    def _read_pipe(self, conn, loop: asyncio.AbstractEventLoop):
+        # Blocking reads stay off the loop; messages are handled on it in order
+        while True:
+            msg = _recv(conn)
+            try:
+                loop.call_soon_threadsafe(self._on_message, conn, msg)
+            except RuntimeError: # Loop closed
+                return
+            if msg is None:
+                return
+
+    def _on_message(self, conn, msg: Optional[tuple]):
+        if conn is not self._conn:
+            return # Left over from a previous worker
+        if msg is None:
+            self._on_worker_exit()
+            return
+        if msg[0] == "update":
+            self._deliver(msg[1])
+        elif msg[0] == "status":
+            self.status, self.is_running, self.error_message = msg[1]
+        elif msg[0] == "reply":
+            _, req_id, ok, value, (self.status, self.is_running, self.error_message) = msg
+            future = self._replies.pop(req_id, None)
+            if future and not future.done():
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _deliver(self, update: Dict[str, Any]):
+        callback = self.on_step_callback
+        if callback is None:
+            return
+        if inspect.iscoroutinefunction(callback):
+            asyncio.ensure_future(callback(update))
+        else:
+            callback(update)
+
+    def _on_worker_exit(self):
+        if self.status == "RUNNING":
+            self.status = "FAILED"
+            self.error_message = "Session worker process exited"
+        self.is_running = False
+        for future in self._replies.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Session worker process exited"))
+        self._replies.clear()
+        self._conn.close()
+        self._process = None
+
+    async def _call(self, method: str, *args, **kwargs):
+        self._ensure_process()
+        req_id = next(self._ids)
+        future = self._loop.create_future()
+        self._replies[req_id] = future
+        self._conn.send(("call", req_id, method, args, kwargs))
+        return await future
+
+    async def setup(self, num_agents: int = 2, grid_size: int = 10, config: Dict[str, Any] = None):
+        await self._call("setup", num_agents=num_agents, grid_size=grid_size, config=config)
+
+    async def start(self):
+        await self._call("start")
+
+    async def pause(self):
+        await self._call("pause")
+
+    async def resume(self):
+        await self._call("resume")
+
+    async def fail(self, reason: str):
+        await self._call("fail", reason)
+
+    async def stop(self):
+        if self._process is None:
+            self.status, self.is_running = "STOPPED", False
+            return
+        await self._call("stop")
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        if self._process is None:
+            return {}
+        return await self._call("get_snapshot")
+
+    async def get_bus_metrics(self) -> Dict[str, Any]:
+        if self._process is None:
+            return {"status": "NOT_CREATED"}
+        return await self._call("get_bus_metrics")
+
+    async def close(self, timeout: float = 5.0):
+        """Stops the simulation and the worker process."""
+        if self._process is None:
+            return
+        process = self._process
+        if self.status == "RUNNING":
+            self.status = "STOPPED"
+        try:
+            self._conn.send(("close",))
+        except (BrokenPipeError, OSError):
+            pass
+        await asyncio.to_thread(process.join, timeout)
+        if process.is_alive():
+            process.terminate()
+        # The worker is gone, so the pipe reader sees EOF and exits
+        await asyncio.to_thread(self._reader.join, timeout)
+        conn, self._conn = self._conn, None
+        self._process = None
+        conn.close()
+        self.is_running = False
@@ -1,10 +1,13 @@
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import time
 import logging
 
 logger = logging.getLogger("RiskMonitor")
 
+# Justice Log event type for recorded risk events
+RISK_EVENT = "RISK_EVENT"
+
 class RiskLevel(Enum):
     LOW = "LOW"
     MEDIUM = "MEDIUM"
@@ -12,10 +15,12 @@ class RiskLevel(Enum):
     CRITICAL = "CRITICAL"
 
 class RiskMonitor:
-    def __init__(self, latency_threshold: float = 1.0):
+    def __init__(self, latency_threshold: float = 1.0, justice_log: Optional[Any] = None):
         self.agent_risk: Dict[str, float] = {}
         self.history: List[Dict[str, Any]] = []
         self.latency_threshold = latency_threshold
+        # Optional JusticeLogger: every risk event is also recorded as a RISK_EVENT entry
+        self.justice_log = justice_log
         
     def record_violations(self, agent_id: str, violations: List[Dict[str, Any]]):
         if not violations:
@@ -73,6 +78,8 @@ class RiskMonitor:
                 logger.warning(f"[CAUSALITY] {msg}")
             
             self.history.append(event)
+            if self.justice_log is not None:
+                self.justice_log.log(RISK_EVENT, agent_id, event)
             
         self.agent_risk[agent_id] = current_score
         logger.info(f"[RISK] Agent {agent_id} risk score increased to {current_score} ({self.get_risk_level(agent_id).value})")
@@ -3,9 +3,11 @@ import logging
 from typing import Dict, Any, List, Optional
 from agent_forge.core.engine import SimulationEngine
 from agent_forge.envs.warehouse import WarehouseEnv
+from agent_forge.envs.vector_warehouse import VectorWarehouseEnv
 from agent_forge.envs.warehouse_agent import WarehouseAgent
 from agent_forge.utils.message_bus import MessageBus
 from agent_forge.utils.interaction_logger import InteractionLogger
+from agent_forge.core.justice_log import JusticeLogger
 import os
 
 class HeadlessRunner:
@@ -16,6 +18,8 @@ class HeadlessRunner:
         self.bus: Optional[MessageBus] = None
         self.engine: SimulationEngine = SimulationEngine(env=None)
         self.agents: List[WarehouseAgent] = []
+        self.logger: Optional[InteractionLogger] = None
+        self.justice_log: Optional[JusticeLogger] = None
         self._loop_task: Optional[asyncio.Task] = None
         self.is_running = False
         self.status = "IDLE" # IDLE, RUNNING, STOPPED, FAILED
@@ -25,15 +29,39 @@ class HeadlessRunner:
                    config: Dict[str, Any] = None):
         """Initializes the simulation components with Zero IO."""
         # 1. Zero IO Bus
-        self.bus = MessageBus(log_path=None) 
+        self.bus = MessageBus(
+            log_path=None,
+            dispatch=config.get("bus_dispatch", "serial") if config else "serial",
+            overflow=config.get("bus_overflow", "block") if config else "block"
+        )
         await self.bus.start()
 
         # 2. Env & Engine & Logger
         log_db_path = os.path.abspath("simulation_logs.db")
-        self.logger = InteractionLogger(db_path=log_db_path)
+        if self.logger:
+            self.logger.close()
+        # Opt-in: buffered writer (per-step logging batched instead of one transaction
+        # per action) and background sink (batches written by a thread, off the event loop)
+        log_config = config or {}
+        self.logger = InteractionLogger(
+            db_path=log_db_path,
+            buffered=log_config.get("buffered_logging", False),
+            background=log_config.get("background_logging", False),
+            queue_size=log_config.get("log_queue_size", 10000),
+            backpressure=log_config.get("log_backpressure", "block")
+        )
         
-        env = WarehouseEnv(size=grid_size, num_agents=num_agents, config=config)
-        env = WarehouseEnv(size=grid_size, num_agents=num_agents, config=config)
+        # Opt-in: record every risk event as a signed RISK_EVENT entry in a Justice Log
+        if self.justice_log:
+            self.justice_log.close()
+            self.justice_log = None
+        if log_config.get("justice_log"):
+            self.justice_log = JusticeLogger(log_config["justice_log"])
+        self.engine.risk_monitor.justice_log = self.justice_log
+        
+        # Array-backed env for large fleets
+        env_cls = VectorWarehouseEnv if config and config.get("vectorized") else WarehouseEnv
+        env = env_cls(size=grid_size, num_agents=num_agents, config=config)
         
         # Update existing engine instead of creating new one
         self.engine.set_env(env)
@@ -50,12 +78,27 @@ class HeadlessRunner:
             drop_rate=config.get("drop_rate", 0.0) if config else 0.0,  # Separate from failure_rate
         )
         self.engine.adversary = AdversarialMiddleware(adv_conf)
+
+        # Lockstep: batch every agent's action into one env.step_batch per tick
+        self.engine.lockstep = bool(config.get("lockstep", False)) if config else False
+        self.engine.tick_timeout = config.get("tick_timeout") if config else None
+
+        # Live feed: compact per-tick deltas instead of full step updates
+        self.engine.delta_updates = bool(config.get("delta_updates", False)) if config else False
+
+        # Step executor: "thread" enforces step_timeout; "auto" (opt-in) drops the
+        # thread hop for cheap envs at the cost of un-interruptible inline steps
+        step_mode = config.get("step_mode", "thread") if config else "thread"
+        if step_mode != self.engine.executor.mode:
+            self.engine.set_step_mode(step_mode)
+        self.engine.clear_agents()
         
         # 3. Agents with Zero Checkpoints
         self.agents = []
         for i in range(num_agents):
             a_id = f"Agent-{i}"
             env.get_agent_state(a_id)
+            self.engine.register_agent(a_id)
             agent = WarehouseAgent(a_id, self.bus, self.engine, behavior_config=config)
             agent.enable_checkpoints = False # Disable disk I/O
             # Redirect agent logger to Null or Memory if needed, 
@@ -100,6 +143,11 @@ class HeadlessRunner:
                 await agent.stop()
         if self.bus:
             await self.bus.stop()
+        if self.logger:
+            await asyncio.to_thread(self.logger.flush)
+        if self.justice_log:
+            await asyncio.to_thread(self.justice_log.flush)
+        self.engine.shutdown()
             
     async def get_snapshot(self) -> Dict[str, Any]:
         """Returns a deep copy of the current simulation state."""
@@ -108,3 +156,9 @@ class HeadlessRunner:
             state = await self.engine.get_state(agent.agent_id, include_stress=False)
             snapshot[agent.agent_id] = state.copy()
         return snapshot
+
+    async def get_bus_metrics(self) -> Dict[str, Any]:
+        """Message bus counters, latency percentiles and queue depths."""
+        if self.bus is None:
+            return {"status": "NOT_CREATED"}
+        return self.bus.metrics_snapshot()
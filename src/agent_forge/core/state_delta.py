@@ -0,0 +1,129 @@
+"""
+Compact state deltas for the live (websocket) feed.
+
+The engine side (StateDeltaEncoder) turns step results into frames that only
+carry what changed since the last frame: moved agents, battery changes and
+events. The server side (DeltaConflator) merges frames for one client between
+sends, so a slow or low-frame-rate client gets one frame per interval with the
+latest value of every field instead of a backlog.
+
+Frame layout:
+    {"type": "delta", "seq_id": int, "agents": {agent_id: {field: value}},
+     "events": [{"agent_id": ..., "event": ...}], "timestamp": float}
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+TRACKED_FIELDS = ("position", "battery", "carrying")
+_MISSING = object()
+
+
+class StateDeltaEncoder:
+    """Per-engine encoder; remembers the last value published for every agent field."""
+    def __init__(self, fields=TRACKED_FIELDS, battery_precision: int = 1):
+        self.fields = fields
+        self.battery_precision = battery_precision
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self):
+        self._last = {}
+
+    def _compact(self, obs: Any) -> Dict[str, Any]:
+        if not isinstance(obs, dict):
+            return {"state": obs}
+        state = {field: obs[field] for field in self.fields if field in obs}
+        if isinstance(state.get("battery"), float):
+            # Batteries drain continuously; publish at display precision only
+            state["battery"] = round(state["battery"], self.battery_precision)
+        return state
+
+    def diff(self, agent_id: str, obs: Any) -> Dict[str, Any]:
+        """Fields of `obs` that changed since the last call for this agent."""
+        state = self._compact(obs)
+        last = self._last.setdefault(agent_id, {})
+        changed = {field: value for field, value in state.items() if last.get(field, _MISSING) != value}
+        last.update(changed)
+        return changed
+
+    def frame(self, seq_id: int, observations: Dict[str, Any],
+              infos: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Builds one delta frame, or None if nothing changed and nothing happened."""
+        agents = {}
+        events = []
+        for agent_id, obs in observations.items():
+            changed = self.diff(agent_id, obs)
+            if changed:
+                agents[agent_id] = changed
+            info = infos.get(agent_id) or {}
+            if info.get("event"):
+                events.append({"agent_id": agent_id, "event": info["event"]})
+            for violation in info.get("violations", []):
+                events.append({
+                    "agent_id": agent_id, "event": "violation",
+                    "rule": violation.get("rule"), "severity": violation.get("severity")
+                })
+
+        if not agents and not events:
+            return None
+        return {
+            "type": "delta",
+            "seq_id": seq_id,
+            "agents": agents,
+            "events": events,
+            "timestamp": time.time()
+        }
+
+
+def apply_delta(state: Dict[str, Dict[str, Any]], frame: Dict[str, Any]):
+    """Folds a delta frame's agent fields into a full agent_id -> fields map."""
+    for agent_id, fields in frame.get("agents", {}).items():
+        state.setdefault(agent_id, {}).update(fields)
+
+
+class DeltaConflator:
+    """
+    Merges delta frames for one client between sends.
+
+    Agent fields keep only their latest value; events are kept in order up to
+    `max_events` (older ones are dropped and counted).
+    """
+    def __init__(self, max_events: int = 200):
+        self.max_events = max_events
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.first_seq: Optional[int] = None
+        self.last_seq: Optional[int] = None
+        self.timestamp: Optional[float] = None
+        self.frames_merged = 0
+        self.events_dropped = 0
+
+    @property
+    def pending(self) -> bool:
+        return self.last_seq is not None
+
+    def add(self, frame: Dict[str, Any]):
+        apply_delta(self.agents, frame)
+        self.events.extend(frame.get("events", ()))
+        if len(self.events) > self.max_events:
+            overflow = len(self.events) - self.max_events
+            del self.events[:overflow]
+            self.events_dropped += overflow
+        if self.first_seq is None:
+            self.first_seq = frame.get("seq_id")
+        self.last_seq = frame.get("seq_id")
+        self.timestamp = frame.get("timestamp")
+        self.frames_merged += 1
+
+    def take(self) -> Dict[str, Any]:
+        """Returns the merged frame and clears the buffer."""
+        frame = {
+            "type": "delta",
+            "seq_id": self.last_seq,
+            "from_seq": self.first_seq,
+            "agents": self.agents,
+            "events": self.events,
+            "timestamp": self.timestamp
+        }
+        self.agents, self.events = {}, []
+        self.first_seq = self.last_seq = self.timestamp = None
+        return frame
@@ -0,0 +1,133 @@
+"""
+Pluggable execution of env.step for SimulationEngine.
+
+Modes:
+  - "inline":  step on the event loop. No thread hop; right for cheap pure-Python
+               envs, where a thread buys nothing under the GIL.
+  - "thread":  step on a dedicated, bounded thread pool. Keeps the loop responsive
+               for slow steps (blocking I/O, numpy/native code releasing the GIL).
+  - "auto":    starts on the thread pool, measures step cost and moves to inline
+               once steps are consistently cheap (and back if they get expensive).
+
+There is no process mode: the engine and its agents read env state directly
+(occupancy, zones, snapshots), so the env has to live in the engine's process.
+Sessions that need their own process run the whole engine in a worker
+(see core/process_runner.py).
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("StepExecutor")
+
+STEP_MODES = ("inline", "thread", "auto")
+
+
+def step_env(env: Any, agent_id: str, action: Any):
+    try:
+        return env.step(action, agent_id=agent_id)
+    except TypeError:
+        return env.step(action)
+
+
+def step_batch(env: Any, actions: Dict[str, Any]):
+    if hasattr(env, "step_batch"):
+        return env.step_batch(actions)
+    return {agent_id: step_env(env, agent_id, action) for agent_id, action in actions.items()}
+
+
+class StepExecutor:
+    """
+    Runs step functions `fn(env, *args)` in the configured mode.
+
+    In "auto" mode step cost is tracked as an exponential moving average; after
+    `sample_size` steps the executor goes inline when the average is below
+    `inline_threshold` seconds, and returns to the thread pool when it rises
+    above `inline_threshold * hysteresis`.
+    """
+    def __init__(self, mode: str = "thread", max_workers: int = 4,
+                 inline_threshold: float = 0.0005, sample_size: int = 20,
+                 hysteresis: float = 4.0):
+        if mode not in STEP_MODES:
+            raise ValueError(f"Unknown step mode '{mode}'. Use one of {STEP_MODES}")
+        self.mode = mode
+        self.active_mode = "thread" if mode == "auto" else mode
+        self.max_workers = max_workers
+        self.inline_threshold = inline_threshold
+        self.sample_size = sample_size
+        self.hysteresis = hysteresis
+
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+        # Measurements
+        self.avg_cost: Optional[float] = None
+        self.samples = 0
+        self.steps: Dict[str, int] = dict.fromkeys(("inline", "thread"), 0)
+        self.switches = 0
+        self._stats_lock = threading.Lock() # _observe runs on pool threads
+
+    async def run(self, env: Any, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        Runs `fn(env, *args)`. `timeout` applies to the thread pool;
+        an inline step can't be interrupted, which is why auto mode only goes
+        inline for steps measured to be cheap.
+        """
+        mode = self.active_mode
+        self.steps[mode] += 1
+        if mode == "inline":
+            return self._timed(fn, env, args)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._thread_pool(), self._timed, fn, env, args)
+        return await asyncio.wait_for(future, timeout=timeout)
+
+    def _timed(self, fn: Callable, env: Any, args: tuple):
+        start = time.perf_counter()
+        result = fn(env, *args)
+        self._observe(time.perf_counter() - start)
+        return result
+
+    def _observe(self, cost: float):
+        if self.mode != "auto":
+            return
+        with self._stats_lock:
+            self._update_cost(cost)
+
+    def _update_cost(self, cost: float):
+        self.avg_cost = cost if self.avg_cost is None else self.avg_cost + 0.2 * (cost - self.avg_cost)
+        self.samples += 1
+        if self.samples < self.sample_size:
+            return
+
+        if self.active_mode == "thread" and self.avg_cost < self.inline_threshold:
+            self._switch("inline")
+        elif self.active_mode == "inline" and self.avg_cost > self.inline_threshold * self.hysteresis:
+            self._switch("thread")
+
+    def _switch(self, mode: str):
+        logger.info(f"Step executor: {self.active_mode} -> {mode} (avg step {self.avg_cost * 1000:.3f}ms)")
+        self.active_mode = mode
+        self.switches += 1
+        self.samples = 0 # Re-measure before the next decision
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="env-step")
+        return self._threads
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "active_mode": self.active_mode,
+            "avg_cost": self.avg_cost,
+            "steps": dict(self.steps),
+            "switches": self.switches
+        }
+
+    def close(self):
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+            self._threads = None
@@ -2,6 +2,7 @@ import os
 import json
 import glob
 import pandas as pd
+from agent_forge.utils.audit_log import iter_audit_lines
 
 # Paths
 CONTROL_FILE = "control.json"
@@ -62,10 +63,9 @@ def load_checkpoint(file_path):
         return json.load(f)
 
 def load_messages():
+    # Includes rotated (and gzipped) segments, oldest first
     data = []
-    if os.path.exists(MESSAGE_LOG):
-        with open(MESSAGE_LOG, "r") as f:
-            for line in f:
-                try: data.append(json.loads(line))
-                except: continue
+    for line in iter_audit_lines(MESSAGE_LOG):
+        try: data.append(json.loads(line))
+        except: continue
     return data
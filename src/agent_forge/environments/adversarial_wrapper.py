@@ -67,16 +67,10 @@ class AdversarialOrderBookWrapper:
             # Let's implementation: Remove top 3 levels of Bids and Asks to widen spread.
             # Access internal book directly (Whitebox adversary)
             
-            # Remove top bids
+            # Remove top bids and asks
             for _ in range(3):
-                if self.env.book.bids:
-                    import heapq
-                    heapq.heappop(self.env.book.bids)
-            # Remove top asks
-            for _ in range(3):
-                if self.env.book.asks:
-                    import heapq
-                    heapq.heappop(self.env.book.asks)
+                self.env.book.pop_best('BUY')
+                self.env.book.pop_best('SELL')
             
             info_extras['adversary_event'] = 'LIQUIDITY_CRISIS'
 
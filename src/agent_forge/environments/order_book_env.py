@@ -1,5 +1,7 @@
 import heapq
+import bisect
 import logging
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from .base_env import BaseEnvironment
@@ -132,36 +134,333 @@ class OrderBook:
             'asks': [{'price': a.price, 'quantity': a.quantity, 'id': a.order_id, 'agent_id': a.agent_id} for a in top_asks]
         }
 
+    def best_bid(self) -> Optional[float]:
+        return self.bids[0].price if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks[0].price if self.asks else None
+
+    def get_levels(self) -> Dict[str, Dict[float, int]]:
+        """Aggregated volume per price level for both sides. O(n) over resting orders."""
+        levels = {'bids': {}, 'asks': {}}
+        for key, heap in (('bids', self.bids), ('asks', self.asks)):
+            for o in heap:
+                levels[key][o.price] = levels[key].get(o.price, 0) + o.quantity
+        return levels
+
+    def pop_best(self, side: str) -> Optional[Order]:
+        """Removes the highest-priority resting order on one side."""
+        heap = self.bids if side == 'BUY' else self.asks
+        if not heap:
+            return None
+        order = heapq.heappop(heap)
+        if self.orders.get(order.order_id) is order:
+            del self.orders[order.order_id]
+        return order
+
+class PriceLevelOrderBook:
+    """
+    Order book keyed by price level, drop-in for OrderBook.
+
+    Each level is a FIFO queue (OrderedDict keyed by arrival sequence), prices are
+    kept sorted per side and aggregate volume per level is tracked as orders come
+    and go. Cancel is O(1) for the order plus an O(log L) bisect when its level
+    empties, best bid/ask are O(1), and snapshots are cached until the book changes.
+    Matching (price-time priority) and trade dicts are identical to OrderBook.
+    """
+    def __init__(self):
+        self.bid_levels: Dict[float, OrderedDict] = {}
+        self.ask_levels: Dict[float, OrderedDict] = {}
+        self.bid_prices: List[float] = [] # Ascending; best bid is last
+        self.ask_prices: List[float] = [] # Ascending; best ask is first
+        self.bid_volume: Dict[float, int] = {}
+        self.ask_volume: Dict[float, int] = {}
+        self.orders: Dict[str, Order] = {}
+        self.time_counter = 0.0
+        self._version = 0
+        self._snapshot_cache: Dict[Tuple[str, int], Tuple[int, Dict]] = {}
+        # Delta feeds only: (side, price) touched since the last drain. Off by default,
+        # since nothing would ever drain the set
+        self.track_changes = False
+        self._changed_levels = set()
+
+    def _side(self, side: str):
+        if side == 'BUY':
+            return self.bid_levels, self.bid_prices, self.bid_volume
+        return self.ask_levels, self.ask_prices, self.ask_volume
+
+    def _touch(self, side: str, price: float):
+        if self.track_changes:
+            self._changed_levels.add((side, price))
+
+    def _drop_level(self, side: str, price: float):
+        levels, prices, volume = self._side(side)
+        self._touch(side, price)
+        del levels[price]
+        del volume[price]
+        del prices[bisect.bisect_left(prices, price)]
+
+    def _rest(self, order: Order):
+        levels, prices, volume = self._side(order.side)
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = OrderedDict()
+            volume[order.price] = 0
+            bisect.insort(prices, order.price)
+        queue[order.timestamp] = order
+        volume[order.price] += order.quantity
+        self._touch(order.side, order.price)
+        self.orders[order.order_id] = order
+
+    def _fill(self, resting: Order, quantity: int):
+        levels, _, volume = self._side(resting.side)
+        resting.quantity -= quantity
+        volume[resting.price] -= quantity
+        self._touch(resting.side, resting.price)
+        if resting.quantity == 0:
+            queue = levels[resting.price]
+            del queue[resting.timestamp]
+            if self.orders.get(resting.order_id) is resting:
+                del self.orders[resting.order_id]
+            if not queue:
+                self._drop_level(resting.side, resting.price)
+
+    def add_order(self, side: str, price: float, quantity: int, order_id: str, agent_id: str) -> List[Dict]:
+        self.time_counter += 1.0
+        self._version += 1
+        trades = []
+        remaining_qty = quantity
+
+        if side == 'BUY':
+            while remaining_qty > 0 and self.ask_prices and price >= self.ask_prices[0]:
+                best_ask = next(iter(self.ask_levels[self.ask_prices[0]].values()))
+                trade_qty = min(remaining_qty, best_ask.quantity)
+                trades.append({
+                    'buy_order_id': order_id,
+                    'buy_agent_id': agent_id,
+                    'sell_order_id': best_ask.order_id,
+                    'sell_agent_id': best_ask.agent_id,
+                    'price': best_ask.price,
+                    'quantity': trade_qty,
+                    'side': 'BUY' # Aggressor side
+                })
+                remaining_qty -= trade_qty
+                self._fill(best_ask, trade_qty)
+
+            if remaining_qty > 0:
+                self._rest(BidOrder(price=price, timestamp=self.time_counter, quantity=remaining_qty, order_id=order_id, side='BUY', agent_id=agent_id))
+
+        elif side == 'SELL':
+            while remaining_qty > 0 and self.bid_prices and price <= self.bid_prices[-1]:
+                best_bid = next(iter(self.bid_levels[self.bid_prices[-1]].values()))
+                trade_qty = min(remaining_qty, best_bid.quantity)
+                trades.append({
+                    'buy_order_id': best_bid.order_id,
+                    'buy_agent_id': best_bid.agent_id,
+                    'sell_order_id': order_id,
+                    'sell_agent_id': agent_id,
+                    'price': best_bid.price,
+                    'quantity': trade_qty,
+                    'side': 'SELL' # Aggressor side
+                })
+                remaining_qty -= trade_qty
+                self._fill(best_bid, trade_qty)
+
+            if remaining_qty > 0:
+                self._rest(AskOrder(price=price, timestamp=self.time_counter, quantity=remaining_qty, order_id=order_id, side='SELL', agent_id=agent_id))
+
+        return trades
+
+    def _unrest(self, order: Order):
+        """Takes a resting order off its level, leaving the order itself untouched."""
+        levels, _, volume = self._side(order.side)
+        queue = levels.get(order.price)
+        if queue is not None and queue.pop(order.timestamp, None) is not None:
+            volume[order.price] -= order.quantity
+            self._touch(order.side, order.price)
+            if not queue:
+                self._drop_level(order.side, order.price)
+        self._version += 1
+
+    def cancel_order(self, order_id: str) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        self._unrest(order)
+        return True
+
+    def pop_best(self, side: str) -> Optional[Order]:
+        """Removes the highest-priority resting order on one side (returned with its resting quantity)."""
+        levels, prices, _ = self._side(side)
+        if not prices:
+            return None
+        best = prices[-1] if side == 'BUY' else prices[0]
+        order = next(iter(levels[best].values()))
+        if self.orders.get(order.order_id) is order:
+            del self.orders[order.order_id]
+        self._unrest(order)
+        return order
+
+    def best_bid(self) -> Optional[float]:
+        return self.bid_prices[-1] if self.bid_prices else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.ask_prices[0] if self.ask_prices else None
+
+    def _cached(self, kind: str, depth: int, build) -> Dict:
+        cached = self._snapshot_cache.get((kind, depth))
+        if cached is None or cached[0] != self._version:
+            cached = (self._version, build(depth))
+            self._snapshot_cache[(kind, depth)] = cached
+        # Hand out a copy so callers can't mutate the cached snapshot
+        return {key: [dict(row) if isinstance(row, dict) else row for row in rows]
+                for key, rows in cached[1].items()}
+
+    def _top_orders(self, side: str, depth: int) -> List[Dict]:
+        levels, prices, _ = self._side(side)
+        ordered = reversed(prices) if side == 'BUY' else prices
+        top = []
+        for price in ordered:
+            for o in levels[price].values():
+                top.append({'price': o.price, 'quantity': o.quantity, 'id': o.order_id, 'agent_id': o.agent_id})
+                if len(top) == depth:
+                    return top
+        return top
+
+    def get_snapshot(self, depth: int = 5) -> Dict:
+        """Top `depth` resting orders per side (same format as OrderBook), cached per book version."""
+        return self._cached('orders', depth, lambda d: {
+            'bids': self._top_orders('BUY', d),
+            'asks': self._top_orders('SELL', d)
+        })
+
+    def get_levels(self) -> Dict[str, Dict[float, int]]:
+        """Aggregated volume per price level for both sides."""
+        return {'bids': dict(self.bid_volume), 'asks': dict(self.ask_volume)}
+
+    def drain_changed_levels(self) -> Dict[str, List[Tuple[float, int]]]:
+        """Levels touched since the last drain as (price, volume); volume 0 means the level is gone. Needs track_changes."""
+        changed = {'bids': [], 'asks': []}
+        for side, price in sorted(self._changed_levels, key=lambda k: (k[0], k[1])):
+            if side == 'BUY':
+                changed['bids'].append((price, self.bid_volume.get(price, 0)))
+            else:
+                changed['asks'].append((price, self.ask_volume.get(price, 0)))
+        self._changed_levels.clear()
+        return changed
+
+    def get_depth(self, depth: int = 5) -> Dict:
+        """Aggregated L2 view: top `depth` price levels per side as (price, total quantity)."""
+        return self._cached('levels', depth, lambda d: {
+            'bids': [(p, self.bid_volume[p]) for p in self.bid_prices[::-1][:d]],
+            'asks': [(p, self.ask_volume[p]) for p in self.ask_prices[:d]]
+        })
+
+class MarketDataBook:
+    """
+    Client-side L2 book rebuilt from OrderBookEnv delta-mode frames.
+    A gap in 'seq' marks the book out of sync until the next full snapshot.
+    """
+    def __init__(self):
+        self.bids: Dict[float, int] = {}
+        self.asks: Dict[float, int] = {}
+        self.portfolios: Dict[str, Dict[str, float]] = {}
+        self.mid_price: Optional[float] = None
+        self.seq: Optional[int] = None
+        self.in_sync = False
+
+    def apply(self, frame: Dict[str, Any]) -> bool:
+        """Applies a snapshot or delta frame. Returns True if the book is in sync."""
+        if frame.get('type') == 'snapshot':
+            self.bids = dict(frame['levels']['bids'])
+            self.asks = dict(frame['levels']['asks'])
+            self.portfolios = {a: dict(p) for a, p in frame['portfolios'].items()}
+            self.in_sync = True
+        elif frame.get('type') == 'delta':
+            if not self.in_sync or self.seq is None or frame['seq'] != self.seq + 1:
+                self.in_sync = False
+            else:
+                for key, book in (('bids', self.bids), ('asks', self.asks)):
+                    for price, qty in frame['levels'][key]:
+                        if qty:
+                            book[price] = qty
+                        else:
+                            book.pop(price, None)
+                self.portfolios.update({a: dict(p) for a, p in frame['portfolios'].items()})
+        else:
+            return self.in_sync
+        self.seq = frame['seq']
+        self.mid_price = frame['mid_price']
+        return self.in_sync
+
+    def best_bid(self) -> Optional[float]:
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        return min(self.asks) if self.asks else None
+
 class OrderBookEnv(BaseEnvironment):
-    def __init__(self, start_cash: float = 100000.0):
+    def __init__(self, start_cash: float = 100000.0, book_cls: type = OrderBook,
+                 delta_mode: bool = False, snapshot_interval: int = 100):
+        """
+        Args:
+            start_cash: Initial cash for every new portfolio.
+            book_cls: Book implementation; PriceLevelOrderBook suits cancel-heavy flow.
+            delta_mode: If True, step() returns incremental L2 frames (changed levels,
+                        new trades, touched portfolios) instead of full observations.
+            snapshot_interval: In delta mode, emit a full snapshot frame every N steps for resync.
+        """
         self.start_cash = start_cash
-        self.book = OrderBook()
+        self.book_cls = book_cls
+        self.delta_mode = delta_mode
+        self.book = self._new_book()
         self.last_trades = []
         # Portfolios: agent_id -> {cash, inventory}
         self.portfolios: Dict[str, Dict[str, float]] = {}
 
+        # Delta feed state
+        self.snapshot_interval = snapshot_interval
+        self._seq = 0
+        self._last_levels: Dict[str, Dict[float, int]] = {'bids': {}, 'asks': {}}
+
+    def _new_book(self):
+        book = self.book_cls()
+        if hasattr(book, 'track_changes'):
+            book.track_changes = self.delta_mode # Only delta frames drain the changes
+        return book
+
     def reset(self) -> Dict[str, Any]:
-        self.book = OrderBook()
+        self.book = self._new_book()
         self.last_trades = []
         self.portfolios = {}
+        self._seq = 0
+        if self.delta_mode:
+            return self.get_full_snapshot()
         return self._get_obs()
 
     def _ensure_portfolio(self, agent_id: str):
         if agent_id not in self.portfolios:
             self.portfolios[agent_id] = {'cash': self.start_cash, 'inventory': 0}
 
-    def step(self, action: Dict[str, Any]) -> Tuple[Dict[str, Any], float, bool, Dict[str, Any]]:
-        """
-        Extended Action Schema:
-        { ..., 'agent_id': str } (Required for portfolio logic)
-        """
+    def _portfolio(self, agent_id: str, working: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, float]:
+        """Returns the agent's portfolio, or its working copy when a batch is being accumulated."""
+        self._ensure_portfolio(agent_id)
+        if working is None:
+            return self.portfolios[agent_id]
+        if agent_id not in working:
+            working[agent_id] = dict(self.portfolios[agent_id])
+        return working[agent_id]
+
+    def _execute(self, action: Dict[str, Any], working: Optional[Dict[str, Dict[str, float]]] = None) -> Tuple[Dict[str, Any], List[Dict]]:
+        """Pre-trade checks and matching for one order. Returns (info, trades)."""
         action_type = action.get('type')
         order_id = action.get('id')
         agent_id = action.get('agent_id', 'unknown')
         
-        self._ensure_portfolio(agent_id)
+        portfolio = self._portfolio(agent_id, working)
         
         info = {'trades': [], 'errors': []}
+        trades = []
         
         if action_type == 'LIMIT':
             side = action.get('side')
@@ -173,7 +472,6 @@ class OrderBookEnv(BaseEnvironment):
             # and rely on RiskMonitor to yell about it. Or we can enforce here.
             # Plan said: "Hard Constraints: Reject orders if insufficient cash/inventory."
             rejected = False
-            portfolio = self.portfolios[agent_id]
             cost = price * qty
             
             if side == 'BUY':
@@ -192,33 +490,80 @@ class OrderBookEnv(BaseEnvironment):
                 trades = self.book.add_order(side, price, qty, order_id, agent_id)
                 info['trades'] = trades
                 self.last_trades = trades
-                self._process_trades(trades)
+                self._process_trades(trades, working)
             else:
                 info['rejected'] = True
 
         elif action_type == 'CANCEL':
             success = self.book.cancel_order(order_id)
             info['cancel_success'] = success
+
+        return info, trades
+
+    def _touched_agents(self, actions: List[Dict[str, Any]], trades: List[Dict]) -> set:
+        touched = {a.get('agent_id', 'unknown') for a in actions}
+        for t in trades:
+            touched.add(t['buy_agent_id'])
+            touched.add(t['sell_agent_id'])
+        return touched
+
+    def step(self, action: Dict[str, Any]) -> Tuple[Dict[str, Any], float, bool, Dict[str, Any]]:
+        """
+        Extended Action Schema:
+        { ..., 'agent_id': str } (Required for portfolio logic)
+        """
+        info, trades = self._execute(action)
+
+        if self.delta_mode:
+            return self._get_delta_obs(trades, self._touched_agents([action], trades)), 0.0, False, info
             
         return self._get_obs(), 0.0, False, info
 
-    def _process_trades(self, trades: List[Dict]):
+    def step_many(self, actions: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Batched order entry: LIMIT and CANCEL orders are checked and matched in
+        arrival order, exactly as successive step() calls would, but portfolio
+        changes are accumulated on working copies and written back in one pass,
+        and a single observation is built for the whole batch.
+        Returns (observation, per-order info list aligned with `actions`).
+        Malformed orders are rejected individually instead of aborting the batch.
+        """
+        working: Dict[str, Dict[str, float]] = {}
+        results = []
+        batch_trades = []
+
+        for action in actions:
+            try:
+                info, trades = self._execute(action, working)
+            except (TypeError, ValueError) as e:
+                info, trades = {'trades': [], 'errors': [f"Malformed order: {e}"], 'rejected': True}, []
+            results.append(info)
+            batch_trades.extend(trades)
+
+        # One pass over the touched portfolios (in place, so held references stay valid)
+        for agent_id, portfolio in working.items():
+            self.portfolios[agent_id].update(portfolio)
+        # last_trades was already set per order by _execute, as successive step() calls leave it
+
+        if self.delta_mode:
+            return self._get_delta_obs(batch_trades, self._touched_agents(actions, batch_trades)), results
+        return self._get_obs(), results
+
+    def _process_trades(self, trades: List[Dict], working: Optional[Dict[str, Dict[str, float]]] = None):
         for trade in trades:
             price = trade['price']
             qty = trade['quantity']
             cost = price * qty
             
             # Buyer
-            buyer = trade['buy_agent_id']
-            self._ensure_portfolio(buyer)
-            self.portfolios[buyer]['cash'] -= cost
-            self.portfolios[buyer]['inventory'] += qty
+            buyer = self._portfolio(trade['buy_agent_id'], working)
+            buyer['cash'] -= cost
+            buyer['inventory'] += qty
             
             # Seller
-            seller = trade['sell_agent_id']
-            self._ensure_portfolio(seller)
-            self.portfolios[seller]['cash'] += cost
-            self.portfolios[seller]['inventory'] -= qty
+            seller = self._portfolio(trade['sell_agent_id'], working)
+            seller['cash'] += cost
+            seller['inventory'] -= qty
 
     def _get_obs(self) -> Dict[str, Any]:
         return {
@@ -228,10 +573,60 @@ class OrderBookEnv(BaseEnvironment):
             'mid_price': self._get_mid_price()
         }
 
+    def _level_deltas(self) -> Dict[str, List[Tuple[float, int]]]:
+        """Price levels changed since the last frame, as (price, volume); volume 0 = removed."""
+        if hasattr(self.book, 'drain_changed_levels'):
+            return self.book.drain_changed_levels()
+        # Fallback for books without change tracking: diff aggregated levels
+        levels = self.book.get_levels()
+        deltas = {}
+        for key in ('bids', 'asks'):
+            old, new = self._last_levels[key], levels[key]
+            changed = [(p, q) for p, q in new.items() if old.get(p) != q]
+            changed += [(p, 0) for p in old if p not in new]
+            deltas[key] = sorted(changed)
+        self._last_levels = levels
+        return deltas
+
+    def get_full_snapshot(self, trades: Optional[List[Dict]] = None) -> Dict[str, Any]:
+        """
+        Full resync frame for delta-mode consumers (all levels, all portfolios).
+        `trades` are the trades of the step that produced the frame, if any.
+        """
+        self._seq += 1
+        levels = self.book.get_levels()
+        self._last_levels = levels
+        if hasattr(self.book, 'drain_changed_levels'):
+            self.book.drain_changed_levels()
+        return {
+            'type': 'snapshot',
+            'seq': self._seq,
+            'levels': {
+                'bids': sorted(levels['bids'].items(), reverse=True),
+                'asks': sorted(levels['asks'].items())
+            },
+            'market_snapshot': self.book.get_snapshot(),
+            'trades': trades or [],
+            'portfolios': {a: dict(p) for a, p in self.portfolios.items()},
+            'mid_price': self._get_mid_price()
+        }
+
+    def _get_delta_obs(self, trades: List[Dict], touched) -> Dict[str, Any]:
+        if self.snapshot_interval and (self._seq + 1) % self.snapshot_interval == 0:
+            return self.get_full_snapshot(trades)
+        self._seq += 1
+        return {
+            'type': 'delta',
+            'seq': self._seq,
+            'levels': self._level_deltas(),
+            'trades': trades,
+            'portfolios': {a: dict(self.portfolios[a]) for a in touched if a in self.portfolios},
+            'mid_price': self._get_mid_price()
+        }
+
     def _get_mid_price(self) -> float:
-        snapshot = self.book.get_snapshot(depth=1)
-        best_bid = snapshot['bids'][0]['price'] if snapshot['bids'] else None
-        best_ask = snapshot['asks'][0]['price'] if snapshot['asks'] else None
+        best_bid = self.book.best_bid()
+        best_ask = self.book.best_ask()
         
         if best_bid and best_ask:
             return (best_bid + best_ask) / 2
@@ -1,6 +1,7 @@
 from typing import Any, Tuple, Dict, List
 import random
 from agent_forge.environments.base_env import BaseEnvironment
+from agent_forge.utils.occupancy import OccupancyIndex
 
 class WarehouseEnv(BaseEnvironment):
     """
@@ -18,7 +19,7 @@ class WarehouseEnv(BaseEnvironment):
         self.config = config or {}
         self.battery_drain = self.config.get("battery_drain", 0.5)
         
-        self.agents = {} # agent_id -> state dict
+        self.agents = OccupancyIndex() # agent_id -> state dict, indexed by position
         
         # Define Zones
         # Simple layout: 
@@ -33,7 +34,7 @@ class WarehouseEnv(BaseEnvironment):
         
     def reset(self) -> Dict[str, Any]:
         """Resets all agents to random positions."""
-        self.agents = {}
+        self.agents = OccupancyIndex()
         # We assume specific agent IDs will be passed in step, OR we pre-seed them.
         # But reset typically returns initial state. 
         # In multi-agent, maybe return a dict of states?
@@ -48,7 +49,7 @@ class WarehouseEnv(BaseEnvironment):
             while True:
                 pos = (random.randint(0, self.size-1), random.randint(0, self.size-1))
                 # Check occupancy
-                occupied = any(a["position"] == pos for a in self.agents.values())
+                occupied = self.agents.is_occupied(pos)
                 # Check walls/zones? (Zones are walkable, just special)
                 # Ideally don't spawn exactly on zone targets to force movement?
                 if not occupied:
@@ -61,6 +62,10 @@ class WarehouseEnv(BaseEnvironment):
             }
         return self.agents[agent_id]
 
+    def is_occupied(self, pos: Tuple[int, int], exclude_agent: str = None) -> bool:
+        """O(1) check whether a cell holds an agent (other than exclude_agent)."""
+        return self.agents.is_occupied(pos, exclude_agent=exclude_agent)
+
     def step(self, action: str, agent_id: str = "default") -> Tuple[Any, float, bool, Dict[str, Any]]:
         state = self.get_agent_state(agent_id)
         x, y = state["position"]
@@ -105,11 +110,7 @@ class WarehouseEnv(BaseEnvironment):
         if 0 <= new_x < self.size and 0 <= new_y < self.size:
 
             # Collision Check
-            is_blocked = False
-            for other_id, other_state in self.agents.items():
-                if other_id != agent_id and other_state["position"] == (new_x, new_y):
-                    is_blocked = True
-                    break
+            is_blocked = self.agents.is_occupied((new_x, new_y), exclude_agent=agent_id)
             
             if is_blocked:
                 reward -= 0.1 # Minor wait penalty (Blocked)
@@ -0,0 +1,318 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Iterator, Tuple, Dict, List, Optional
+import random
+import time
+import numpy as np
+from agent_forge.core.base_env import BaseEnvironment
+
+# Action codes (index into the movement tables below)
+STAY, UP, DOWN, RIGHT, LEFT, PICKUP, DROPOFF, CHARGE = range(8)
+ACTION_CODES = {
+    "STAY": STAY, "UP": UP, "DOWN": DOWN, "RIGHT": RIGHT, "LEFT": LEFT,
+    "PICKUP": PICKUP, "DROPOFF": DROPOFF, "CHARGE": CHARGE
+}
+_DX = np.array([0, 0, 0, 1, -1, 0, 0, 0], dtype=np.int64)
+_DY = np.array([0, 1, -1, 0, 0, 0, 0, 0], dtype=np.int64)
+
+# Event codes for info["event"] (later events overwrite earlier ones, as in WarehouseEnv)
+_EVENTS = [None, "picked_up", "delivered", "battery_depleted"]
+
+_FIELDS = ("position", "battery", "carrying", "server_time")
+
+
+class _AgentStateView(MutableMapping):
+    """
+    One agent's row, seen as a WarehouseEnv state dict.
+    Writes go straight to the env arrays (position writes also move the agent
+    on the occupancy grid). The key set is fixed: unknown keys raise KeyError.
+    """
+    __slots__ = ("_env", "_idx")
+
+    def __init__(self, env: "VectorWarehouseEnv", idx: int):
+        self._env = env
+        self._idx = idx
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return self._env._state_dict(self._idx)[key]
+
+    def __setitem__(self, key: str, value: Any):
+        env, idx = self._env, self._idx
+        if key == "position":
+            env._move(idx, value)
+        elif key == "battery":
+            env.batteries[idx] = value
+        elif key == "carrying":
+            env.carrying[idx] = value is not None
+        elif key == "server_time":
+            env.server_times[idx] = value
+        else:
+            raise KeyError(f"VectorWarehouseEnv agents only store {', '.join(_FIELDS)}; got '{key}'")
+
+    def __delitem__(self, key: str):
+        raise TypeError("VectorWarehouseEnv agent fields can't be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(self._env._state_dict(self._idx))
+
+
+class _AgentsView(Mapping):
+    """agent_id -> _AgentStateView; assigning a state dict writes its fields through."""
+    __slots__ = ("_env",)
+
+    def __init__(self, env: "VectorWarehouseEnv"):
+        self._env = env
+
+    def __getitem__(self, agent_id: str) -> _AgentStateView:
+        return _AgentStateView(self._env, self._env._index[agent_id])
+
+    def __setitem__(self, agent_id: str, state: Dict[str, Any]):
+        view = _AgentStateView(self._env, self._env.agent_index(agent_id))
+        for key, value in state.items():
+            view[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._env._ids)
+
+    def __len__(self) -> int:
+        return len(self._env._ids)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._env._index
+
+
+class VectorWarehouseEnv(BaseEnvironment):
+    """
+    Array-backed variant of WarehouseEnv for large fleets.
+    Agents are stored as structure-of-arrays (positions, batteries, carry flags)
+    plus an occupancy grid of per-cell agent counts, and step_batch applies
+    movement, battery drain, zone checks and boundary clamping for every agent
+    in one vectorized pass. Per-agent rules match envs.warehouse.WarehouseEnv.
+    """
+
+    def __init__(self, size: int = 10, num_agents: int = 3, config: Dict[str, Any] = None):
+        self.size = size
+        self.num_agents = num_agents
+        self.config = config or {}
+        self.battery_drain_rate = self.config.get("battery_drain_rate", 2.0) # per second
+        self.safety_rails = self.config.get("safety_rails", False) # If False, allows out-of-bounds
+
+        # Local Random for Determinism
+        self._rng = random.Random(self.config.get("seed", 42))
+
+        # Same layout as WarehouseEnv: pickup x=0, dropoff x=size-1, charger y=size-1
+        self.zones = {
+            "pickup": [(0, y) for y in range(size)],
+            "dropoff": [(size-1, y) for y in range(size)],
+            "charger": [(x, size-1) for x in range(size)]
+        }
+
+        self._allocate(max(1, num_agents))
+
+    def _allocate(self, capacity: int):
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.positions = np.zeros((capacity, 2), dtype=np.int64)
+        self.batteries = np.zeros(capacity, dtype=np.float64)
+        self.carrying = np.zeros(capacity, dtype=bool)
+        self.server_times = np.zeros(capacity, dtype=np.float64)
+        self.occupancy = np.zeros((self.size, self.size), dtype=np.int32)
+
+    def _grow(self):
+        """Doubles array capacity when more agents spawn than were preallocated."""
+        capacity = 2 * len(self.batteries)
+        count = len(self._ids)
+        for name in ("positions", "batteries", "carrying", "server_times"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:count] = old[:count]
+            setattr(self, name, new)
+
+    def reset(self) -> Dict[str, Any]:
+        """Removes all agents; they respawn on first get_agent_state/step."""
+        self._allocate(max(1, self.num_agents))
+        return {}
+
+    def _in_bounds(self, xs, ys):
+        return (xs >= 0) & (xs < self.size) & (ys >= 0) & (ys < self.size)
+
+    def _spawn(self, agent_id: str) -> int:
+        """Collision-free spawn in the middle area, using the occupancy grid for O(1) checks."""
+        pos = None
+        for _ in range(100):
+            # Spawn in middle area x=[1, size-2] to avoid pickup/dropoff congestion
+            rx = self._rng.randint(1, self.size-2)
+            ry = self._rng.randint(0, self.size-1)
+            if self.occupancy[rx, ry] == 0:
+                pos = (rx, ry)
+                break
+
+        if pos is None:
+            # Fallback: Just pick random valid spot even if occupied
+            pos = (self._rng.randint(1, self.size-2), self._rng.randint(0, self.size-1))
+
+        idx = len(self._ids)
+        if idx >= len(self.batteries):
+            self._grow()
+        self._ids.append(agent_id)
+        self._index[agent_id] = idx
+        self.positions[idx] = pos
+        self.batteries[idx] = 100.0
+        self.carrying[idx] = False
+        self.server_times[idx] = time.time()
+        self.occupancy[pos] += 1
+        return idx
+
+    def agent_index(self, agent_id: str) -> int:
+        """Returns the array row for an agent, spawning it if needed."""
+        idx = self._index.get(agent_id)
+        if idx is None:
+            idx = self._spawn(agent_id)
+        return idx
+
+    def _state_dict(self, idx: int) -> Dict[str, Any]:
+        x, y = self.positions[idx]
+        return {
+            "position": (int(x), int(y)),
+            "battery": float(self.batteries[idx]),
+            "carrying": "package" if self.carrying[idx] else None,
+            "server_time": float(self.server_times[idx])
+        }
+
+    def get_agent_state(self, agent_id: str):
+        """Helper to init or get state. Returns a dict snapshot, as WarehouseEnv does."""
+        return self._state_dict(self.agent_index(agent_id))
+
+    @property
+    def agents(self) -> _AgentsView:
+        """
+        Write-through dict-of-dicts view for callers written against WarehouseEnv,
+        e.g. env.agents[a]["battery"] = 5.0 updates the arrays. Per-field access; avoid on hot paths.
+        """
+        return _AgentsView(self)
+
+    def _move(self, idx: int, pos: Tuple[int, int]):
+        """Sets an agent's position, keeping the occupancy grid consistent."""
+        ox, oy = self.positions[idx]
+        if 0 <= ox < self.size and 0 <= oy < self.size:
+            self.occupancy[ox, oy] -= 1
+        x, y = pos
+        self.positions[idx] = (x, y)
+        if 0 <= x < self.size and 0 <= y < self.size:
+            self.occupancy[x, y] += 1
+
+    def is_occupied(self, pos: Tuple[int, int], exclude_agent: Optional[str] = None) -> bool:
+        """O(1) occupancy check against the grid."""
+        x, y = pos
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        count = int(self.occupancy[x, y])
+        if exclude_agent is not None and exclude_agent in self._index:
+            ex, ey = self.positions[self._index[exclude_agent]]
+            if (ex, ey) == (x, y):
+                count -= 1
+        return count > 0
+
+    def step_arrays(self, idx: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized core of step_batch.
+        Args:
+            idx: Agent rows (unique) to step.
+            codes: Action codes (see ACTION_CODES), aligned with idx.
+        Returns:
+            (rewards, dones, event_codes, old_positions) aligned with idx.
+        """
+        n = len(idx)
+        now = time.time()
+        old = self.positions[idx].copy()
+        x, y = old[:, 0], old[:, 1]
+        carrying = self.carrying[idx]
+
+        rewards = np.full(n, -0.1) # Time cost
+        events = np.zeros(n, dtype=np.int8)
+
+        # Battery cost (Time-based), at least some cost if duration is tiny
+        duration = now - self.server_times[idx]
+        battery = self.batteries[idx] - np.maximum(0.01, duration) * self.battery_drain_rate
+
+        # Zones (only in-bounds cells belong to a zone)
+        here_ok = self._in_bounds(x, y)
+        on_pickup = here_ok & (x == 0)
+        on_dropoff = here_ok & (x == self.size - 1)
+        on_charger = here_ok & (y == self.size - 1)
+
+        is_pickup = codes == PICKUP
+        picked = is_pickup & on_pickup & ~carrying
+        carrying = carrying | picked
+        rewards += np.where(picked, 1.0, np.where(is_pickup, -0.5, 0.0))
+        events[picked] = 1
+
+        is_dropoff = codes == DROPOFF
+        dropped = is_dropoff & on_dropoff & carrying
+        carrying = carrying & ~dropped
+        rewards += np.where(dropped, 10.0, np.where(is_dropoff, -0.5, 0.0))
+        events[dropped] = 2
+
+        is_charge = codes == CHARGE
+        charged = is_charge & on_charger
+        battery = np.where(charged, np.minimum(100.0, battery + 10.0), battery)
+        rewards -= np.where(is_charge & ~charged, 0.5, 0.0)
+
+        # Movement
+        new_x = x + _DX[codes]
+        new_y = y + _DY[codes]
+
+        # Boundary Check: clamp only with safety rails (otherwise Auditors catch it)
+        if self.safety_rails:
+            blocked = ~self._in_bounds(new_x, new_y)
+            new_x = np.where(blocked, x, new_x)
+            new_y = np.where(blocked, y, new_y)
+            rewards -= np.where(blocked, 1.0, 0.0)
+
+        # Occupancy Grid: remove old cells, add new ones (counts tolerate overlaps)
+        old_in = here_ok
+        np.subtract.at(self.occupancy, (x[old_in], y[old_in]), 1)
+        new_in = self._in_bounds(new_x, new_y)
+        np.add.at(self.occupancy, (new_x[new_in], new_y[new_in]), 1)
+
+        # Update State
+        self.positions[idx, 0] = new_x
+        self.positions[idx, 1] = new_y
+        self.batteries[idx] = battery
+        self.carrying[idx] = carrying
+        self.server_times[idx] = now
+
+        dones = battery <= 0
+        rewards -= np.where(dones, 10.0, 0.0)
+        events[dones] = 3
+
+        return rewards, dones, events, old
+
+    def step_batch(self, actions: Dict[str, Any]) -> Dict[str, Tuple[Any, float, bool, Dict[str, Any]]]:
+        agent_ids = list(actions)
+        idx = np.fromiter((self.agent_index(a) for a in agent_ids), dtype=np.int64, count=len(agent_ids))
+        codes = np.fromiter((ACTION_CODES.get(a, STAY) for a in actions.values()), dtype=np.int64, count=len(agent_ids))
+
+        rewards, dones, events, old = self.step_arrays(idx, codes)
+
+        results = {}
+        for i, agent_id in enumerate(agent_ids):
+            info = {"valid_action": True, "old_pos": (int(old[i, 0]), int(old[i, 1]))}
+            event = _EVENTS[events[i]]
+            if event:
+                info["event"] = event
+            results[agent_id] = (self._state_dict(idx[i]), float(rewards[i]), bool(dones[i]), info)
+        return results
+
+    def step(self, action: str, agent_id: str = "default") -> Tuple[Any, float, bool, Dict[str, Any]]:
+        return self.step_batch({agent_id: action})[agent_id]
+
+    def render(self):
+        pass
@@ -2,6 +2,7 @@ from typing import Any, Tuple, Dict, List
 import random
 import time
 from agent_forge.core.base_env import BaseEnvironment
+from agent_forge.utils.occupancy import OccupancyIndex
 
 class WarehouseEnv(BaseEnvironment):
     """
@@ -23,7 +24,7 @@ class WarehouseEnv(BaseEnvironment):
         # Local Random for Determinism
         self._rng = random.Random(self.config.get("seed", 42))
         
-        self.agents = {} # agent_id -> state dict
+        self.agents = OccupancyIndex() # agent_id -> state dict, indexed by position
         
         # Define Zones
         # Simple layout: 
@@ -38,7 +39,7 @@ class WarehouseEnv(BaseEnvironment):
         
     def reset(self) -> Dict[str, Any]:
         """Resets all agents to random positions."""
-        self.agents = {}
+        self.agents = OccupancyIndex()
         # We assume specific agent IDs will be passed in step, OR we pre-seed them.
         # But reset typically returns initial state. 
         # In multi-agent, maybe return a dict of states?
@@ -49,9 +50,6 @@ class WarehouseEnv(BaseEnvironment):
     def get_agent_state(self, agent_id: str):
         """Helper to init or get state with collision-free spawning."""
         if agent_id not in self.agents:
-            # Gather all occupied positions
-            occupied = {s["position"] for s in self.agents.values()}
-            
             # Try to find a free spot
             # Simple rejection sampling with fallback
             pos = None
@@ -61,7 +59,7 @@ class WarehouseEnv(BaseEnvironment):
                 rx = self._rng.randint(1, self.size-2)
                 ry = self._rng.randint(0, self.size-1)
                 candidate = (rx, ry)
-                if candidate not in occupied:
+                if not self.agents.is_occupied(candidate):
                     pos = candidate
                     break
             
@@ -81,6 +79,10 @@ class WarehouseEnv(BaseEnvironment):
             
         return self.agents[agent_id]
 
+    def is_occupied(self, pos: Tuple[int, int], exclude_agent: str = None) -> bool:
+        """O(1) check whether a cell holds an agent (other than exclude_agent)."""
+        return self.agents.is_occupied(pos, exclude_agent=exclude_agent)
+
     def step(self, action: str, agent_id: str = "default") -> Tuple[Any, float, bool, Dict[str, Any]]:
         state = self.get_agent_state(agent_id)
         x, y = state["position"]
@@ -169,9 +169,6 @@ class WarehouseAgent(BaseAgent):
 
     def _is_occupied(self, pos: Tuple[int, int]) -> bool:
         """Checks if a position is occupied by another agent."""
-        # Cheating: accessing env state directly for MVP
-        if hasattr(self.engine, "env") and hasattr(self.engine.env, "agents"):
-             for aid, state in self.engine.env.agents.items():
-                 if aid != self.agent_id and state["position"] == pos:
-                     return True
+        if hasattr(self.engine, "is_occupied"):
+            return self.engine.is_occupied(pos, exclude_agent=self.agent_id)
         return False
@@ -1,7 +1,8 @@
 import json
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..core.ontology import Agent, Asset, Goal, GovernanceStandard, FaultType
+from ..core.risk import RISK_EVENT
 
 class DossierGenerator:
     """
@@ -61,6 +62,25 @@ class DossierGenerator:
         }
         self.incidents.append(incident)
 
+    def load_from_justice_log(self, justice_log, start_time: Optional[float] = None,
+                              end_time: Optional[float] = None, agent_id: Optional[str] = None) -> int:
+        """
+        Processes the RISK_EVENT entries recorded in a JusticeLogger for this dossier's
+        agent (or agent_id) within [start_time, end_time). Returns the number processed.
+        """
+        entries = justice_log.query(start_time=start_time, end_time=end_time, event_type=RISK_EVENT,
+                                    agent_id=agent_id or self.agent.id)
+        for entry in entries:
+            event = dict(entry.data)
+            # Anchor the incident to the signed log entry it came from
+            event["evidence_anchors"] = list(event.get("evidence_anchors", [])) + [{
+                "signal_type": "JUSTICE_LOG_ENTRY",
+                "measured_value": entry.entry_id,
+                "unit": f"sig:{entry.signature[:16]}"
+            }]
+            self.process_technical_event(event)
+        return len(entries)
+
     def _estimate_liability(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """Maps technical 'impact' to estimated USD exposure."""
         impact_score = event.get("impact", 0.0)
@@ -1,4 +1,6 @@
 import asyncio
+import json
+import time
 import uuid
 import logging
 from typing import Dict, Any, List, Optional
@@ -7,6 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from agent_forge.core.engine import SimulationEngine
+from agent_forge.core.state_delta import DeltaConflator, apply_delta
+from agent_forge.server.frame_codec import encode_frame, UnsupportedFrame
 
 
 # Setup logging
@@ -31,66 +35,233 @@ class SimConfig(BaseModel):
     num_agents: int = Field(4, ge=1, le=1000, description="Number of agents (1-1000)")
     grid_size: int = Field(10, ge=4, le=1000, description="Grid size (4-1000)")
     vertical: str = Field("warehouse", pattern="^(warehouse|logistics)$")
+    lockstep: bool = Field(False, description="Batch all agents' actions into one env step per tick")
+    vectorized: bool = Field(False, description="Use the array-backed warehouse env for large fleets")
+    delta_updates: bool = Field(False, description="Stream compact per-tick deltas instead of full step updates")
+    broadcast_fps: float = Field(20.0, gt=0, le=120, description="Max delta frames per second per client")
+    isolated: bool = Field(False, description="Run the session in its own worker process")
 
 from agent_forge.core.runner import HeadlessRunner
+from agent_forge.core.process_runner import ProcessSessionRunner
+
+class _SharedFrame:
+    """A delta/keyframe encoded at most once per encoding, however many clients receive it."""
+    __slots__ = ("frame", "_text", "_binary")
+
+    def __init__(self, frame: Dict[str, Any]):
+        self.frame = frame
+        self._text: Optional[str] = None
+        self._binary: Any = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            # Compact separators: these frames are the bulk of the traffic
+            self._text = json.dumps(self.frame, separators=(",", ":"))
+        return self._text
+
+    @property
+    def binary(self) -> Optional[bytes]:
+        """Binary encoding, or None if the frame doesn't fit the binary layout."""
+        if self._binary is None:
+            try:
+                self._binary = encode_frame(self.frame)
+            except UnsupportedFrame as e:
+                logger.debug(f"Frame sent as JSON: {e}")
+                self._binary = False
+        return self._binary or None
+
+
+class _Client:
+    """Per-connection outbox: discrete messages and shared delta/keyframe frames, in order."""
+    __slots__ = ("queue", "task", "binary", "needs_keyframe")
+
+    def __init__(self, binary: bool = False):
+        self.queue = asyncio.Queue(maxsize=100) # Conflation buffer
+        self.task: Optional[asyncio.Task] = None
+        self.binary = binary
+        self.needs_keyframe = True # Late joiners start from a keyframe
+
 
 class ConnectionManager:
-    def __init__(self):
-        # ws -> (queue, task)
-        self.connections: Dict[WebSocket, Any] = {}
+    """
+    Fans engine updates out to websocket clients.
+
+    "delta" frames are conflated and published at most `frame_rate` times per
+    second. Each published frame is encoded once (JSON text, or the binary
+    layout for clients that connected with encoding=binary) and the same payload
+    goes to every client. A client whose outbox is full skips frames and gets a
+    "keyframe" with the full agent state once it has room again; new clients
+    start with one, and every client gets one every `keyframe_interval` seconds.
+    Other messages (full step updates, errors) are queued and sent as JSON.
+    """
+    ENCODINGS = ("json", "binary")
+
+    def __init__(self, frame_rate: float = 20.0, keyframe_interval: float = 5.0):
+        # ws -> _Client
+        self.connections: Dict[WebSocket, _Client] = {}
+        self.frame_rate = frame_rate
+        self.keyframe_interval = keyframe_interval
+        self._conflator = DeltaConflator()
+        self._frame_task: Optional[asyncio.Task] = None
+        self._next_keyframe = 0.0
+        # Full agent state folded from every delta, for keyframes
+        self._world: Dict[str, Dict[str, Any]] = {}
+        self._world_seq: Optional[int] = None
         
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, encoding: str = "json"):
+        if encoding not in self.ENCODINGS:
+            encoding = "json"
         await websocket.accept()
-        queue = asyncio.Queue(maxsize=100) # Conflation buffer
-
+        client = _Client(binary=encoding == "binary")
         
         # Start sender task
-        task = asyncio.create_task(self._sender_loop(websocket, queue))
-        self.connections[websocket] = (queue, task)
-        logger.info(f"Client connected. Active: {len(self.connections)}")
+        client.task = asyncio.create_task(self._sender_loop(websocket, client))
+        self.connections[websocket] = client
+        if self._frame_task is None or self._frame_task.done():
+            self._frame_task = asyncio.create_task(self._frame_loop())
+        logger.info(f"Client connected ({encoding}). Active: {len(self.connections)}")
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.connections:
-            queue, task = self.connections[websocket]
-            task.cancel()
+            client = self.connections[websocket]
+            client.task.cancel()
             del self.connections[websocket]
             logger.info(f"Client disconnected. Active: {len(self.connections)}")
 
+    def reset_state(self):
+        """Forgets the keyframe state (new simulation run)."""
+        self._world = {}
+        self._world_seq = None
+        self._conflator = DeltaConflator()
+        for client in self.connections.values():
+            client.needs_keyframe = True
+
     async def broadcast(self, message: Dict[str, Any]):
         """Non-blocking broadcast with conflation."""
-        for ws, (queue, task) in list(self.connections.items()):
+        if message.get("type") == "delta":
+            apply_delta(self._world, message)
+            self._world_seq = message.get("seq_id")
+            if self.connections:
+                self._conflator.add(message)
+            return
+
+        for ws, client in list(self.connections.items()):
             try:
                 # If full, we drop the NEWEST message (tail drop) 
                 # OR we could pop old and push new.
                 # For simplicity and speed: Try push. If full, SKIP.
                 # Ideally: Queue holds LATEST state. If full, dropping intermediate is fine.
-                queue.put_nowait(message)
+                client.queue.put_nowait(message)
             except asyncio.QueueFull:
                 # Queue is full, client is slow. Drop this frame.
                 # Optional: Log warning periodically?
                 pass
+
+    async def _frame_loop(self):
+        """Publishes one conflated frame per frame slot while anyone is connected."""
+        try:
+            while self.connections:
+                await asyncio.sleep(1.0 / self.frame_rate)
+                self.publish_frame()
+        except asyncio.CancelledError:
+            pass
+
+    def publish_frame(self):
+        """Hands the pending delta (or a keyframe) to every client's outbox."""
+        delta = self._conflator.take() if self._conflator.pending else None
+        now = time.monotonic()
+        keyframe_due = bool(self.keyframe_interval) and now >= self._next_keyframe
+        if keyframe_due:
+            self._next_keyframe = now + self.keyframe_interval
+
+        shared_delta = _SharedFrame(delta) if delta else None
+        shared_keyframe = None
+        for client in self.connections.values():
+            if self._world and (client.needs_keyframe or keyframe_due):
+                if shared_keyframe is None:
+                    shared_keyframe = _SharedFrame({
+                        "type": "keyframe",
+                        "seq_id": self._world_seq,
+                        "agents": self._world,
+                        "events": delta["events"] if delta else [],
+                        "timestamp": time.time()
+                    })
+                client.needs_keyframe = not self._offer(client, shared_keyframe)
+            elif shared_delta is not None and not self._offer(client, shared_delta):
+                # Lagging client: skip deltas, resync with a keyframe
+                client.needs_keyframe = True
+
+        if shared_keyframe is not None:
+            # The world map keeps mutating; queued keyframes must keep this tick's view
+            self._world = {agent_id: dict(fields) for agent_id, fields in self._world.items()}
+
+    @staticmethod
+    def _offer(client: _Client, frame: _SharedFrame) -> bool:
+        try:
+            client.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
                 
-    async def _sender_loop(self, ws: WebSocket, queue: asyncio.Queue):
+    async def _sender_loop(self, ws: WebSocket, client: _Client):
         try:
             while True:
-                msg = await queue.get()
-                await ws.send_json(msg)
-                queue.task_done()
+                msg = await client.queue.get()
+                if isinstance(msg, _SharedFrame):
+                    payload = msg.binary if client.binary else None
+                    if payload is not None:
+                        await ws.send_bytes(payload)
+                    else:
+                        await ws.send_text(msg.text)
+                else:
+                    await ws.send_json(msg)
+                client.queue.task_done()
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logger.warning(f"Sender loop error: {e}")
             self.disconnect(ws)
 
+class SessionNotFoundError(LookupError):
+    """Raised when controlling a session that was never created."""
+
+
 class SessionManager:
+    """
+    Owns the simulation sessions and their live feeds.
+
+    Each session has its own lock (controlling one session never waits on
+    another) and its own ConnectionManager behind /ws/state/{session_id}.
+    The legacy /ws/state stream carries the "default" session only.
+    Sessions started with isolated=True run in a worker process.
+    """
     def __init__(self):
-        # session_id -> HeadlessRunner
-        self.sessions: Dict[str, HeadlessRunner] = {}
+        # session_id -> HeadlessRunner, or ProcessSessionRunner for isolated sessions
+        self.sessions: Dict[str, Any] = {}
+        # Legacy /ws/state: the "default" session's updates
         self.connection_manager = ConnectionManager()
-        self._lock = asyncio.Lock()
-
-    async def create_session(self) -> str:
-        session_id = str(uuid.uuid4())
+        # session_id -> ConnectionManager for /ws/state/{session_id}
+        self.session_streams: Dict[str, ConnectionManager] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(session_id, asyncio.Lock())
+
+    def stream_for(self, session_id: str) -> ConnectionManager:
+        if session_id not in self.session_streams:
+            self.session_streams[session_id] = ConnectionManager()
+        return self.session_streams[session_id]
+
+    def _prune_stream(self, session_id: str):
+        # Clients may subscribe before a session starts; drop the feed once
+        # nobody listens to a session that doesn't exist
+        stream = self.session_streams.get(session_id)
+        if stream is not None and not stream.connections and session_id not in self.sessions:
+            del self.session_streams[session_id]
+
+    async def create_session(self, session_id: Optional[str] = None) -> str:
+        session_id = session_id or str(uuid.uuid4())
         runner = HeadlessRunner()
         self.sessions[session_id] = runner
         logger.info(f"Created session {session_id}")
@@ -99,81 +270,134 @@ class SessionManager:
     async def start_session(self, session_id: str, config: SimConfig):
         if session_id not in self.sessions:
             raise ValueError(f"Session {session_id} not found")
-        
-        runner = self.sessions[session_id]
-        if runner.is_running:
-            await runner.stop()
-        
-        conf_dict = config.dict()
-        await runner.setup(
-            num_agents=config.num_agents, 
-            grid_size=config.grid_size,
-            config=conf_dict
-        )
-        
-        # Hook runner engine callback
-        if runner.engine:
-            runner.engine.on_step_callback = self.on_engine_step
-            
-        try:
-            await runner.start()
-            logger.info(f"Started session {session_id}")
-        except Exception as e:
-            logger.error(f"Failed to start session {session_id}: {e}")
-            raise e
+        async with self._lock_for(session_id):
+            await self._start(session_id, config.dict())
 
     async def stop_session(self, session_id: str):
         if session_id in self.sessions:
-            await self.sessions[session_id].stop()
+            async with self._lock_for(session_id):
+                await self.sessions[session_id].stop()
             logger.info(f"Stopped session {session_id}")
 
-    async def connect_ws(self, websocket: WebSocket):
-        await self.connection_manager.connect(websocket)
+    async def close_session(self, session_id: str):
+        """Stops a session and forgets it (terminating its worker process if isolated)."""
+        async with self._lock_for(session_id):
+            runner = self.sessions.pop(session_id, None)
+            if runner is not None:
+                await runner.stop()
+                if isinstance(runner, ProcessSessionRunner):
+                    await runner.close()
+            stream = self.session_streams.pop(session_id, None)
+            if stream is not None:
+                for ws in list(stream.connections):
+                    stream.disconnect(ws)
+        # The lock stays: a caller already waiting on it must keep excluding new callers
+        logger.info(f"Closed session {session_id}")
+
+    async def connect_ws(self, websocket: WebSocket, encoding: str = "json", session_id: Optional[str] = None):
+        """Subscribes a client to one session's feed, or to the default session's legacy feed when session_id is None."""
+        manager = self.connection_manager if session_id is None else self.stream_for(session_id)
+        await manager.connect(websocket, encoding=encoding)
         # Send initial snapshot if session exists
-        if "default" in self.sessions:
-            runner = self.sessions["default"]
+        snapshot_id = session_id or "default"
+        if snapshot_id in self.sessions:
+            runner = self.sessions[snapshot_id]
             if runner.is_running:
                  snapshot = await runner.get_snapshot()
                  await websocket.send_json({
                      "type": "snapshot",
+                     "session_id": snapshot_id,
                      "data": snapshot,
-                     "timestamp": asyncio.get_event_loop().time()
+                     "timestamp": time.time()
                  })
 
-    def disconnect_ws(self, websocket: WebSocket):
-        self.connection_manager.disconnect(websocket)
+    def disconnect_ws(self, websocket: WebSocket, session_id: Optional[str] = None):
+        manager = self.connection_manager if session_id is None else self.session_streams.get(session_id)
+        if manager is not None:
+            manager.disconnect(websocket)
+        if session_id is not None:
+            self._prune_stream(session_id)
 
     async def _get_or_create_runner(self, session_id: str) -> HeadlessRunner:
         if session_id not in self.sessions:
             self.sessions[session_id] = HeadlessRunner()
         return self.sessions[session_id]
 
+    def _existing_runner(self, session_id: str):
+        # Only the legacy "default" session is created implicitly
+        if session_id == "default":
+            return self.sessions.setdefault(session_id, HeadlessRunner())
+        runner = self.sessions.get(session_id)
+        if runner is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+        return runner
+
+    async def _runner_for(self, session_id: str, conf: Dict[str, Any]):
+        """Returns the session's runner, swapping in-process <-> worker process if `isolated` changed."""
+        runner = self.sessions.get(session_id)
+        isolated = bool(conf.get("isolated", False))
+        if runner is None or isinstance(runner, ProcessSessionRunner) != isolated:
+            if runner is not None:
+                await runner.stop()
+                if isinstance(runner, ProcessSessionRunner):
+                    await runner.close()
+            runner = ProcessSessionRunner() if isolated else HeadlessRunner()
+            self.sessions[session_id] = runner
+        return runner
+
+    def _hook(self, session_id: str, runner: Any, conf: Dict[str, Any]):
+        stream = self.stream_for(session_id)
+
+        async def on_step(update: Dict[str, Any]):
+            await stream.broadcast(update)
+            if session_id == "default":
+                await self.on_engine_step(update)
+
+        if isinstance(runner, ProcessSessionRunner):
+            runner.on_step_callback = on_step
+        elif runner.engine:
+            runner.engine.on_step_callback = on_step
+
+        fps = conf.get("broadcast_fps", 20.0)
+        managers = [stream, self.connection_manager] if session_id == "default" else [stream]
+        for manager in managers:
+            manager.frame_rate = fps
+            manager.reset_state()
+
+    async def _start(self, session_id: str, conf: Dict[str, Any]):
+        runner = await self._runner_for(session_id, conf)
+        # If running, stop first (restart behavior)
+        if runner.is_running:
+            logger.info(f"Restarting session {session_id}...")
+            await runner.stop()
+
+        await runner.setup(
+            num_agents=conf.get("num_agents", 4),
+            grid_size=conf.get("grid_size", 10),
+            config=conf
+        )
+        self._hook(session_id, runner, conf)
+
+        try:
+            await runner.start()
+            logger.info(f"Started session {session_id}")
+        except Exception as e:
+            logger.error(f"Failed to start session {session_id}: {e}")
+            raise e
+
     async def control_session(self, session_id: str, action: str, config: Optional[Dict[str, Any]] = None):
-        async with self._lock:
-            runner = await self._get_or_create_runner(session_id)
-            
-            if action == "start":
-                # If running, stop first (restart behavior)
-                if runner.is_running:
-                    logger.info(f"Restarting session {session_id}...")
-                    await runner.stop()
-                
-                # Setup
-                conf_dict = config or {}
-                await runner.setup(
-                    num_agents=conf_dict.get("num_agents", 4),
-                    grid_size=conf_dict.get("grid_size", 10),
-                    config=conf_dict
-                )
-                
-                # Hook callback
-                if runner.engine:
-                    runner.engine.on_step_callback = self.on_engine_step
+        # Unknown ids fail before a lock is made for them
+        self._existing_runner(session_id)
+        async with self._lock_for(session_id):
+            # Re-check: the session may have been closed while we waited
+            runner = self._existing_runner(session_id)
 
-                await runner.start()
-                logger.info(f"Started session {session_id}")
+            if action == "start":
+                await self._start(session_id, config or {})
+                runner = self.sessions[session_id]
+                return {"status": runner.status, "is_running": runner.is_running}
 
-            elif action == "stop":
+            if action == "stop":
                 await runner.stop()
                 # Optional: Remove from sessions if we want fresh state next time
                 # del self.sessions[session_id] 
@@ -194,14 +418,15 @@ class SessionManager:
 
 
     async def on_engine_step(self, update: Dict[str, Any]):
-        """Broadcasts updates to all connected clients."""
+        """Broadcasts the default session's updates to all /ws/state clients."""
         await self.connection_manager.broadcast(update)
 
 session_manager = SessionManager()
 
 @app.websocket("/ws/state")
 async def websocket_endpoint(websocket: WebSocket):
-    await session_manager.connect_ws(websocket)
+    # ?encoding=binary opts into the binary delta/keyframe layout (see server/frame_codec.py)
+    await session_manager.connect_ws(websocket, encoding=websocket.query_params.get("encoding", "json"))
     try:
         while True:
             # Keep connection alive, listen for client cmds if any (ping/pong)
@@ -211,6 +436,20 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception:
         session_manager.disconnect_ws(websocket)
 
+@app.websocket("/ws/state/{session_id}")
+async def session_websocket_endpoint(websocket: WebSocket, session_id: str):
+    # Only this session's updates
+    await session_manager.connect_ws(
+        websocket, encoding=websocket.query_params.get("encoding", "json"), session_id=session_id
+    )
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        session_manager.disconnect_ws(websocket, session_id)
+    except Exception:
+        session_manager.disconnect_ws(websocket, session_id)
+
 @app.post("/api/sim/start")
 async def start_sim(config: SimConfig):
     # Legacy wrapper
@@ -237,6 +476,40 @@ async def control_sim(req: ControlRequest):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/v1/sessions")
+async def create_session():
+    return {"session_id": await session_manager.create_session()}
+
+@app.post("/api/v1/sessions/{session_id}/control")
+async def control_named_session(session_id: str, req: ControlRequest):
+    try:
+        conf_dict = req.config.model_dump() if req.config else {}
+        return await session_manager.control_session(session_id, req.action, conf_dict)
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/sessions/{session_id}/status")
+async def get_session_status(session_id: str):
+    runner = session_manager.sessions.get(session_id)
+    if runner is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return {
+        "status": runner.status,
+        "is_running": runner.is_running,
+        "error": runner.error_message,
+        "isolated": isinstance(runner, ProcessSessionRunner),
+        "clients": len(getattr(session_manager.session_streams.get(session_id), "connections", ()))
+    }
+
+@app.delete("/api/v1/sessions/{session_id}")
+async def delete_session(session_id: str):
+    if session_id not in session_manager.sessions:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    await session_manager.close_session(session_id)
+    return {"status": "closed", "session_id": session_id}
+
 @app.get("/api/v1/sim/state")
 async def get_full_state():
     runner = await session_manager._get_or_create_runner("default")
@@ -254,6 +527,20 @@ async def get_status():
         "error": runner.error_message
     }
 
+@app.get("/api/bus/metrics")
+async def get_bus_metrics():
+    runner = session_manager.sessions.get("default")
+    if runner is None:
+        return {"status": "NOT_CREATED"}
+    return await runner.get_bus_metrics()
+
+@app.get("/api/v1/sessions/{session_id}/bus/metrics")
+async def get_session_bus_metrics(session_id: str):
+    runner = session_manager.sessions.get(session_id)
+    if runner is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return await runner.get_bus_metrics()
+
 # Serve UI (Mount last to avoid shadowing API routes)
 from fastapi.staticfiles import StaticFiles
 import os
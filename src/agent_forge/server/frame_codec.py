@@ -0,0 +1,131 @@
+"""
+Binary encoding of live-feed frames ("delta" / "keyframe", see core/state_delta.py).
+
+Clients opt in with /ws/state?encoding=binary. Layout (little-endian):
+
+    header   <BBIIId   kind (1 = delta, 2 = keyframe), version, seq_id, from_seq,
+                       agent_count, timestamp
+    agent    <H id_len, id (utf-8), <B field mask, then the present fields in order:
+               0x01 position  <ii   x, y
+               0x02 battery   <f    float32
+               0x04 carrying  <H len + utf-8 (len 0xFFFF = None)
+    events   <I len + compact JSON (len 0 = no events)
+
+seq_id/from_seq of None are sent as 0. Frames with anything the layout can't
+carry (non-grid positions, extra fields) raise UnsupportedFrame; the server then
+sends that frame as JSON text instead.
+"""
+import json
+import struct
+from typing import Any, Dict
+
+VERSION = 1
+KINDS = {"delta": 1, "keyframe": 2}
+_KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+_HEADER = struct.Struct("<BBIIId")
+_ID_LEN = struct.Struct("<H")
+_MASK = struct.Struct("<B")
+_POSITION = struct.Struct("<ii")
+_BATTERY = struct.Struct("<f")
+_EVENTS_LEN = struct.Struct("<I")
+
+POSITION, BATTERY, CARRYING = 0x01, 0x02, 0x04
+_NONE_LEN = 0xFFFF
+
+
+class UnsupportedFrame(ValueError):
+    """The frame has content the binary layout can't represent."""
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    if len(raw) >= _NONE_LEN:
+        raise UnsupportedFrame("string too long for binary frame")
+    return _ID_LEN.pack(len(raw)) + raw
+
+
+def encode_frame(frame: Dict[str, Any]) -> bytes:
+    kind = KINDS.get(frame.get("type"))
+    if kind is None:
+        raise UnsupportedFrame(f"frame type {frame.get('type')!r} has no binary layout")
+
+    agents = frame.get("agents", {})
+    parts = [_HEADER.pack(kind, VERSION, frame.get("seq_id") or 0, frame.get("from_seq") or 0,
+                          len(agents), frame.get("timestamp") or 0.0)]
+    for agent_id, fields in agents.items():
+        mask = 0
+        body = []
+        for name in fields:
+            if name not in ("position", "battery", "carrying"):
+                raise UnsupportedFrame(f"field {name!r} has no binary layout")
+        try:
+            if "position" in fields:
+                x, y = fields["position"]
+                mask |= POSITION
+                body.append(_POSITION.pack(x, y))
+            if "battery" in fields:
+                mask |= BATTERY
+                body.append(_BATTERY.pack(fields["battery"]))
+            if "carrying" in fields:
+                mask |= CARRYING
+                carrying = fields["carrying"]
+                body.append(_ID_LEN.pack(_NONE_LEN) if carrying is None else _pack_str(carrying))
+        except (TypeError, ValueError, struct.error) as e:
+            raise UnsupportedFrame(f"agent {agent_id}: {e}")
+        parts.append(_pack_str(str(agent_id)))
+        parts.append(_MASK.pack(mask))
+        parts.extend(body)
+
+    events = frame.get("events")
+    raw_events = json.dumps(events, separators=(",", ":")).encode("utf-8") if events else b""
+    parts.append(_EVENTS_LEN.pack(len(raw_events)))
+    parts.append(raw_events)
+    return b"".join(parts)
+
+
+def decode_frame(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_frame (for Python clients and tests). Batteries come back at float32 precision."""
+    kind, version, seq_id, from_seq, count, timestamp = _HEADER.unpack_from(data, 0)
+    if version != VERSION:
+        raise ValueError(f"Unsupported frame version {version}")
+    offset = _HEADER.size
+
+    def read_str():
+        nonlocal offset
+        (length,) = _ID_LEN.unpack_from(data, offset)
+        offset += _ID_LEN.size
+        if length == _NONE_LEN:
+            return None
+        value = data[offset:offset + length].decode("utf-8")
+        offset += length
+        return value
+
+    agents = {}
+    for _ in range(count):
+        agent_id = read_str()
+        (mask,) = _MASK.unpack_from(data, offset)
+        offset += _MASK.size
+        fields = {}
+        if mask & POSITION:
+            fields["position"] = list(_POSITION.unpack_from(data, offset))
+            offset += _POSITION.size
+        if mask & BATTERY:
+            fields["battery"] = round(_BATTERY.unpack_from(data, offset)[0], 3)
+            offset += _BATTERY.size
+        if mask & CARRYING:
+            fields["carrying"] = read_str()
+        agents[agent_id] = fields
+
+    (length,) = _EVENTS_LEN.unpack_from(data, offset)
+    offset += _EVENTS_LEN.size
+    events = json.loads(data[offset:offset + length]) if length else []
+
+    return {
+        "type": _KIND_NAMES[kind],
+        "seq_id": seq_id,
+        "from_seq": from_seq,
+        "agents": agents,
+        "events": events,
+        "timestamp": timestamp
+    }
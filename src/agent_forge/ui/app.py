@@ -68,10 +68,22 @@ class EngramTUI(App):
         Binding("f3", "show_agents", "Agents", show=True),
         Binding("f4", "show_lineage", "Lineage", show=True),
         Binding("f5", "show_export", "Export", show=True),
+        Binding("f6", "show_bus", "Bus", show=True),
         Binding("q", "quit_app", "Quit", show=True),
         Binding("?", "show_help", "Help", show=False),
     ]
     
+    def __init__(self, runner=None, num_agents: int = 0, config=None, justice_log=None):
+        """
+        runner: a HeadlessRunner to observe; with num_agents it is set up (with config)
+        and run on the TUI's loop. justice_log: a JusticeLogger incidents are read from.
+        """
+        super().__init__()
+        self.runner = runner
+        self.num_agents = num_agents
+        self.config = config
+        self.justice_log = justice_log
+    
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
@@ -80,10 +92,23 @@ class EngramTUI(App):
         )
         yield Footer()
     
-    def on_mount(self) -> None:
+    async def on_mount(self) -> None:
         """Called when app is mounted."""
+        from .data_bridge import data_bridge
+        if self.justice_log is not None:
+            data_bridge.set_justice_log(self.justice_log)
+        if self.runner is not None:
+            if self.num_agents:
+                await self.runner.setup(num_agents=self.num_agents, config=self.config)
+                await self.runner.start()
+            data_bridge.attach_runner(self.runner)
         self.action_show_dashboard()
     
+    async def on_unmount(self) -> None:
+        """Stop a simulation the TUI started."""
+        if self.runner is not None and self.num_agents and self.runner.is_running:
+            await self.runner.stop()
+    
     def action_show_dashboard(self) -> None:
         """Show the dashboard screen."""
         from .screens.dashboard import DashboardScreen
@@ -107,18 +132,23 @@ class EngramTUI(App):
         from .screens.export import ExportScreen
         self.push_screen(ExportScreen())
     
+    def action_show_bus(self) -> None:
+        """Show the message bus metrics screen."""
+        from .screens.bus import BusScreen
+        self.push_screen(BusScreen())
+    
     def action_show_help(self) -> None:
         """Show help screen."""
-        self.notify("Help: F1=Dashboard F2=Incidents F3=Agents F4=Lineage F5=Export Q=Quit")
+        self.notify("Help: F1=Dashboard F2=Incidents F3=Agents F4=Lineage F5=Export F6=Bus Q=Quit")
     
     def action_quit_app(self) -> None:
         """Quit the application."""
         self.exit()
 
 
-def run_tui():
+def run_tui(runner=None, num_agents: int = 0, config=None, justice_log=None):
     """Entry point for the TUI."""
-    app = EngramTUI()
+    app = EngramTUI(runner=runner, num_agents=num_agents, config=config, justice_log=justice_log)
     app.run()
 
 
@@ -5,9 +5,11 @@ Provides a singleton interface for TUI to access live simulation data
 
 from typing import Dict, List, Any, Optional
 from agent_forge.core.engine import SimulationEngine
-from agent_forge.core.risk import RiskMonitor
+from agent_forge.core.risk import RiskMonitor, RISK_EVENT
+from agent_forge.core.justice_log import JusticeLogger
 from agent_forge.forensics.dossier import DossierGenerator
 from agent_forge.core.ontology import Agent, Asset, Goal, GovernanceStandard
+from agent_forge.utils.message_bus import MessageBus
 import time
 
 
@@ -17,6 +19,8 @@ class SimulationDataBridge:
     _instance = None
     _engine: Optional[SimulationEngine] = None
     _dossier: Optional[DossierGenerator] = None
+    _bus: Optional[MessageBus] = None
+    _justice_log: Optional[JusticeLogger] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -33,6 +37,31 @@ class SimulationDataBridge:
         """Set the dossier generator instance"""
         cls._dossier = dossier
     
+    @classmethod
+    def set_justice_log(cls, justice_log: JusticeLogger):
+        """Read incidents from a Justice Log (RISK_EVENT entries) instead of the live monitor"""
+        cls._justice_log = justice_log
+    
+    @classmethod
+    def set_bus(cls, bus: MessageBus):
+        """Set the message bus instance"""
+        cls._bus = bus
+    
+    @classmethod
+    def attach_runner(cls, runner):
+        """Point the bridge at a HeadlessRunner's engine, message bus and Justice Log (if it records one)"""
+        cls.set_engine(runner.engine)
+        cls.set_bus(runner.bus)
+        if runner.justice_log is not None:
+            cls.set_justice_log(runner.justice_log)
+    
+    @classmethod
+    def get_bus_metrics(cls) -> Dict[str, Any]:
+        """Get message bus counters, latency percentiles and queue depths"""
+        if not cls._bus:
+            return {"running": False, "totals": {}, "topics": {}, "handlers": {}, "subscribers": []}
+        return cls._bus.metrics_snapshot()
+    
     @classmethod
     def get_simulation_status(cls) -> Dict[str, Any]:
         """Get current simulation status"""
@@ -171,8 +200,13 @@ class SimulationDataBridge:
         }
     
     @classmethod
-    def get_incidents(cls) -> List[Dict[str, Any]]:
-        """Get all incidents from risk monitor"""
+    def get_incidents(cls, agent_id: Optional[str] = None, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get incidents, optionally for one agent and/or since a timestamp"""
+        if cls._justice_log is not None:
+            # Filtered by the log's indexes; only matching entries are read
+            entries = cls._justice_log.query(start_time=since, event_type=RISK_EVENT, agent_id=agent_id)
+            return [cls._to_incident(entry.entry_id, entry.data) for entry in entries]
+        
         if not cls._engine or not cls._engine.risk_monitor:
             # Return sample data
             return [
@@ -188,42 +222,57 @@ class SimulationDataBridge:
         
         incidents = []
         for idx, event in enumerate(cls._engine.risk_monitor.history):
-            # Determine fault type
-            is_latency = event.get('is_latency_correlated', False)
-            violation = event.get('violation', {})
-            rule = violation.get('rule', 'UNKNOWN')
-            
-            if is_latency:
-                fault_type = "ENV_STRESS"
-                preventability = 95
-            elif "NEGATIVE" in rule or "CRITICAL" in rule:
-                fault_type = "LOGIC_DEFECT"
-                preventability = 40
-            else:
-                fault_type = "UNDETERMINED"
-                preventability = 50
-            
-            # Calculate liability (simple heuristic)
-            impact = event.get('impact', 0)
-            liability = int((impact / 100.0) * 10000)  # Scale to dollars
-            
-            timestamp = time.strftime('%H:%M:%S', time.localtime(event.get('timestamp', time.time())))
-            
-            incidents.append({
-                "incident_id": f"INC-{idx+1:03d}",
-                "timestamp": timestamp,
-                "agent_id": event.get('agent_id', 'Unknown'),
-                "fault_type": fault_type,
-                "preventability": preventability,
-                "liability": liability,
-                "raw_event": event  # Keep for detail view
-            })
+            if agent_id is not None and event.get('agent_id') != agent_id:
+                continue
+            if since is not None and event.get('timestamp', 0) < since:
+                continue
+            incidents.append(cls._to_incident(f"INC-{idx+1:03d}", event))
         
-        return incidents if incidents else []
+        return incidents
+    
+    @classmethod
+    def _to_incident(cls, incident_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize a risk event as an incident table row"""
+        # Determine fault type
+        is_latency = event.get('is_latency_correlated', False)
+        violation = event.get('violation', {})
+        rule = violation.get('rule', 'UNKNOWN')
+        
+        if is_latency:
+            fault_type = "ENV_STRESS"
+            preventability = 95
+        elif "NEGATIVE" in rule or "CRITICAL" in rule:
+            fault_type = "LOGIC_DEFECT"
+            preventability = 40
+        else:
+            fault_type = "UNDETERMINED"
+            preventability = 50
+        
+        # Calculate liability (simple heuristic)
+        impact = event.get('impact', 0)
+        liability = int((impact / 100.0) * 10000)  # Scale to dollars
+        
+        timestamp = time.strftime('%H:%M:%S', time.localtime(event.get('timestamp', time.time())))
+        
+        return {
+            "incident_id": incident_id,
+            "timestamp": timestamp,
+            "agent_id": event.get('agent_id', 'Unknown'),
+            "fault_type": fault_type,
+            "preventability": preventability,
+            "liability": liability,
+            "raw_event": event  # Keep for detail view
+        }
     
     @classmethod
     def get_incident_details(cls, incident_id: str) -> str:
         """Get detailed forensic narrative for an incident"""
+        if cls._justice_log is not None:
+            # Justice Log incidents are keyed by entry ID (indexed lookup)
+            entry = cls._justice_log.get_entry_by_id(incident_id)
+            if entry is not None:
+                return cls._format_incident_details(incident_id, entry.data)
+        
         # Extract incident index from ID
         try:
             idx = int(incident_id.split('-')[1]) - 1
@@ -0,0 +1,139 @@
+"""Bus Screen - Message bus throughput, latency and queue depth"""
+
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.containers import Container, Horizontal, Vertical
+from textual.widgets import Static, DataTable
+from agent_forge.ui.data_bridge import data_bridge
+
+
+def _ms(seconds) -> str:
+    return f"{seconds * 1000:.2f}" if seconds is not None else "-"
+
+
+class BusScreen(Screen):
+    """Live message bus metrics"""
+
+    BINDINGS = [
+        ("escape", "app.pop_screen", "Back"),
+        ("r", "refresh_data", "Refresh"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        """Create bus metrics layout"""
+        yield Container(
+            Vertical(
+                Static("📡 MESSAGE BUS - THROUGHPUT & LATENCY", id="bus-title"),
+                Horizontal(
+                    Vertical(
+                        Static("QUEUE", classes="panel-title"),
+                        Static(id="bus-summary"),
+                        classes="panel"
+                    ),
+                    Vertical(
+                        Static("PUBLISH → DELIVER (ms)", classes="panel-title"),
+                        Static(id="bus-latency"),
+                        classes="panel"
+                    ),
+                    classes="top-panels"
+                ),
+                Vertical(
+                    Static("TOPICS", classes="panel-title"),
+                    DataTable(id="topics-table"),
+                    classes="panel topics-panel"
+                ),
+                id="bus-container"
+            )
+        )
+
+    def on_mount(self) -> None:
+        """Initialize bus screen"""
+        table = self.query_one("#topics-table", DataTable)
+        table.add_columns("Topic", "Published", "Delivered", "Dropped", "DLQ")
+
+        self.refresh_data()
+        self.set_interval(1.0, self.refresh_data)
+
+    def action_refresh_data(self) -> None:
+        """Refresh bus metrics"""
+        self.refresh_data()
+
+    def refresh_data(self) -> None:
+        """Update screen with the latest bus snapshot"""
+        metrics = data_bridge.get_bus_metrics()
+
+        summary = self.query_one("#bus-summary", Static)
+        if not metrics.get("running"):
+            summary.update("\nBus: NOT RUNNING\n")
+        else:
+            totals = metrics["totals"]
+            summary.update(f"""
+Dispatch: {metrics['dispatch']}
+Queue Depth: {metrics['queue_depth']}/{metrics['queue_capacity']}
+Dead Letters: {metrics['dlq_size']}
+Published: {totals['published']:,}  Delivered: {totals['delivered']:,}  Dropped: {totals['dropped']:,}
+""")
+
+        latency = self.query_one("#bus-latency", Static)
+        hist = metrics.get("publish_to_deliver") or {"count": 0}
+        if not hist["count"]:
+            latency.update("\nNo deliveries yet\n")
+        else:
+            latency.update(f"""
+Samples: {hist['count']:,}
+p50: {_ms(hist['p50'])}  p90: {_ms(hist['p90'])}
+p99: {_ms(hist['p99'])}  max: {_ms(hist['max'])}
+""")
+
+        table = self.query_one("#topics-table", DataTable)
+        table.clear()
+        for topic, counters in sorted(metrics.get("topics", {}).items()):
+            table.add_row(
+                topic,
+                f"{counters['published']:,}",
+                f"{counters['delivered']:,}",
+                f"{counters['dropped']:,}",
+                f"{counters['dlq']:,}"
+            )
+
+
+# CSS for bus screen
+BusScreen.DEFAULT_CSS = """
+BusScreen {
+    background: black;
+    color: white;
+}
+
+#bus-title {
+    background: darkblue;
+    color: white;
+    text-style: bold;
+    padding: 1;
+    text-align: center;
+}
+
+.panel-title {
+    background: darkblue;
+    color: white;
+    text-style: bold;
+    padding: 1;
+}
+
+.panel {
+    border: solid white;
+    margin: 1;
+    padding: 1;
+}
+
+.top-panels {
+    height: auto;
+}
+
+.topics-panel {
+    height: 1fr;
+}
+
+#topics-table {
+    height: 100%;
+}
+"""
@@ -137,7 +137,7 @@ Events Logged: 1,247
         return """
 [E] Export PIRD          [I] View Incidents       [P] Pause/Resume
 [F2] Incident Log        [F3] Agent Details       [F5] Export Screen
-[Q] Quit                 [?] Help
+[F6] Message Bus         [Q] Quit                 [?] Help
 """
     
     def action_refresh_data(self) -> None:
@@ -1,5 +1,6 @@
 """Incidents Screen - Detailed list of all detected incidents"""
 
+import time
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.containers import Container, Horizontal, Vertical
@@ -20,7 +21,12 @@ class IncidentsScreen(Screen):
         ("r", "refresh_data", "Refresh"),
     ]
     
+    # Time windows cycled by [F]: (label, seconds back or None for all)
+    TIME_FILTERS = [("ALL", None), ("LAST 5 MIN", 300), ("LAST 1 HOUR", 3600)]
+    
     selected_incident = reactive(None)
+    agent_filter = reactive(None)
+    time_filter_index = reactive(0)
     
     def compose(self) -> ComposeResult:
         """Create incidents screen layout"""
@@ -75,8 +81,10 @@ class IncidentsScreen(Screen):
         table = self.query_one("#incidents-table", DataTable)
         table.clear()
         
-        # Get live incidents from data bridge
-        incidents = data_bridge.get_incidents()
+        # Get live incidents from data bridge, filtered at the source
+        window = self.TIME_FILTERS[self.time_filter_index][1]
+        since = time.time() - window if window else None
+        incidents = data_bridge.get_incidents(agent_id=self.agent_filter, since=since)
         
         for incident in incidents:
             table.add_row(
@@ -110,9 +118,24 @@ class IncidentsScreen(Screen):
         search = self.query_one("#search-input", Input)
         search.focus()
     
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Search filters incidents by agent ID (empty clears the filter)"""
+        if event.input.id == "search-input":
+            self.agent_filter = event.value.strip() or None
+            self._update_filter_status()
+            self.refresh_data()
+    
     def action_toggle_filters(self) -> None:
-        """Toggle filter options"""
-        self.notify("Filter options - Coming soon")
+        """Cycle the time window filter"""
+        self.time_filter_index = (self.time_filter_index + 1) % len(self.TIME_FILTERS)
+        self._update_filter_status()
+        self.refresh_data()
+    
+    def _update_filter_status(self) -> None:
+        label = self.TIME_FILTERS[self.time_filter_index][0]
+        if self.agent_filter:
+            label += f" | AGENT {self.agent_filter}"
+        self.query_one("#filter-status", Static).update(f"[F] Filters: {label}")
     
     def action_export_selected(self) -> None:
         """Export selected incident to PIRD"""
@@ -0,0 +1,228 @@
+import asyncio
+import atexit
+import glob
+import gzip
+import json
+import os
+import shutil
+import time
+import weakref
+from typing import Any, Dict, Iterator, List, Optional
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("AuditLog")
+
+
+def _segment_paths(path: str) -> List[str]:
+    """Rotated segments of `path` (path.000001[.gz], ...) in rotation order."""
+    segments = []
+    for candidate in glob.glob(glob.escape(path) + ".*"):
+        suffix = candidate[len(path) + 1:]
+        number = suffix[:-3] if suffix.endswith(".gz") else suffix
+        if number.isdigit():
+            segments.append((int(number), candidate))
+    return [p for _, p in sorted(segments)]
+
+
+def iter_audit_lines(path: str) -> Iterator[str]:
+    """Yields every line of an audit log, oldest first: rotated segments (gzip or plain), then the live file."""
+    for segment in _segment_paths(path):
+        opener = gzip.open if segment.endswith(".gz") else open
+        try:
+            with opener(segment, "rt") as f:
+                yield from f
+        except (OSError, EOFError) as e:
+            # A segment can be mid-compression or truncated by a crash
+            logger.warning(f"Skipping unreadable audit segment {segment}: {e}")
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            yield from f
+
+
+# Writers with possibly unflushed lines, flushed once at interpreter exit (weakly held)
+_live_writers: "weakref.WeakSet[AuditLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_writers():
+    for writer in list(_live_writers):
+        try:
+            writer.flush_sync()
+        except Exception as e:
+            logger.error(f"Audit log flush at exit failed: {e}")
+
+
+class AuditLogWriter:
+    """
+    Append-only JSONL audit log written in batches from a background task.
+
+    write() only serializes the record and queues the line; a background task
+    writes queued lines through one persistent file handle every
+    `flush_interval` seconds, or as soon as `batch_size` lines are pending.
+    The file I/O itself runs in a worker thread, off the event loop.
+
+    Rotation (optional): the live file is renamed to path.NNNNNN once it would
+    exceed `max_bytes` or is older than `rotate_interval` seconds; with
+    `compress` the rotated segment is gzipped. Use iter_audit_lines() to read
+    all segments back in order.
+    """
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.5,
+                 max_bytes: Optional[int] = None, rotate_interval: Optional[float] = None,
+                 compress: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._pending: List[str] = []
+        self._handle = None
+        self._size = 0
+        self._opened_at = time.time()
+        # Background task and its primitives belong to one event loop; rebound on a new loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+        # Counters
+        self.records_written = 0
+        self.batches_written = 0
+        self.rotations = 0
+
+        # Don't lose the last flush window when the process exits without close()
+        _live_writers.add(self)
+
+    # --- Producer side (event loop) ---
+
+    def write(self, record: Dict[str, Any]):
+        """Queues one record. Never touches the disk on the caller's path."""
+        self._pending.append(json.dumps(record) + "\n")
+        if self._closed:
+            return
+        self._ensure_task()
+        if len(self._pending) >= self.batch_size and self._wake:
+            self._wake.set()
+
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        """Makes the wake event and write lock belong to `loop`."""
+        if self._loop is loop:
+            return
+        # A task left on a previous loop can never run again; forget it
+        self._loop = loop
+        self._task = None
+        self._wake = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+
+    def _ensure_task(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return # No loop: lines stay queued until flush_sync()/close()
+        self._bind(loop)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit log flush failed: {e}")
+
+    async def flush(self):
+        """Writes every queued line (in a worker thread)."""
+        self._bind(asyncio.get_running_loop())
+        async with self._write_lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await asyncio.to_thread(self._write_lines, lines)
+
+    async def stop(self):
+        """Flushes and cancels the background task. A later write() starts a new one, on whatever loop is running."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            if task.get_loop() is asyncio.get_running_loop():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            else:
+                try:
+                    task.cancel()
+                except RuntimeError:
+                    pass # Its loop is already closed
+        await self.flush()
+
+    async def close(self):
+        """Flushes, stops the background task and closes the handle."""
+        self._closed = True
+        await self.stop()
+        self._close_handle()
+        _live_writers.discard(self)
+
+    # --- Writer side (worker thread) ---
+
+    def flush_sync(self):
+        """Blocking flush for callers without an event loop (atexit, scripts)."""
+        lines, self._pending = self._pending, []
+        if lines:
+            self._write_lines(lines)
+
+    def _open(self):
+        self._handle = open(self.path, "a")
+        self._size = self._handle.tell()
+        # Age-based rotation counts from when this writer opened the segment
+        self._opened_at = time.time()
+
+    def _close_handle(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes is not None and self._size + incoming > self.max_bytes:
+            return True
+        if self.rotate_interval is not None and time.time() - self._opened_at >= self.rotate_interval:
+            return True
+        return False
+
+    def _rotate(self):
+        self._close_handle()
+        segments = _segment_paths(self.path)
+        last = segments[-1][len(self.path) + 1:].replace(".gz", "") if segments else "0"
+        target = f"{self.path}.{int(last) + 1:06d}"
+        os.replace(self.path, target)
+        if self.compress:
+            with open(target, "rb") as src, gzip.open(target + ".gz.tmp", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(target + ".gz.tmp", target + ".gz")
+            os.remove(target)
+        self.rotations += 1
+        self._open()
+
+    def _write_lines(self, lines: List[str]):
+        if self._handle is None:
+            self._open()
+        data = "".join(lines)
+        incoming = len(data.encode("utf-8"))
+        if self._should_rotate(incoming):
+            self._rotate()
+        self._handle.write(data)
+        self._handle.flush()
+        self._size += incoming
+        self.records_written += len(lines)
+        self.batches_written += 1
@@ -0,0 +1,116 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations (seconds in, microsecond buckets).
+
+    Each power-of-two range is split into `sub_buckets` linear buckets, so the
+    relative error of any percentile stays below 1/sub_buckets regardless of
+    magnitude, while recording is O(1) and memory is bounded by the value range.
+    """
+    __slots__ = ("sub_buckets", "counts", "count", "total", "min", "max")
+
+    def __init__(self, sub_buckets: int = 16):
+        self.sub_buckets = sub_buckets
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, micros: int) -> int:
+        if micros < self.sub_buckets:
+            return micros
+        exponent = micros.bit_length() - 1
+        shift = exponent - int(math.log2(self.sub_buckets))
+        return (shift + 1) * self.sub_buckets + ((micros >> shift) - self.sub_buckets)
+
+    def _upper_bound(self, index: int) -> int:
+        """Largest microsecond value that maps to bucket `index`."""
+        if index < self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        base = (index % self.sub_buckets + self.sub_buckets) << shift
+        return base + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        if seconds < 0:
+            seconds = 0.0
+        self.counts[self._index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Value (seconds) at or below which `p` percent of samples fall."""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max
+        }
+
+
+class BusMetrics:
+    """Counters and latency histograms for one MessageBus."""
+    COUNTERS = ("published", "delivered", "dropped", "dlq")
+
+    def __init__(self):
+        self.topics: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+        self.publish_to_deliver = LatencyHistogram()
+        self.handlers: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.handler_errors: Dict[str, int] = defaultdict(int)
+
+    def count(self, topic: str, counter: str, n: int = 1):
+        self.topics[topic][counter] += n
+
+    def delivered(self, topic: str, handler_name: str, queued: float, handled: float, ok: bool):
+        """queued: publish -> handler start, handled: handler execution time (seconds)."""
+        self.publish_to_deliver.record(queued)
+        self.handlers[handler_name].record(handled)
+        if ok:
+            self.topics[topic]["delivered"] += 1
+        else:
+            self.handler_errors[handler_name] += 1
+            self.topics[topic]["dlq"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        totals = dict.fromkeys(self.COUNTERS, 0)
+        for counters in self.topics.values():
+            for name, value in counters.items():
+                totals[name] += value
+        return {
+            "totals": totals,
+            "topics": {topic: dict(counters) for topic, counters in self.topics.items()},
+            "publish_to_deliver": self.publish_to_deliver.snapshot(),
+            "handlers": {
+                name: dict(hist.snapshot(), errors=self.handler_errors.get(name, 0))
+                for name, hist in self.handlers.items()
+            }
+        }
+
+    def reset(self):
+        self.__init__()
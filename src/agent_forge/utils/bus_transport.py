@@ -0,0 +1,275 @@
+"""
+Multi-process transport for MessageBus over a Unix domain socket.
+
+The process that owns the MessageBus runs a BusHub; agents in worker processes
+talk to it through a RemoteMessageBus, which has the same register / subscribe /
+unsubscribe / publish API. Routing, auth-token checks, chaos and auditing all
+stay in the hub's MessageBus, so remote agents behave exactly like local ones.
+
+Wire format: 4-byte big-endian length + pickled tuple. The socket is created
+with mode 0600, so only the owning user can connect; pickle is acceptable
+inside that boundary (the same one multiprocessing itself relies on).
+
+Auth: the hub's MessageBus mints every agent's token and an agent id can be
+registered only once. A worker only holds a connection-local token, which the
+hub swaps for the real one on publishes from that same connection.
+"""
+import asyncio
+import inspect
+import itertools
+import os
+import pickle
+import socket
+import struct
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from agent_forge.utils.message_bus import MessageBus, Message
+from agent_forge.utils.logger import get_logger
+logger = get_logger("BusTransport")
+
+_HEADER = struct.Struct("!I")
+
+
+def _encode(frame: tuple) -> bytes:
+    body = pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(body)) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Optional[tuple]:
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        body = await reader.readexactly(_HEADER.unpack(header)[0])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return pickle.loads(body)
+
+
+def _encode_reply(req_id: int, error: Optional[Exception]) -> bytes:
+    try:
+        return _encode(("reply", req_id, error))
+    except Exception:
+        # Exceptions carrying unpicklable state still reach the caller, as text
+        return _encode(("reply", req_id, RuntimeError(f"{type(error).__name__}: {error}")))
+
+
+class _RemoteSubscription:
+    """Hub-side handler that forwards deliveries to the worker process owning the subscription."""
+    def __init__(self, writer: asyncio.StreamWriter, sub_id: int):
+        self.writer = writer
+        self.sub_id = sub_id
+
+    async def deliver(self, message: Message):
+        if not self.writer.is_closing():
+            self.writer.write(_encode(("deliver", self.sub_id, message)))
+            # Backpressure: a worker that stops reading slows its own deliveries down
+            await self.writer.drain()
+
+
+class BusHub:
+    """Serves a MessageBus to worker processes on a Unix domain socket."""
+    def __init__(self, bus: MessageBus, path: str):
+        self.bus = bus
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.connections = 0
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        # Bind with mode 0600 from the start: frames are unpickled, so only the owner may connect
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.path, 0o600)
+        self._server = await asyncio.start_unix_server(self._serve, sock=sock)
+        logger.info(f"BusHub listening on {self.path}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _publish_kwargs(self, kwargs: Dict[str, Any], agents: Dict[str, tuple],
+                        refused: Dict[str, PermissionError]) -> Dict[str, Any]:
+        """Swaps a connection-local token for the hub-minted one of an agent this connection owns."""
+        sender = kwargs.get("sender")
+        if sender in refused:
+            raise refused[sender]
+        local_token = kwargs.pop("auth_token", None)
+        owned = agents.get(sender)
+        kwargs["auth_token"] = owned[1] if owned and local_token == owned[0] else None
+        return kwargs
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        subscriptions: Dict[int, tuple] = {} # sub_id -> (topic, handler)
+        agents: Dict[str, tuple] = {} # agent_id -> (connection-local token, hub token)
+        refused: Dict[str, PermissionError] = {} # agent_id -> why its registration was refused
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                if frame is None:
+                    break
+                kind = frame[0]
+                if kind == "register":
+                    _, agent_id, local_token = frame
+                    try:
+                        agents[agent_id] = (local_token, self.bus.register(agent_id, exclusive=True))
+                    except PermissionError as e:
+                        logger.warning(f"Refused worker registration: {e}")
+                        refused[agent_id] = e
+                elif kind == "subscribe":
+                    _, sub_id, topic, owner = frame
+                    handler = _RemoteSubscription(writer, sub_id).deliver
+                    subscriptions[sub_id] = (topic, handler)
+                    self.bus.subscribe(topic, handler, owner=owner)
+                elif kind == "unsubscribe":
+                    entry = subscriptions.pop(frame[1], None)
+                    if entry:
+                        self.bus.unsubscribe(*entry)
+                elif kind == "publish":
+                    _, req_id, kwargs = frame
+                    try:
+                        await self.bus.publish(**self._publish_kwargs(kwargs, agents, refused))
+                        writer.write(_encode_reply(req_id, None))
+                    except Exception as e:
+                        writer.write(_encode_reply(req_id, e))
+                    await writer.drain()
+                else:
+                    logger.warning(f"Unknown frame '{kind}' from worker")
+        except ConnectionError:
+            pass
+        finally:
+            # Worker gone: drop its subscriptions and registrations so the hub stops forwarding
+            # and the ids can register again
+            for topic, handler in subscriptions.values():
+                self.bus.unsubscribe(topic, handler)
+            for agent_id, (_, token) in agents.items():
+                self.bus.unregister(agent_id, token)
+            self.connections -= 1
+            writer.close()
+
+
+class RemoteMessageBus:
+    """
+    MessageBus stand-in for worker processes, connected to a BusHub.
+
+    register() and subscribe() are synchronous like MessageBus's: their frames
+    are written immediately and the hub applies them in order, before any later
+    publish on the same connection. publish() waits for the hub's verdict, so
+    auth failures still raise PermissionError in the caller.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        # Deliveries run on their own task so a handler that publishes (and awaits
+        # the hub's reply) can't block the reader that resolves that reply
+        self._deliveries: asyncio.Queue = asyncio.Queue()
+        self._handlers: Dict[int, tuple] = {} # sub_id -> (topic, handler)
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        """Connects to the hub (MessageBus-compatible name)."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            self._reader_task = asyncio.create_task(self._read_loop())
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+        for task in (self._reader_task, self._dispatch_task):
+            if task:
+                task.cancel()
+        self._reader_task = self._dispatch_task = None
+
+    def _send(self, frame: tuple):
+        if self._writer is None:
+            raise RuntimeError("RemoteMessageBus is not connected. Call start() first.")
+        self._writer.write(_encode(frame))
+
+    def register(self, agent_id: str) -> str:
+        """
+        Returns a token that is only valid on this connection; the hub mints the real one.
+        If the id is already registered the hub refuses, and publishes as it raise PermissionError.
+        """
+        token = str(uuid.uuid4())
+        self._send(("register", agent_id, token))
+        return token
+
+    def subscribe(self, topic: str, handler: Callable[[Message], Any], owner: Optional[str] = None):
+        if owner is None:
+            owner = MessageBus._handler_owner(handler)
+        sub_id = next(self._ids)
+        self._handlers[sub_id] = (topic, handler)
+        self._send(("subscribe", sub_id, topic, owner))
+
+    def unsubscribe(self, topic: str, handler: Callable[[Message], Any]):
+        for sub_id, (t, h) in list(self._handlers.items()):
+            if t == topic and h == handler:
+                del self._handlers[sub_id]
+                self._send(("unsubscribe", sub_id))
+                return
+
+    async def publish(self, topic: str, sender: str, payload: Any,
+                      message_type: str = "event", receiver: str = None,
+                      trace_id: str = None, parent_id: str = None, auth_token: str = None):
+        req_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._replies[req_id] = future
+        self._send(("publish", req_id, {
+            "topic": topic, "sender": sender, "payload": payload, "message_type": message_type,
+            "receiver": receiver, "trace_id": trace_id, "parent_id": parent_id, "auth_token": auth_token
+        }))
+        error = await future
+        if error is not None:
+            raise error
+
+    async def _read_loop(self):
+        while True:
+            frame = await _read_frame(self._reader)
+            if frame is None:
+                break
+            if frame[0] == "reply":
+                future = self._replies.pop(frame[1], None)
+                if future and not future.done():
+                    future.set_result(frame[2])
+            elif frame[0] == "deliver":
+                self._deliveries.put_nowait((frame[1], frame[2]))
+
+        # Hub went away: fail pending publishes instead of hanging
+        for future in self._replies.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Bus hub disconnected"))
+        self._replies.clear()
+
+    async def _dispatch_loop(self):
+        while True:
+            sub_id, message = await self._deliveries.get()
+            entry = self._handlers.get(sub_id)
+            if entry is None:
+                continue # Unsubscribed while in flight
+            handler = entry[1]
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    await handler(message)
+                else:
+                    handler(message)
+            except Exception as e:
+                logger.error(f"Error handling message on topic '{message.topic}': {e}")
@@ -2,15 +2,59 @@ import sqlite3
 import json
 import time
 import os
-from typing import Any, Dict
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+from agent_forge.utils.log_sink import BackgroundLogSink
+
+_INSERT_SQL = '''
+    INSERT INTO interactions (timestamp, agent_id, action, state, state_hash, reward, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
 
 class InteractionLogger:
-    def __init__(self, db_path: str = "simulation_logs.db", log_file: str = "simulation_events.jsonl"):
+    def __init__(self, db_path: str = "simulation_logs.db", log_file: str = "simulation_events.jsonl",
+                 buffered: bool = False, flush_rows: int = 500, flush_interval: float = 1.0,
+                 background: bool = False, queue_size: int = 10000, backpressure: str = "block"):
+        """
+        Args:
+            buffered: Keep one SQLite connection (WAL) and one JSONL handle open and
+                      write rows in batches instead of one transaction per interaction.
+            flush_rows: Buffered mode: flush once this many rows are pending.
+            flush_interval: Buffered mode: flush when this many seconds have passed
+                            since the last flush (checked on each write and by a timer
+                            thread, so idle loggers don't hold rows).
+            background: Hand rows to a BackgroundLogSink writer thread instead of
+                        writing on the caller's thread (implies buffered).
+            queue_size: Background mode: sink queue capacity.
+            backpressure: Background mode: "block", "drop_oldest" or "sample".
+        """
         self.db_path = db_path
         self.log_file = log_file
+        self.buffered = buffered or background
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
         self._setup_db()
         self._setup_json_log()
 
+        # Buffered writer state lives on a separate object, so the finalizer (GC or
+        # interpreter exit) and the flush timer can write it out without keeping this
+        # logger alive
+        self._writer: Optional[_BatchWriter] = None
+        self.sink: Optional[BackgroundLogSink] = None
+        self._stop_timer = threading.Event()
+        if self.buffered:
+            self._writer = _BatchWriter(db_path, log_file, flush_rows, flush_interval)
+        if background:
+            self.sink = BackgroundLogSink(self._writer.write_batch, maxsize=queue_size, policy=backpressure,
+                                          max_batch=flush_rows, name="interaction-log-sink")
+        elif self.buffered and flush_interval > 0:
+            threading.Thread(target=_flush_loop, args=(self._writer, flush_interval, self._stop_timer),
+                             name="interaction-log-flush", daemon=True).start()
+        if self.buffered:
+            self._finalizer = weakref.finalize(self, _close_writer, self._writer, self.sink, self._stop_timer)
+
     def _setup_db(self):
         """Initialize the SQLite database schema."""
         conn = sqlite3.connect(self.db_path)
@@ -46,6 +90,9 @@ class InteractionLogger:
     def log_interaction(self, agent_id: str, action: str, state: Any, reward: float, metadata: Dict[str, Any] = None, state_hash: str = None):
         """Log an interaction to both SQLite and JSONL."""
         timestamp = time.time()
+        if self.buffered:
+            self._buffer([(timestamp, agent_id, action, state, state_hash, reward, metadata)])
+            return
         metadata_json = json.dumps(metadata) if metadata else "{}"
         state_str = str(state) # Convert complex states to string for DB
 
@@ -53,10 +100,7 @@ class InteractionLogger:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO interactions (timestamp, agent_id, action, state, state_hash, reward, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (timestamp, agent_id, action, state_str, state_hash, reward, metadata_json))
+            cursor.execute(_INSERT_SQL, (timestamp, agent_id, action, state_str, state_hash, reward, metadata_json))
             conn.commit()
             conn.close()
         except Exception as e:
@@ -78,8 +122,87 @@ class InteractionLogger:
         except Exception as e:
             print(f"Error logging to JSONL: {e}")
 
+    def log_interactions(self, entries: List[Dict[str, Any]]):
+        """
+        Log a batch of interactions (e.g. one lockstep tick) with a single
+        SQLite transaction and a single JSONL append.
+        Each entry takes the same keys as log_interaction's arguments.
+        """
+        if not entries:
+            return
+        timestamp = time.time()
+        if self.buffered:
+            self._buffer([
+                (timestamp, e["agent_id"], e["action"], e["state"], e.get("state_hash"), e["reward"], e.get("metadata"))
+                for e in entries
+            ])
+            return
+
+        # 1. SQLite Logging
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.executemany(_INSERT_SQL, [
+                (timestamp, e["agent_id"], e["action"], str(e["state"]), e.get("state_hash"),
+                 e["reward"], json.dumps(e["metadata"]) if e.get("metadata") else "{}")
+                for e in entries
+            ])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Error logging to SQLite: {e}")
+
+        # 2. JSONL Logging
+        try:
+            lines = []
+            for e in entries:
+                lines.append(json.dumps({
+                    "timestamp": timestamp,
+                    "agent_id": e["agent_id"],
+                    "action": e["action"],
+                    "state": e["state"],
+                    "state_hash": e.get("state_hash"),
+                    "reward": e["reward"],
+                    "metadata": e.get("metadata")
+                }) + "\n")
+            with open(self.log_file, "a") as f:
+                f.writelines(lines)
+        except Exception as e:
+            print(f"Error logging to JSONL: {e}")
+
+    # --- Buffered writer ---
+
+    def _buffer(self, records: List[tuple]):
+        """Queues (timestamp, agent_id, action, state, state_hash, reward, metadata) records."""
+        # Serialize on the caller so later mutation of state/metadata can't leak into the log
+        serialized = [_serialize(record) for record in records]
+        if self.sink:
+            for item in serialized:
+                self.sink.put(item)
+            return
+        self._writer.add(serialized)
+
+    def flush(self):
+        """Writes all pending rows with one executemany and one JSONL write."""
+        if self.sink:
+            # Wait for the writer thread to catch up
+            self.sink.flush()
+        if self._writer:
+            self._writer.flush()
+
+    def close(self):
+        """Flushes pending rows and releases the connection and file handle."""
+        if self.buffered:
+            self._finalizer()
+
+    def sink_stats(self) -> Dict[str, Any]:
+        """Background sink counters (queue depth, dropped/lagging records), empty if not in background mode."""
+        return self.sink.stats() if self.sink else {}
+
     def get_logs(self, agent_id: str = None, limit: int = 100):
         """Retrieve logs from SQLite."""
+        if self.buffered:
+            self.flush()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         if agent_id:
@@ -89,3 +212,115 @@ class InteractionLogger:
         rows = cursor.fetchall()
         conn.close()
         return rows
+
+
+def _serialize(record: tuple):
+    """(timestamp, agent_id, action, state, state_hash, reward, metadata) -> (db row, JSONL line)."""
+    timestamp, agent_id, action, state, state_hash, reward, metadata = record
+    row = (timestamp, agent_id, action, str(state), state_hash, reward,
+           json.dumps(metadata) if metadata else "{}")
+    try:
+        line = json.dumps({
+            "timestamp": timestamp,
+            "agent_id": agent_id,
+            "action": action,
+            "state": state,
+            "state_hash": state_hash,
+            "reward": reward,
+            "metadata": metadata
+        }) + "\n"
+    except Exception as e:
+        print(f"Error logging to JSONL: {e}")
+        line = None
+    return row, line
+
+
+class _BatchWriter:
+    """
+    Buffered mode state: pending rows plus one SQLite connection (WAL) and one
+    JSONL handle, written with one executemany and one write per flush.
+    """
+    def __init__(self, db_path: str, log_file: str, flush_rows: int, flush_interval: float):
+        self.db_path = db_path
+        self.log_file = log_file
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._json_handle = None
+        self._pending_rows: List[tuple] = []
+        self._pending_lines: List[str] = []
+        self.last_flush = time.monotonic()
+
+    def add(self, serialized: List[tuple]):
+        with self._lock:
+            for row, line in serialized:
+                self._pending_rows.append(row)
+                if line is not None:
+                    self._pending_lines.append(line)
+
+            if (len(self._pending_rows) >= self.flush_rows or
+                    time.monotonic() - self.last_flush >= self.flush_interval):
+                self.flush()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    def write_batch(self, items: List[tuple]):
+        """Sink callback: writes a batch of (row, line) pairs from the writer thread."""
+        self._write([row for row, _ in items], [line for _, line in items if line is not None])
+
+    def flush(self):
+        with self._lock:
+            rows, lines = self._pending_rows, self._pending_lines
+            self._pending_rows, self._pending_lines = [], []
+            self.last_flush = time.monotonic()
+            self._write(rows, lines)
+
+    def _write(self, rows: List[tuple], lines: List[str]):
+        with self._lock:
+            if rows:
+                try:
+                    conn = self._get_conn()
+                    conn.executemany(_INSERT_SQL, rows)
+                    conn.commit()
+                except Exception as e:
+                    print(f"Error logging to SQLite: {e}")
+
+            if lines:
+                try:
+                    if self._json_handle is None:
+                        self._json_handle = open(self.log_file, "a")
+                    self._json_handle.writelines(lines)
+                    self._json_handle.flush()
+                except Exception as e:
+                    print(f"Error logging to JSONL: {e}")
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._json_handle is not None:
+                self._json_handle.close()
+                self._json_handle = None
+
+
+def _flush_loop(writer: _BatchWriter, interval: float, stop: threading.Event):
+    """Flush timer: rows never wait more than about flush_interval, even when no more writes come"""
+    while not stop.wait(interval):
+        if time.monotonic() - writer.last_flush >= interval:
+            writer.flush()
+
+
+def _close_writer(writer: _BatchWriter, sink: Optional[BackgroundLogSink], stop: threading.Event):
+    """close() body, also run by the finalizer when a logger is collected or at interpreter exit"""
+    stop.set()
+    if sink:
+        sink.close()
+    writer.close()
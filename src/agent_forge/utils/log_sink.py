@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+from agent_forge.utils.logger import get_logger
+logger = get_logger("LogSink")
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "sample")
+
+
+class BackgroundLogSink:
+    """
+    Bounded queue drained by a dedicated writer thread.
+
+    Producers (the engine's event loop) only pay for an append; the writer thread
+    hands whole batches to `write_batch`, so disk latency never lands on the loop.
+    What happens when the queue is full is explicit:
+      - "block":       put() waits for room (lossless, may stall the producer).
+                       A producer on an event-loop thread is never stalled: there
+                       a full queue drops its oldest record (counted in loop_overflows)
+      - "drop_oldest": the oldest queued record is discarded to make room
+      - "sample":      above half capacity only every `sample_rate`-th record is
+                       admitted; a full queue drops the incoming record
+    """
+    def __init__(self, write_batch: Callable[[List[Any]], None], maxsize: int = 10000,
+                 policy: str = "block", sample_rate: int = 10, max_batch: int = 1000,
+                 lag_threshold: float = 1.0, name: str = "log-sink"):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}'. Use one of {BACKPRESSURE_POLICIES}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.write_batch = write_batch
+        self.maxsize = maxsize
+        self.policy = policy
+        self.sample_rate = max(1, sample_rate)
+        self.max_batch = max_batch
+        self.lag_threshold = lag_threshold
+
+        self._queue: deque = deque() # (enqueue_time, record)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._sample_counter = 0
+
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.loop_overflows = 0
+        self.lagging = 0
+        self.max_lag = 0.0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, record: Any) -> bool:
+        """Queues a record. Returns False if the backpressure policy discarded it."""
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+
+            if self.policy == "sample" and len(self._queue) >= self.maxsize // 2:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_rate:
+                    self.dropped += 1
+                    return False
+
+            if len(self._queue) >= self.maxsize:
+                if self.policy == "block" and _on_event_loop():
+                    # Waiting here would freeze every coroutine on the loop
+                    self._queue.popleft()
+                    self.dropped += 1
+                    self.loop_overflows += 1
+                elif self.policy == "block":
+                    self.blocked += 1
+                    while len(self._queue) >= self.maxsize and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        self.dropped += 1
+                        return False
+                elif self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return False
+
+            self._queue.append((time.monotonic(), record))
+            self.enqueued += 1
+            self._cond.notify_all()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue and self._closed:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all() # Wake blocked producers
+
+            now = time.monotonic()
+            for enqueued_at, _ in batch:
+                lag = now - enqueued_at
+                if lag > self.max_lag:
+                    self.max_lag = lag
+                if lag > self.lag_threshold:
+                    self.lagging += 1
+
+            try:
+                self.write_batch([record for _, record in batch])
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Log sink write failed, {len(batch)} records lost: {e}")
+
+            with self._cond:
+                self.written += len(batch)
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Blocks until everything queued so far has been written. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Drains the queue and stops the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counter snapshot for dashboards/metrics."""
+        with self._cond:
+            return {
+                "policy": self.policy,
+                "depth": len(self._queue),
+                "capacity": self.maxsize,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "blocked": self.blocked,
+                "loop_overflows": self.loop_overflows,
+                "lagging": self.lagging,
+                "max_lag": self.max_lag,
+                "write_errors": self.write_errors
+            }
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
@@ -1,15 +1,162 @@
 import sqlite3
 import json
 import os
+import re
+import atexit
 import logging
+import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger("Memory")
 
+_INSERT_SQL = """
+INSERT INTO memories (agent_id, type, content, timestamp, sim_context)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# sim_context as JSON, or NULL when it isn't valid JSON (json_extract raises on malformed input)
+_CTX_JSON = "CASE WHEN json_valid(sim_context) THEN sim_context END"
+
+# Values json_extract returns as plain SQL values, so they can be compared with "="
+_SQL_SCALARS = (str, int, float, bool, type(None))
+
+
+def _json_path(key: str) -> str:
+    return '$."' + key.replace('"', '\\"') + '"'
+
+
+def _ctx_column(key: str) -> str:
+    return "ctx_" + re.sub(r"\W", "_", key)
+
+
+class _GroupCommitWriter:
+    """
+    Coalesces memory inserts for one DB file into periodic transactions.
+
+    Rows are queued in memory and committed by a background thread every
+    `commit_interval` seconds (the durability window), or sooner once
+    `max_batch` rows are pending. One writer per file means one writer lock
+    holder instead of every agent contending for it.
+    """
+    def __init__(self, db_path: str, commit_interval: float, max_batch: int):
+        self.db_path = db_path
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.refs = 0
+        self.commits = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()        # guards _pending
+        self._write_lock = threading.Lock()  # serializes commits
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"memory-commit:{os.path.basename(db_path)}", daemon=True)
+        self._thread.start()
+
+    def add(self, row: tuple):
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.max_batch:
+                self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.commit_interval)
+            self._wake.clear()
+            self.commit()
+
+    def commit(self):
+        """Writes everything queued so far in a single transaction."""
+        with self._write_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+            try:
+                with self.conn:
+                    self.conn.executemany(_INSERT_SQL, rows)
+                self.commits += 1
+            except sqlite3.OperationalError as e:
+                # e.g. database locked by another process: keep the rows for the next window
+                logger.error(f"DB group commit failed ({len(rows)} rows re-queued): {e}")
+                with self._lock:
+                    self._pending[:0] = rows
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join(5)
+        self.commit()
+        self.conn.close()
+
+
+# (db file, commit_interval, max_batch) -> shared writer: all agents on one file with the
+# same settings share one commit stream; different settings get their own writer
+_writers: Dict[tuple, _GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_key(db_path: str, commit_interval: float, max_batch: int) -> tuple:
+    return (os.path.abspath(db_path), commit_interval, max_batch)
+
+
+def _acquire_writer(db_path: str, commit_interval: float, max_batch: int) -> _GroupCommitWriter:
+    key = _writer_key(db_path, commit_interval, max_batch)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = _GroupCommitWriter(db_path, commit_interval, max_batch)
+        writer.refs += 1
+        return writer
+
+
+def _release_writer(writer: _GroupCommitWriter):
+    with _writers_lock:
+        writer.refs -= 1
+        if writer.refs > 0:
+            return
+        key = _writer_key(writer.db_path, writer.commit_interval, writer.max_batch)
+        if _writers.get(key) is writer:
+            del _writers[key]
+    writer.close()
+
+
+@atexit.register
+def _commit_all_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.commit()
+
+
 class Memory:
-    def __init__(self, db_path: str = "data/memory.db"):
+    def __init__(self, db_path: str = "data/memory.db", group_commit: bool = False,
+                 commit_interval: float = 0.05, max_batch: int = 500, shared_writer: bool = True,
+                 indexed_keys: tuple = ("status",)):
+        """
+        Args:
+            group_commit: Queue add_memory() rows and commit them in periodic
+                          transactions instead of one transaction per row.
+            commit_interval: Group commit: durability window in seconds; rows
+                             added within it may be lost on a hard crash.
+            max_batch: Group commit: commit early once this many rows are queued.
+            shared_writer: Group commit: share one writer with every Memory
+                           on the same DB file and with the same commit_interval
+                           and max_batch (False = private writer).
+            indexed_keys: sim_context keys that get a generated column and an
+                          index, for fast filter_metadata lookups.
+        """
         self.db_path = db_path
+        self.indexed_keys = tuple(indexed_keys)
         self._ensure_dir()
         
         # Connect to DB. check_same_thread=False is needed if multiple threads share the connection,
@@ -25,6 +172,13 @@ class Memory:
         
         self._init_schema()
 
+        self.writer: Optional[_GroupCommitWriter] = None
+        if group_commit:
+            if shared_writer:
+                self.writer = _acquire_writer(db_path, commit_interval, max_batch)
+            else:
+                self.writer = _GroupCommitWriter(db_path, commit_interval, max_batch)
+
     def _ensure_dir(self):
         dirname = os.path.dirname(self.db_path)
         if dirname and not os.path.exists(dirname):
@@ -45,6 +199,19 @@ class Memory:
             self.conn.execute(query)
             # Index for faster frequent lookups
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_timestamp ON memories(agent_id, timestamp);")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_type_timestamp ON memories(agent_id, type, timestamp);")
+
+            # Commonly filtered sim_context keys: virtual generated column + index,
+            # so filter_metadata on them is an index range scan instead of a JSON parse per row
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_xinfo(memories)")}
+            for key in self.indexed_keys:
+                column = _ctx_column(key)
+                if column not in columns:
+                    self.conn.execute(
+                        f"ALTER TABLE memories ADD COLUMN {column} "
+                        f"AS (json_extract({_CTX_JSON}, '{_json_path(key)}')) VIRTUAL"
+                    )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{column} ON memories(agent_id, {column}, timestamp);")
 
     def add_memory(self, agent_id: str, type: str, content: Any, sim_context: Optional[Dict] = None):
         """
@@ -58,14 +225,15 @@ class Memory:
             
         sim_context_json = json.dumps(sim_context) if sim_context else None
         timestamp = datetime.now().isoformat()
+        row = (agent_id, type, content_json, timestamp, sim_context_json)
+
+        if self.writer:
+            self.writer.add(row)
+            return
 
-        query = """
-        INSERT INTO memories (agent_id, type, content, timestamp, sim_context)
-        VALUES (?, ?, ?, ?, ?)
-        """
         try:
             with self.conn:
-                self.conn.execute(query, (agent_id, type, content_json, timestamp, sim_context_json))
+                self.conn.execute(_INSERT_SQL, row)
         except sqlite3.OperationalError as e:
             logger.error(f"DB Write failed: {e}")
             raise
@@ -79,7 +247,10 @@ class Memory:
         Time range should be ISO format strings.
         filter_metadata checks if key-value pairs exist in sim_context.
         """
-        query = "SELECT * FROM memories WHERE 1=1"
+        # Read-your-writes: commit anything still queued for this file
+        self.flush()
+
+        query = "SELECT id, agent_id, type, content, timestamp, sim_context FROM memories WHERE 1=1"
         params = []
 
         if agent_id:
@@ -94,18 +265,32 @@ class Memory:
         if end_time:
             query += " AND timestamp <= ?"
             params.append(end_time)
+
+        # Scalar metadata filters run in SQLite (json_extract / generated columns).
+        # Nested values (dicts, lists) are compared in Python, where key order doesn't matter.
+        python_filters = {}
+        if filter_metadata:
+            query += f" AND json_type({_CTX_JSON}) = 'object'"
+            for k, v in filter_metadata.items():
+                if not isinstance(v, _SQL_SCALARS):
+                    python_filters[k] = v
+                    continue
+                if k in self.indexed_keys:
+                    expr = _ctx_column(k)
+                else:
+                    expr = f"json_extract({_CTX_JSON}, ?)"
+                    params.append(_json_path(k))
+                if v is None:
+                    # Missing key or JSON null, same as dict.get(k) == None
+                    query += f" AND {expr} IS NULL"
+                else:
+                    query += f" AND {expr} = ?"
+                    params.append(v)
         
         query += " ORDER BY timestamp DESC, id DESC"
         
-        # If we have basic DB filters, we fetch more than limit because we might filter out 
-        # items in Python based on metadata, so applied limit at the very end.
-        # But for performance on huge datasets, we should ideally use SQL JSON. 
-        # For this MVP, we will fetch up to limit * 10 candidates if metadata filter is on, 
-        # or just fetch all logic if needed. 
-        # Let's apply limit only if no metadata filter, OR apply limit at the end of python processing.
-        # For safety/performance trade-off: apply SQL limit only if NO metadata filter.
-        
-        if not filter_metadata:
+        # The SQL LIMIT is only unsafe when rows may still be dropped by the Python-side filter
+        if not python_filters:
              query += " LIMIT ?"
              params.append(limit)
         
@@ -121,12 +306,12 @@ class Memory:
             except json.JSONDecodeError:
                 sim_context = row[5]
 
-            # Metadata Filter (Python side)
-            if filter_metadata:
+            # Nested-value metadata filter (Python side)
+            if python_filters:
                 if not isinstance(sim_context, dict):
                     continue
                 match = True
-                for k, v in filter_metadata.items():
+                for k, v in python_filters.items():
                     if sim_context.get(k) != v:
                         match = False
                         break
@@ -199,5 +384,16 @@ class Memory:
                 
         return summary
 
+    def flush(self):
+        """Commits rows queued by group commit (no-op otherwise)."""
+        if self.writer:
+            self.writer.commit()
+
     def close(self):
+        if self.writer:
+            writer, self.writer = self.writer, None
+            if writer in _writers.values():
+                _release_writer(writer)
+            else:
+                writer.close()
         self.conn.close()
@@ -6,12 +6,48 @@ import logging
 import inspect
 import json
 import os
+import time
 import uuid
+import itertools
 import random # Added for chaos
 
 from agent_forge.utils.logger import get_logger
+from agent_forge.utils.audit_log import AuditLogWriter
+from agent_forge.utils.bus_metrics import BusMetrics
 logger = get_logger("MessageBus")
 
+MESSAGE_TYPES = frozenset({"command", "event", "query", "response", "error"})
+
+# Trace ids for trusted (fast path) messages: a random per-process UUID prefix plus a
+# counter. Still valid UUID strings, unique across worker processes, and cheap to make.
+def _new_trace_prefix() -> str:
+    h = uuid.uuid4().hex
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-"
+
+_trace_prefix = _new_trace_prefix()
+_trace_ids = itertools.count(1)
+
+
+def _reseed_trace_ids():
+    global _trace_prefix, _trace_ids
+    _trace_prefix = _new_trace_prefix()
+    _trace_ids = itertools.count(1)
+
+# Forked workers must not continue the parent's sequence (no fork, no hook on Windows)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_trace_ids)
+
+
+def _next_trace_id() -> str:
+    return f"{_trace_prefix}{next(_trace_ids):012x}"
+
+
+def _validate_trace_ref(value: Any, field_name: str):
+    try:
+        uuid.UUID(value)
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError(f"Invalid {field_name} '{value}'. Must be a valid UUID string.")
+
 @dataclass
 class Message:
     topic: str
@@ -37,26 +73,111 @@ class Message:
             self.trace_id = str(uuid.uuid4())
 
         # 3. Validate Message Type
-        allowed_types = {"command", "event", "query", "response", "error"}
-        if self.message_type not in allowed_types:
-            raise ValueError(f"Invalid message_type '{self.message_type}'. Allowed: {allowed_types}")
+        if self.message_type not in MESSAGE_TYPES:
+            raise ValueError(f"Invalid message_type '{self.message_type}'. Allowed: {set(MESSAGE_TYPES)}")
 
         # 4. Validate Trace ID (Basic UUID format check per MVP)
-        try:
-            uuid.UUID(self.trace_id)
-        except ValueError:
-            raise ValueError(f"Invalid trace_id '{self.trace_id}'. Must be a valid UUID string.")
+        _validate_trace_ref(self.trace_id, "trace_id")
             
         # 5. Validate Parent ID if present
         if self.parent_id:
-            try:
-                uuid.UUID(self.parent_id)
-            except ValueError:
-                raise ValueError(f"Invalid parent_id '{self.parent_id}'. Must be a valid UUID string.")
+            _validate_trace_ref(self.parent_id, "parent_id")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class FastMessage:
+    """
+    Trusted message for publishers that already passed the bus's auth check.
+
+    Same fields and field types as Message (UUID string trace id, ISO timestamp),
+    but slotted and cheap to build: the trace id comes from a per-process counter
+    instead of uuid4(), and only message_type is checked (caller-supplied ids are trusted).
+    """
+    __slots__ = ("topic", "sender", "payload", "message_type", "receiver",
+                 "trace_id", "parent_id", "timestamp")
+
+    def __init__(self, topic: str, sender: str, payload: Any, message_type: str = "event",
+                 receiver: Optional[str] = None, trace_id: Optional[str] = None,
+                 parent_id: Optional[str] = None, timestamp: Optional[str] = None):
+        if message_type not in MESSAGE_TYPES:
+            raise ValueError(f"Invalid message_type '{message_type}'. Allowed: {set(MESSAGE_TYPES)}")
+        self.topic = topic
+        self.sender = sender
+        self.payload = payload
+        self.message_type = message_type
+        self.receiver = receiver
+        self.trace_id = _next_trace_id() if trace_id is None else trace_id
+        self.parent_id = parent_id
+        self.timestamp = datetime.now().isoformat() if timestamp is None else timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as Message's audit record."""
+        return {
+            "topic": self.topic,
+            "sender": self.sender,
+            "payload": self.payload,
+            "message_type": self.message_type,
+            "receiver": self.receiver,
+            "trace_id": self.trace_id,
+            "parent_id": self.parent_id,
+            "timestamp": self.timestamp
+        }
+
+    def __repr__(self):
+        return (f"FastMessage(topic={self.topic!r}, sender={self.sender!r}, "
+                f"receiver={self.receiver!r}, trace_id={self.trace_id!r})")
+
+OVERFLOW_POLICIES = ("block", "drop", "dlq")
+
+
+class _Subscriber:
+    """Concurrent dispatch: one handler's bounded inbox and the worker task draining it."""
+    __slots__ = ("handler", "inbox", "task", "delivered", "dropped")
+
+    def __init__(self, handler: Callable[[Message], Any], inbox_size: int):
+        self.handler = handler
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=inbox_size)
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+
 
 class MessageBus:
-    def __init__(self, log_path: str = "logs/message_bus.jsonl", max_queue_size: int = 1000, dlq_limit: int = 50):
+    def __init__(self, log_path: str = "logs/message_bus.jsonl", max_queue_size: int = 1000, dlq_limit: int = 50,
+                 dispatch: str = "serial", inbox_size: int = 100, overflow: str = "block",
+                 fast_path: bool = False, audit_max_bytes: Optional[int] = None,
+                 audit_rotate_interval: Optional[float] = None, audit_compress: bool = False):
+        """
+        log_path: JSONL audit log, written in batches by an AuditLogWriter (None = no audit).
+        audit_max_bytes / audit_rotate_interval: rotate the audit log by size / age (seconds).
+        audit_compress: gzip rotated audit segments.
+        fast_path: Opt-in. Registered senders presenting a valid token get a FastMessage
+                   (counter-based trace ids, no re-validation of ids). Anyone
+                   else is treated as the system edge and gets a validated Message.
+        dispatch: "serial" awaits every handler in turn on the bus loop.
+                  "concurrent" gives each subscriber its own bounded inbox and
+                  worker task, so a slow handler only delays itself.
+        inbox_size: Concurrent mode: per-subscriber inbox capacity.
+        overflow: Concurrent mode: what a full inbox does with a new message,
+                  "block" (wait for room), "drop" (discard) or "dlq" (dead-letter it).
+        """
+        if dispatch not in ("serial", "concurrent"):
+            raise ValueError(f"Invalid dispatch mode '{dispatch}'. Use 'serial' or 'concurrent'.")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}'. Allowed: {OVERFLOW_POLICIES}")
+        self._dispatch = dispatch
+        self._fast_path = fast_path
+        self._inbox_size = inbox_size
+        self._overflow = overflow
+        # Concurrent dispatch: handler -> _Subscriber
+        self._inboxes: Dict[Callable[[Message], Any], _Subscriber] = {}
+
         self._subscribers: Dict[str, List[Callable[[Message], Any]]] = {}
+        # Receiver index: topic -> owner agent_id (None = observer) -> handlers.
+        # Directed messages only reach the receiver's handlers plus observers.
+        self._routes: Dict[str, Dict[Optional[str], List[Callable[[Message], Any]]]] = {}
         # Backpressure: Limit queue size
         self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
         self._running = False
@@ -68,15 +189,20 @@ class MessageBus:
         # Dead Letter Queue
         self._dlq: List[Message] = []
         self._dlq_limit = dlq_limit
+
+        # Instrumentation: per-topic counters and latency histograms
+        self.metrics = BusMetrics()
         
         # Chaos Configuration
         self._latency_min = 0.0
         self._latency_max = 0.0
         self._drop_rate = 0.0
         
-        # Ensure log directory exists
-        if log_path and os.path.dirname(log_path):
-            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        # Audit log: batched background writes through one persistent handle
+        self._audit: Optional[AuditLogWriter] = None
+        if log_path:
+            self._audit = AuditLogWriter(log_path, max_bytes=audit_max_bytes,
+                                         rotate_interval=audit_rotate_interval, compress=audit_compress)
 
     @property
     def qsize(self):
@@ -100,15 +226,29 @@ class MessageBus:
         self._running = True
         logger.info("MessageBus started.")
         asyncio.create_task(self._process_queue())
+        for sub in self._inboxes.values():
+            self._start_worker(sub)
 
     async def stop(self):
         """Stops the message bus."""
         self._running = False
+        for sub in self._inboxes.values():
+            if sub.task:
+                sub.task.cancel()
+                sub.task = None
+        if self._audit:
+            await self._audit.stop()
         logger.info("MessageBus stopped.")
 
-    def register(self, agent_id: str) -> str:
-        """Registers an agent and returns an auth token."""
+    def register(self, agent_id: str, exclusive: bool = False) -> str:
+        """
+        Registers an agent and returns an auth token.
+        exclusive: refuse (PermissionError) if the id is already registered, instead of
+                   replacing its token (used by remote transports).
+        """
         if agent_id in self._registry:
+            if exclusive:
+                raise PermissionError(f"Agent '{agent_id}' is already registered.")
             logger.warning(f"Agent {agent_id} re-registering.")
         
         token = str(uuid.uuid4())
@@ -116,11 +256,33 @@ class MessageBus:
         logger.info(f"Registered agent '{agent_id}'")
         return token
 
-    def subscribe(self, topic: str, handler: Callable[[Message], Any]):
-        """Subscribes a handler callback to a topic."""
+    def unregister(self, agent_id: str, token: Optional[str] = None):
+        """Forgets an agent's token (only if it is still `token`, when given), e.g. when its remote worker disconnects."""
+        if token is None or self._registry.get(agent_id) == token:
+            self._registry.pop(agent_id, None)
+
+    @staticmethod
+    def _handler_owner(handler: Callable[[Message], Any]) -> Optional[str]:
+        """Agent that owns a handler: the agent_id of a bound method's instance (e.g. agent.receive_message)."""
+        owner = getattr(getattr(handler, "__self__", None), "agent_id", None)
+        return owner if isinstance(owner, str) else None
+
+    def subscribe(self, topic: str, handler: Callable[[Message], Any], owner: Optional[str] = None):
+        """
+        Subscribes a handler callback to a topic.
+        owner: agent_id the handler receives directed messages for. Inferred from
+               bound agent methods; handlers without an owner observe every message.
+        """
+        if owner is None:
+            owner = self._handler_owner(handler)
         if topic not in self._subscribers:
             self._subscribers[topic] = []
         self._subscribers[topic].append(handler)
+        self._routes.setdefault(topic, {}).setdefault(owner, []).append(handler)
+        if self._dispatch == "concurrent" and handler not in self._inboxes:
+            sub = self._inboxes[handler] = _Subscriber(handler, self._inbox_size)
+            if self._running:
+                self._start_worker(sub)
         logger.debug(f"Subscribed to '{topic}'")
 
     def unsubscribe(self, topic: str, handler: Callable[[Message], Any]):
@@ -130,7 +292,30 @@ class MessageBus:
                 self._subscribers[topic].remove(handler)
                 logger.debug(f"Unsubscribed from '{topic}'")
             except ValueError:
-                pass # Handler not in list
+                return # Handler not in list
+
+            routes = self._routes.get(topic, {})
+            for owner, handlers in list(routes.items()):
+                if handler in handlers:
+                    handlers.remove(handler)
+                    if not handlers:
+                        del routes[owner]
+                    break
+
+            # Retire the inbox once the handler has no subscriptions left
+            if handler in self._inboxes and not any(handler in hs for hs in self._subscribers.values()):
+                sub = self._inboxes.pop(handler)
+                if sub.task:
+                    sub.task.cancel()
+
+    def _handlers_for(self, message: Message) -> List[Callable[[Message], Any]]:
+        """Handlers a message is delivered to: all for broadcasts, receiver + observers when directed."""
+        if message.receiver is None or message.receiver == "all":
+            return list(self._subscribers.get(message.topic, ()))
+        routes = self._routes.get(message.topic)
+        if not routes:
+            return []
+        return routes.get(None, []) + routes.get(message.receiver, [])
 
     async def publish(self, topic: str, sender: str, payload: Any, 
                       message_type: str = "event", receiver: str = None, 
@@ -149,7 +334,9 @@ class MessageBus:
         # No, simpler: checks only if sender IS in registry. 
         # BETTER: Fail if sender NOT in registry OR token mismatch.
         
+        trusted = False
         if sender in self._registry:
+            trusted = self._fast_path
             if auth_token != self._registry[sender]:
                 logger.error(f"Auth failed for sender '{sender}'. Invalid token.")
                 # We could raise Exception, but async queue might just drop it or log error.
@@ -162,67 +349,177 @@ class MessageBus:
              if self._registry and sender != "system":
                  raise PermissionError(f"Agent '{sender}' is not registered.")
 
-        message = Message(
-            topic=topic, 
-            sender=sender, 
-            payload=payload, 
-            message_type=message_type,
-            receiver=receiver,
-            trace_id=trace_id,
-            parent_id=parent_id
-        )
-        await self._queue.put(message)
+        if trusted:
+            message = FastMessage(topic, sender, payload, message_type, receiver, trace_id, parent_id)
+        else:
+            message = Message(
+                topic=topic, 
+                sender=sender, 
+                payload=payload, 
+                message_type=message_type,
+                receiver=receiver,
+                trace_id=trace_id,
+                parent_id=parent_id
+            )
+        # Queue entries carry their publish time for publish -> deliver latency
+        await self._queue.put((time.perf_counter(), message))
+        self.metrics.count(topic, "published")
         
         # Log purely for audit
-        if self._log_path:
+        if self._audit:
             try:
-                with open(self._log_path, "a") as f:
-                    f.write(json.dumps(asdict(message)) + "\n")
+                self._audit.write(message.to_dict())
             except Exception as e:
                 logger.error(f"Failed to log message: {e}")
 
         logger.debug(f"Published to '{topic}' from '{sender}' (Trace: {message.trace_id})")
 
+    def _to_dlq(self, message: Message):
+        """Dead-letters a message, evicting the oldest entry at the limit."""
+        if len(self._dlq) >= self._dlq_limit:
+            self._dlq.pop(0) # Remove oldest
+        self._dlq.append(message)
+
+    def _handler_name(self, handler: Callable[[Message], Any]) -> str:
+        name = getattr(handler, "__qualname__", None) or type(handler).__name__
+        owner = self._handler_owner(handler)
+        return f"{name}[{owner}]" if owner else name
+
+    async def _invoke(self, handler: Callable[[Message], Any], message: Message, published_at: float):
+        started = time.perf_counter()
+        ok = True
+        try:
+            if inspect.iscoroutinefunction(handler):
+                await handler(message)
+            else:
+                handler(message)
+        except Exception as e:
+            ok = False
+            logger.error(f"Error handling message on topic '{message.topic}': {e}")
+            # Send to DLQ with Limit
+            self._to_dlq(message)
+        self.metrics.delivered(message.topic, self._handler_name(handler),
+                               started - published_at, time.perf_counter() - started, ok)
+
+    def _chaos_drop(self, message: Message) -> bool:
+        if self._drop_rate > 0 and random.random() < self._drop_rate:
+            logger.warning(f"[Chaos] Dropped message {message.trace_id}")
+            self.metrics.count(message.topic, "dropped")
+            return True
+        return False
+
+    async def _chaos_delay(self):
+        if self._latency_max > 0:
+            delay = random.uniform(self._latency_min, self._latency_max)
+            await asyncio.sleep(delay)
+
+    # --- Concurrent dispatch ---
+
+    def _start_worker(self, sub: _Subscriber):
+        if sub.task is None or sub.task.done():
+            sub.task = asyncio.create_task(self._subscriber_worker(sub))
+
+    async def _subscriber_worker(self, sub: _Subscriber):
+        """Drains one subscriber's inbox. Chaos latency is paid per delivery, by this subscriber only."""
+        while True:
+            published_at, message = await sub.inbox.get()
+            try:
+                await self._chaos_delay()
+                await self._invoke(sub.handler, message, published_at)
+                sub.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in subscriber worker: {e}")
+            finally:
+                sub.inbox.task_done()
+
+    async def _fan_out(self, published_at: float, message: Message):
+        """Hands a message to each target subscriber's inbox without waiting for the handlers."""
+        for handler in self._handlers_for(message):
+            sub = self._inboxes.get(handler)
+            if sub is None:
+                continue
+            # Chaos drops are per delivery too
+            if self._chaos_drop(message):
+                continue
+            entry = (published_at, message)
+            try:
+                sub.inbox.put_nowait(entry)
+            except asyncio.QueueFull:
+                if self._overflow == "block":
+                    await sub.inbox.put(entry)
+                elif self._overflow == "dlq":
+                    sub.dropped += 1
+                    self.metrics.count(message.topic, "dlq")
+                    self._to_dlq(message)
+                else:
+                    sub.dropped += 1
+                    self.metrics.count(message.topic, "dropped")
+                    logger.warning(f"Inbox full, dropped message {message.trace_id} on '{message.topic}'")
+
+    async def drain(self):
+        """Waits until every published message has been handled (both dispatch modes)."""
+        await self._queue.join()
+        for sub in list(self._inboxes.values()):
+            await sub.inbox.join()
+
+    def subscriber_stats(self) -> List[Dict[str, Any]]:
+        """Concurrent mode: per-subscriber inbox depth and delivered/dropped counters."""
+        return [
+            {
+                "handler": getattr(sub.handler, "__qualname__", repr(sub.handler)),
+                "owner": self._handler_owner(sub.handler),
+                "depth": sub.inbox.qsize(),
+                "delivered": sub.delivered,
+                "dropped": sub.dropped
+            }
+            for sub in self._inboxes.values()
+        ]
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Cheap, JSON-serializable view of the bus for dashboards and the API."""
+        snapshot = self.metrics.snapshot()
+        snapshot.update({
+            "running": self._running,
+            "dispatch": self._dispatch,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "dlq_size": len(self._dlq),
+            "subscribers": self.subscriber_stats()
+        })
+        return snapshot
+
     async def _process_queue(self):
         """Internal loop to process messages from the queue."""
         while self._running:
             try:
                 # Add timeout to allow checking _running flag
                 try:
-                    message = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+                    published_at, message = await asyncio.wait_for(self._queue.get(), timeout=1.0)
                 except asyncio.TimeoutError:
                     continue
 
+                if self._dispatch == "concurrent":
+                    await self._fan_out(published_at, message)
+                    self._queue.task_done()
+                    continue
+
                 # --- CHAOS INJECTION ---
                 # 1. Packet Loss
-                if self._drop_rate > 0 and random.random() < self._drop_rate:
-                    logger.warning(f"[Chaos] Dropped message {message.trace_id}")
-                    # In Chaos Mode, dropped messages are intentionally lost, NOT DLQ.
-                    # Because DLQ implies "failed processing", not "network drop".
+                # In Chaos Mode, dropped messages are intentionally lost, NOT DLQ.
+                # Because DLQ implies "failed processing", not "network drop".
+                if self._chaos_drop(message):
                     self._queue.task_done()
                     continue
                 
                 # 2. Latency / Jitter
-                if self._latency_max > 0:
-                    delay = random.uniform(self._latency_min, self._latency_max)
-                    await asyncio.sleep(delay)
+                await self._chaos_delay()
                 # -----------------------
 
                 if message.topic in self._subscribers:
-                    for handler in self._subscribers[message.topic]:
-                        # print(f"DEBUG: Delivering {message.topic} to handler")
-                        # print(f"DEBUG: Delivering {message.topic} to handler {handler}")
-                        try:
-                            if inspect.iscoroutinefunction(handler):
-                                await handler(message)
-                            else:
-                                handler(message)
-                        except Exception as e:
-                            logger.error(f"Error handling message on topic '{message.topic}': {e}")
-                            # Send to DLQ with Limit
-                            if len(self._dlq) >= self._dlq_limit:
-                                self._dlq.pop(0) # Remove oldest
-                            self._dlq.append(message)
+                    for handler in self._handlers_for(message):
+                        await self._invoke(handler, message, published_at)
                 
                 self._queue.task_done()
             except asyncio.CancelledError:
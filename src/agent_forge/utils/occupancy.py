@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional, Set, Tuple
+
+Position = Tuple[int, int]
+
+
+class OccupancyIndex(dict):
+    """
+    agent_id -> state dict mapping that also maintains a position -> agent_ids index.
+
+    Drop-in for the plain `agents` dict of the warehouse environments: every
+    assignment (`agents[agent_id] = state`) re-indexes that agent, so
+    "is this cell occupied" is an O(1) lookup instead of a scan over all agents.
+    Environments already write the state back after each step, which keeps the
+    index current; code that mutates a state's position in place should call
+    reindex() afterwards.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._cells: Dict[Position, Set[str]] = {}
+        self._positions: Dict[str, Position] = {}
+        self.update(*args, **kwargs)
+
+    def _unplace(self, agent_id: str):
+        pos = self._positions.pop(agent_id, None)
+        if pos is not None:
+            cell = self._cells.get(pos)
+            if cell:
+                cell.discard(agent_id)
+                if not cell:
+                    del self._cells[pos]
+
+    def _place(self, agent_id: str, state: Any):
+        self._unplace(agent_id)
+        pos = state.get("position") if isinstance(state, dict) else None
+        if pos is not None:
+            pos = tuple(pos)
+            self._positions[agent_id] = pos
+            self._cells.setdefault(pos, set()).add(agent_id)
+
+    def __setitem__(self, agent_id: str, state: Any):
+        super().__setitem__(agent_id, state)
+        self._place(agent_id, state)
+
+    def __delitem__(self, agent_id: str):
+        super().__delitem__(agent_id)
+        self._unplace(agent_id)
+
+    def pop(self, agent_id: str, *default):
+        self._unplace(agent_id)
+        return super().pop(agent_id, *default)
+
+    def update(self, *args, **kwargs):
+        for agent_id, state in dict(*args, **kwargs).items():
+            self[agent_id] = state
+
+    def setdefault(self, agent_id: str, default: Any = None):
+        if agent_id not in self:
+            self[agent_id] = default
+        return self[agent_id]
+
+    def clear(self):
+        super().clear()
+        self._cells.clear()
+        self._positions.clear()
+
+    def reindex(self, agent_id: Optional[str] = None):
+        """Re-reads positions from the state dicts (one agent, or all)."""
+        if agent_id is not None:
+            self._place(agent_id, self[agent_id])
+            return
+        self._cells.clear()
+        self._positions.clear()
+        for aid, state in self.items():
+            self._place(aid, state)
+
+    def agents_at(self, pos: Position) -> Set[str]:
+        """Returns the ids of agents whose indexed position is `pos`."""
+        return set(self._cells.get(tuple(pos), ()))
+
+    def is_occupied(self, pos: Position, exclude_agent: Optional[str] = None) -> bool:
+        """O(1) check whether any agent other than `exclude_agent` is at `pos`."""
+        # Agents ask from the event loop while env.step may be editing the cell on a
+        # step thread: take one copy (a single C call under the GIL), never iterate the live set
+        cell = frozenset(self._cells.get(tuple(pos), ()))
+        return len(cell) > 1 or (bool(cell) and exclude_agent not in cell)
@@ -2,8 +2,8 @@ import pytest
 import asyncio
 import time
 import statistics
-from utils.message_bus import MessageBus, Message
-from agents.base_agent import BaseAgent
+from agent_forge.utils.message_bus import MessageBus, Message
+from agent_forge.agents.base_agent import BaseAgent
 
 # Configure test parameters
 NUM_SENDERS = 20
@@ -133,3 +133,30 @@ async def test_high_load_stress():
     for s in senders:
         await s.stop()
     await bus.stop()
+
+
+async def _publish_throughput(fast_path: bool, count: int = 20000) -> float:
+    """messages/sec for a registered sender publishing to one subscriber (no audit file I/O)."""
+    bus = MessageBus(log_path=None, max_queue_size=count, fast_path=fast_path)
+    token = bus.register("sender")
+    received = []
+    bus.subscribe("stress_test", received.append)
+    await bus.start()
+
+    start = time.perf_counter()
+    for i in range(count):
+        await bus.publish("stress_test", "sender", i, receiver="sink", auth_token=token)
+    await bus.drain()
+    elapsed = time.perf_counter() - start
+
+    await bus.stop()
+    assert len(received) == count
+    return count / elapsed
+
+
+@pytest.mark.asyncio
+async def test_fast_path_throughput():
+    """Trusted publishers skip uuid4() and re-validation. Reports both rates; delivery is what's asserted."""
+    edge = await _publish_throughput(fast_path=False)
+    fast = await _publish_throughput(fast_path=True)
+    print(f"\nEdge path: {edge:.0f} msgs/sec | Fast path: {fast:.0f} msgs/sec ({fast / edge:.2f}x)")
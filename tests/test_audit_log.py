@@ -0,0 +1,96 @@
+import pytest
+import asyncio
+import gzip
+import json
+import os
+from agent_forge.utils.audit_log import AuditLogWriter, iter_audit_lines
+from agent_forge.utils.message_bus import MessageBus
+
+
+@pytest.mark.asyncio
+async def test_batched_background_writes(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditLogWriter(path, batch_size=1000, flush_interval=3600)
+    for i in range(10):
+        writer.write({"i": i})
+    await asyncio.sleep(0)
+    assert not os.path.exists(path) or os.path.getsize(path) == 0
+
+    await writer.flush()
+    assert [json.loads(l)["i"] for l in iter_audit_lines(path)] == list(range(10))
+    assert writer.batches_written == 1
+    await writer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+async def test_size_rotation_reads_back_in_order(tmp_path, compress):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditLogWriter(path, batch_size=10, max_bytes=300, compress=compress)
+    for i in range(100):
+        writer.write({"seq": i, "pad": "x" * 10})
+        if i % 10 == 9:
+            await writer.flush()
+    await writer.close()
+
+    assert writer.rotations > 0
+    segments = sorted(p for p in os.listdir(tmp_path) if p != "audit.jsonl")
+    assert all(p.endswith(".gz") == compress for p in segments)
+    assert [json.loads(l)["seq"] for l in iter_audit_lines(path)] == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_time_rotation(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditLogWriter(path, rotate_interval=0.0)
+    writer.write({"a": 1})
+    await writer.flush()
+    writer.write({"a": 2})
+    await writer.flush()
+    await writer.close()
+    assert os.path.exists(path + ".000001")
+    assert [json.loads(l)["a"] for l in iter_audit_lines(path)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_bus_audit_flushed_on_stop(tmp_path):
+    path = str(tmp_path / "bus.jsonl")
+    bus = MessageBus(log_path=path)
+    bus.subscribe("t", lambda m: None)
+    await bus.start()
+    for i in range(50):
+        await bus.publish("t", "system", i)
+    await bus.drain()
+    await bus.stop()
+    records = [json.loads(l) for l in iter_audit_lines(path)]
+    assert [r["payload"] for r in records] == list(range(50))
+
+
+def test_writer_survives_a_new_event_loop(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    writer = AuditLogWriter(path, batch_size=1000, flush_interval=0.01)
+
+    async def session(start):
+        for i in range(start, start + 5):
+            writer.write({"i": i})
+        await asyncio.sleep(0.05) # background task flushes on this loop
+        task = writer._task
+        await writer.stop()
+        assert task.done() and writer._task is None
+
+    asyncio.run(session(0))
+    asyncio.run(session(5))
+    assert [json.loads(l)["i"] for l in iter_audit_lines(path)] == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_rotation_age_counts_from_open_not_mtime(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    with open(path, "w") as f:
+        f.write('{"old": true}\n')
+    os.utime(path, (0, 0))
+    writer = AuditLogWriter(path, rotate_interval=3600)
+    writer.write({"a": 1})
+    await writer.flush()
+    await writer.close()
+    assert writer.rotations == 0
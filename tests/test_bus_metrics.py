@@ -0,0 +1,115 @@
+import pytest
+import asyncio
+import random
+from agent_forge.utils.bus_metrics import LatencyHistogram
+from agent_forge.utils.message_bus import MessageBus
+
+
+def test_histogram_percentiles_within_bucket_error():
+    hist = LatencyHistogram()
+    rng = random.Random(3)
+    samples = sorted(rng.uniform(0.0001, 0.5) for _ in range(5000))
+    for s in samples:
+        hist.record(s)
+
+    for p in (50, 90, 99):
+        exact = samples[int(len(samples) * p / 100) - 1]
+        assert abs(hist.percentile(p) - exact) / exact < 1 / hist.sub_buckets + 0.01
+    snap = hist.snapshot()
+    assert snap["count"] == 5000
+    assert snap["min"] == samples[0] and snap["max"] == samples[-1]
+    assert LatencyHistogram().snapshot() == {"count": 0}
+
+
+@pytest.mark.asyncio
+async def test_counters_and_latencies_per_topic():
+    bus = MessageBus(log_path=None)
+    await bus.start()
+    received = []
+
+    def failing(message):
+        raise ValueError("boom")
+
+    bus.subscribe("ok", received.append)
+    bus.subscribe("bad", failing)
+    for i in range(10):
+        await bus.publish("ok", "sender", i)
+    await bus.publish("bad", "sender", "x")
+    await bus._queue.join()
+
+    snap = bus.metrics_snapshot()
+    assert snap["topics"]["ok"] == {"published": 10, "delivered": 10, "dropped": 0, "dlq": 0}
+    assert snap["topics"]["bad"]["dlq"] == 1
+    assert snap["totals"]["published"] == 11
+    assert snap["publish_to_deliver"]["count"] == 11
+    assert snap["handlers"]["test_counters_and_latencies_per_topic.<locals>.failing"]["errors"] == 1
+    assert snap["queue_depth"] == 0 and snap["dlq_size"] == 1
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_chaos_and_overflow_drops_are_counted():
+    bus = MessageBus(log_path=None, dispatch="concurrent", inbox_size=1, overflow="drop")
+    await bus.start()
+    gate = asyncio.Event()
+
+    async def blocked(message):
+        await gate.wait()
+
+    bus.subscribe("t", blocked)
+    for i in range(5):
+        await bus.publish("t", "sender", i)
+    await bus._queue.join()
+    gate.set()
+    await bus.drain()
+
+    counters = bus.metrics_snapshot()["topics"]["t"]
+    assert counters["published"] == 5
+    assert counters["delivered"] + counters["dropped"] == 5
+    assert counters["dropped"] >= 3
+
+    bus.metrics.reset()
+    bus.set_chaos(drop_rate=1.0)
+    await bus.publish("t", "sender", "lost")
+    await bus._queue.join()
+    assert bus.metrics_snapshot()["topics"]["t"]["dropped"] == 1
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_session_bus_metrics_route():
+    from agent_forge.server.api import SessionManager, get_session_bus_metrics, session_manager
+    from fastapi import HTTPException
+
+    manager = SessionManager()
+    await manager.create_session("metrics")
+    await manager.control_session("metrics", "start", {"num_agents": 2, "grid_size": 10, "start_delay_max": 0})
+    session_manager.sessions["metrics"] = manager.sessions["metrics"]
+    try:
+        runner = manager.sessions["metrics"]
+        await runner.agents[0].send_message("ping", 1)
+        await runner.bus._queue.join()
+        snap = await get_session_bus_metrics("metrics")
+        assert snap["running"] and snap["topics"]["ping"]["published"] == 1
+        with pytest.raises(HTTPException):
+            await get_session_bus_metrics("missing")
+    finally:
+        session_manager.sessions.pop("metrics", None)
+        await manager.close_session("metrics")
+
+
+@pytest.mark.asyncio
+async def test_tui_bus_screen_shows_live_runner():
+    pytest.importorskip("textual")
+    from agent_forge.core.runner import HeadlessRunner
+    from agent_forge.ui.app import EngramTUI
+
+    app = EngramTUI(runner=HeadlessRunner(), num_agents=2)
+    async with app.run_test() as pilot:
+        await app.runner.agents[0].send_message("ping", 1)
+        await app.runner.bus._queue.join()
+        await pilot.press("f6")
+        await pilot.pause()
+        assert type(app.screen).__name__ == "BusScreen"
+        assert app.screen.query_one("#topics-table").get_row_at(0)[0] == "ping"
+    assert not app.runner.is_running
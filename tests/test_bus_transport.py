@@ -0,0 +1,137 @@
+import pytest
+import asyncio
+import multiprocessing
+import os
+import pickle
+import tempfile
+from agent_forge.utils.message_bus import MessageBus
+from agent_forge.utils.bus_transport import BusHub, RemoteMessageBus, _encode_reply
+
+
+async def _worker(path: str, agent_id: str):
+    """Worker-process agent: answers every 'ping' addressed to it with a 'pong'."""
+    bus = RemoteMessageBus(path)
+    await bus.start()
+    token = bus.register(agent_id)
+    done = asyncio.Event()
+
+    class Agent:
+        def __init__(self):
+            self.agent_id = agent_id
+
+        async def receive_message(self, message):
+            if message.payload == "quit":
+                done.set()
+                return
+            await bus.publish("pong", agent_id, {"echo": message.payload, "pid": os.getpid()},
+                              parent_id=message.trace_id, auth_token=token)
+
+    agent = Agent()
+    bus.subscribe("ping", agent.receive_message)
+    await bus.publish("ready", agent_id, None, auth_token=token)
+    try:
+        await bus.publish("ready", agent_id, None, auth_token="forged")
+    except PermissionError:
+        await bus.publish("auth_rejected", agent_id, None, auth_token=token)
+    await asyncio.wait_for(done.wait(), 10)
+    await bus.stop()
+
+
+def worker_main(path: str, agent_id: str):
+    asyncio.run(_worker(path, agent_id))
+
+
+@pytest.mark.asyncio
+async def test_agents_in_worker_processes():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "bus.sock")
+    bus = MessageBus(log_path=None)
+    bus.register("controller")
+    hub = BusHub(bus, path)
+    await hub.start()
+    await bus.start()
+
+    events = {"ready": [], "pong": [], "auth_rejected": []}
+    for topic, received in events.items():
+        bus.subscribe(topic, received.append)
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=worker_main, args=(path, f"worker_{i}")) for i in range(2)]
+    for w in workers:
+        w.start()
+
+    async def wait_for(topic, count):
+        for _ in range(400):
+            if len(events[topic]) >= count:
+                return
+            await asyncio.sleep(0.05)
+        raise AssertionError(f"Timed out waiting for {count} '{topic}' messages")
+
+    await wait_for("ready", 2)
+    await wait_for("auth_rejected", 2)
+    await bus.publish("ping", "system", "directed", receiver="worker_1")
+    await bus.publish("ping", "system", "broadcast")
+    await wait_for("pong", 3)
+
+    pongs = sorted((m.sender, m.payload["echo"]) for m in events["pong"])
+    assert pongs == [("worker_0", "broadcast"), ("worker_1", "broadcast"), ("worker_1", "directed")]
+    assert all(m.payload["pid"] != os.getpid() for m in events["pong"])
+
+    await bus.publish("ping", "system", "quit")
+    for w in workers:
+        await asyncio.to_thread(w.join, 10)
+        assert w.exitcode == 0
+    await bus.stop()
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_hub_mints_tokens_and_refuses_takeover():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "bus.sock")
+    bus = MessageBus(log_path=None)
+    controller_token = bus.register("controller")
+    hub = BusHub(bus, path)
+    await hub.start()
+    await bus.start()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    received = []
+    bus.subscribe("t", received.append)
+    intruder = RemoteMessageBus(path)
+    await intruder.start()
+    stolen = intruder.register("controller")
+    with pytest.raises(PermissionError):
+        await intruder.publish("t", "controller", "hijack", auth_token=stolen)
+    # The hub-side agent keeps its own token
+    await bus.publish("t", "controller", "mine", auth_token=controller_token)
+
+    worker_token = intruder.register("worker")
+    await intruder.publish("t", "worker", "hello", auth_token=worker_token)
+    await bus.drain()
+    assert [m.payload for m in received] == ["mine", "hello"]
+
+    # Disconnecting frees the worker's id for a new connection
+    await intruder.stop()
+    for _ in range(100):
+        if hub.connections == 0:
+            break
+        await asyncio.sleep(0.01)
+    again = RemoteMessageBus(path)
+    await again.start()
+    await again.publish("t", "worker", "back", auth_token=again.register("worker"))
+    await again.stop()
+    await bus.stop()
+    await hub.stop()
+
+
+def test_unpicklable_reply_error_is_sent_as_text():
+    class Unpicklable(Exception):
+        def __init__(self):
+            super().__init__("boom")
+            self.callback = lambda: None
+
+    frame = _encode_reply(7, Unpicklable())
+    kind, req_id, error = pickle.loads(frame[4:])
+    assert (kind, req_id) == ("reply", 7)
+    assert isinstance(error, RuntimeError) and "boom" in str(error)
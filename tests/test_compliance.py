@@ -6,7 +6,9 @@ import os
 sys.path.append(os.getcwd())
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 
-from agent_forge.core.compliance import ComplianceAuditor, Violation
+import random
+import numpy as np
+from agent_forge.core.compliance import ComplianceAuditor, Violation, Rule
 
 class TestCompliance(unittest.TestCase):
     
@@ -57,5 +59,50 @@ class TestCompliance(unittest.TestCase):
         print(f"Violations: {violations}")
         self.assertEqual(len(violations), 0, "Zero battery should be valid (dead)")
 
+    def test_batch_matches_per_agent_audit(self):
+        """Vectorized batch audit reports exactly what audit_state would."""
+        rng = random.Random(7)
+        states = {
+            f"agent_{i}": {"position": (rng.randint(-2, 11), rng.randint(-2, 11)), "battery": rng.uniform(-5, 100)}
+            for i in range(200)
+        }
+        states["agent_no_pos"] = {"battery": 50.0}
+        expected = {aid: [(v.rule_id, v.message) for v in ComplianceAuditor(grid_size=10).audit_state(aid, st)]
+                    for aid, st in states.items()}
+        batch = self.auditor.audit_batch(states)
+        self.assertEqual({aid: [(v.rule_id, v.message) for v in vs] for aid, vs in batch.items()}, expected)
+
+    def test_audit_arrays(self):
+        """Column input: battery array and (N, 2) positions."""
+        result = self.auditor.audit_arrays(
+            ["a", "b", "c"],
+            {"battery": np.array([50.0, -1.0, 80.0]), "position": np.array([[1, 1], [2, 2], [10, 0]])}
+        )
+        self.assertEqual(result["a"], [])
+        self.assertEqual(result["b"][0].rule_id, "PHYSICS_BATTERY_NEGATIVE")
+        self.assertEqual([v.rule_id for v in result["c"]], ["BOUNDARY_OUT_OF_BOUNDS"])
+
+    def test_grid_size_and_rules_are_recompiled(self):
+        self.auditor.grid_size = 20
+        self.assertEqual(self.auditor.audit_state("a", {"position": (15, 5), "battery": 50.0}), [])
+        self.auditor.set_rules([Rule("THERMAL_TOO_COLD", "temperature", "lt", -10.0, "critical", "Too cold: {value}")])
+        violations = self.auditor.audit_state("a", {"temperature": -20.0})
+        self.assertEqual([(v.rule_id, v.severity) for v in violations], [("THERMAL_TOO_COLD", "critical")])
+
+    def test_rule_fields_are_data_not_code(self):
+        field = "x', __import__('os')._exit(1)) or state.get('y"
+        self.auditor.set_rules([Rule("ODD_FIELD", field, "lt", 1.0)])
+        violations = self.auditor.audit_state("a", {field: 0.5})
+        self.assertEqual([v.rule_id for v in violations], ["ODD_FIELD"])
+
+    def test_violation_history_is_bounded_and_logging_rate_limited(self):
+        auditor = ComplianceAuditor(grid_size=10, max_violations=5, log_interval=60.0)
+        with self.assertLogs("Compliance", level="ERROR") as logs:
+            for _ in range(50):
+                auditor.audit_state("agent_oob", {"position": (10, 5), "battery": 50.0})
+        self.assertEqual(len(auditor.violations), 5)
+        self.assertEqual(auditor.violation_counts["BOUNDARY_OUT_OF_BOUNDS"], 50)
+        self.assertEqual(len(logs.output), 1)
+
 if __name__ == "__main__":
     unittest.main()
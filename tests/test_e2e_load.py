@@ -43,11 +43,9 @@ async def test_concurrent_sessions_and_latency():
             
         print(f">>> {num_sessions} Sessions Running (Total 25 Agents).")
         
-        # 3. Connect Monitor Client
-        # Note: Currently API broadcasts ALL sessions to ALL clients via same ConnectionManager
-        # So one client will receive updates from ALL 5 sessions.
-        uri = f"ws://{HOST}:{PORT}/ws/state"
-        
+        # 3. Connect Monitor Clients
+        # The legacy /ws/state feed only carries the default session, so
+        # watch each load session on its own stream.
         latencies = []
         messages_received = 0
         start_time = time.time()
@@ -55,24 +53,29 @@ async def test_concurrent_sessions_and_latency():
         process = psutil.Process()
         initial_memory = process.memory_info().rss / 1024 / 1024 # MB
         
+        async def monitor(sid):
+            nonlocal messages_received
+            uri = f"ws://{HOST}:{PORT}/ws/state/{sid}"
+            async with websockets.connect(uri) as ws:
+                while time.time() - start_time < 5.0:
+                    try:
+                        msg_str = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        msg = json.loads(msg_str)
+                        
+                        # Latency Calc: Now - Event Timestamp
+                        # Note: engine uses time.time(). We are local, so diff is valid.
+                        if "timestamp" in msg:
+                            event_ts = msg["timestamp"]
+                            now = time.time()
+                            latency_ms = (now - event_ts) * 1000
+                            latencies.append(latency_ms)
+                        
+                        messages_received += 1
+                    except asyncio.TimeoutError:
+                        pass
+        
         print(">>> Measuring Latency & Throughput for 5 seconds...")
-        async with websockets.connect(uri) as ws:
-            while time.time() - start_time < 5.0:
-                try:
-                    msg_str = await asyncio.wait_for(ws.recv(), timeout=1.0)
-                    msg = json.loads(msg_str)
-                    
-                    # Latency Calc: Now - Event Timestamp
-                    # Note: engine uses time.time(). We are local, so diff is valid.
-                    if "timestamp" in msg:
-                        event_ts = msg["timestamp"]
-                        now = time.time()
-                        latency_ms = (now - event_ts) * 1000
-                        latencies.append(latency_ms)
-                    
-                    messages_received += 1
-                except asyncio.TimeoutError:
-                    pass
+        await asyncio.gather(*(monitor(sid) for sid in session_ids))
         
         final_memory = process.memory_info().rss / 1024 / 1024 # MB
         duration = time.time() - start_time
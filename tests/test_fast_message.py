@@ -0,0 +1,95 @@
+import pytest
+import asyncio
+import json
+import uuid
+import os
+import subprocess
+import sys
+from agent_forge.utils import message_bus
+from agent_forge.utils.message_bus import MessageBus, Message, FastMessage
+
+
+@pytest.mark.asyncio
+async def test_registered_sender_gets_fast_message(tmp_path):
+    log_path = tmp_path / "bus.jsonl"
+    bus = MessageBus(log_path=str(log_path), fast_path=True)
+    token = bus.register("agent_1")
+    received = []
+    bus.subscribe("t", received.append)
+    await bus.start()
+
+    await bus.publish("t", "agent_1", {"x": 1}, receiver="agent_2", auth_token=token)
+    await bus.publish("t", "system", "edge")
+    await bus.drain()
+
+    fast, edge = received
+    assert isinstance(fast, FastMessage) and isinstance(edge, Message)
+    # Same field types as Message
+    uuid.UUID(fast.trace_id)
+    assert isinstance(fast.timestamp, str) and isinstance(edge.timestamp, str)
+    assert not hasattr(fast, "__dict__")
+
+    # Audit log keeps one record shape for both kinds
+    await bus.stop()
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert set(records[0]) == set(records[1])
+    assert records[0]["trace_id"] == fast.trace_id
+
+
+@pytest.mark.asyncio
+async def test_fast_path_is_opt_in():
+    bus = MessageBus(log_path=None)
+    token = bus.register("agent_1")
+    received = []
+    bus.subscribe("t", received.append)
+    await bus.start()
+    await bus.publish("t", "agent_1", 1, auth_token=token)
+    await bus.drain()
+    assert type(received[0]) is Message
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_trace_ids_are_monotonic_and_propagate():
+    bus = MessageBus(log_path=None, fast_path=True)
+    token = bus.register("a")
+    received = []
+    bus.subscribe("t", received.append)
+    await bus.start()
+
+    await bus.publish("t", "a", 1, auth_token=token)
+    await bus.publish("t", "a", 2, auth_token=token)
+    await bus.drain()
+    first, second = received
+    assert second.trace_id > first.trace_id
+
+    # A reply keeps the conversation's trace id; edge Messages accept it too
+    await bus.publish("t", "a", 3, trace_id=first.trace_id, parent_id=second.trace_id, auth_token=token)
+    await bus.publish("t", "system", 4, trace_id=first.trace_id, parent_id=second.trace_id)
+    await bus.drain()
+    assert received[2].trace_id == received[3].trace_id == first.trace_id
+    await bus.stop()
+
+
+def test_trace_ids_differ_across_processes():
+    before = FastMessage("t", "s", None).trace_id
+    message_bus._reseed_trace_ids() # what a forked worker runs
+    after = FastMessage("t", "s", None).trace_id
+    assert before[:24] != after[:24]
+
+
+def test_bus_imports_without_fork_hooks():
+    # Windows has no os.register_at_fork
+    code = ("import importlib, os; from agent_forge.utils import message_bus; "
+            "del os.register_at_fork; importlib.reload(message_bus)")
+    result = subprocess.run([sys.executable, "-c", code], env=dict(os.environ), capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_message_types_still_validated():
+    with pytest.raises(ValueError):
+        Message(topic="t", sender="s", payload=None, trace_id="not-a-uuid")
+    with pytest.raises(ValueError):
+        Message(topic="t", sender="s", payload=None, message_type="gossip")
+    with pytest.raises(ValueError):
+        FastMessage("t", "s", None, message_type="gossip")
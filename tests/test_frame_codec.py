@@ -0,0 +1,110 @@
+import pytest
+import asyncio
+import json
+from agent_forge.server.api import ConnectionManager
+from agent_forge.server.frame_codec import encode_frame, decode_frame, UnsupportedFrame
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.text = []
+        self.binary = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        self.text.append(json.dumps(data))
+
+    async def send_text(self, text):
+        self.text.append(text)
+
+    async def send_bytes(self, data):
+        self.binary.append(data)
+
+
+def _delta(seq, agents, events=()):
+    return {"type": "delta", "seq_id": seq, "agents": agents, "events": list(events), "timestamp": 12.5}
+
+
+def test_round_trip():
+    frame = _delta(7, {
+        "Agent-0": {"position": [3, 4], "battery": 87.5, "carrying": "package"},
+        "Agent-1": {"carrying": None},
+        "Agent-2": {"battery": 12.3}
+    }, [{"agent_id": "Agent-0", "event": "blocked"}])
+    frame["from_seq"] = 5
+
+    decoded = decode_frame(encode_frame(frame))
+    assert decoded["type"] == "delta"
+    assert decoded["seq_id"] == 7 and decoded["from_seq"] == 5
+    assert decoded["agents"]["Agent-0"] == {"position": [3, 4], "battery": 87.5, "carrying": "package"}
+    assert decoded["agents"]["Agent-1"] == {"carrying": None}
+    assert decoded["agents"]["Agent-2"]["battery"] == pytest.approx(12.3, abs=1e-3)
+    assert decoded["events"] == frame["events"]
+    assert decoded["timestamp"] == 12.5
+
+
+def test_binary_is_smaller_than_json():
+    agents = {f"Agent-{i}": {"position": [i % 100, i // 100], "battery": 50.5} for i in range(1000)}
+    frame = _delta(1, agents)
+    assert len(encode_frame(frame)) < len(json.dumps(frame, separators=(",", ":")).encode()) * 0.7
+
+
+@pytest.mark.parametrize("agents", [
+    {"a": {"state": [1, 2]}},
+    {"a": {"position": [1.5, 2]}},
+    {"a": {"position": [1, 2, 3]}},
+])
+def test_unsupported_frames_raise(agents):
+    with pytest.raises(UnsupportedFrame):
+        encode_frame(_delta(1, agents))
+
+
+@pytest.mark.asyncio
+async def test_frame_encoded_once_and_shared():
+    manager = ConnectionManager(frame_rate=50.0, keyframe_interval=None)
+    clients = [RecordingWebSocket() for _ in range(3)]
+    await manager.connect(clients[0], encoding="binary")
+    await manager.connect(clients[1], encoding="binary")
+    await manager.connect(clients[2], encoding="json")
+
+    await manager.broadcast(_delta(1, {"a": {"position": [0, 0]}}))
+    await asyncio.sleep(0.05) # Keyframe slot
+    await manager.broadcast(_delta(2, {"a": {"position": [1, 0]}}))
+    await asyncio.sleep(0.05)
+
+    # Binary clients get the very same bytes object; the JSON client gets text
+    assert clients[0].binary[-1] is clients[1].binary[-1]
+    assert decode_frame(clients[0].binary[-1])["agents"] == {"a": {"position": [1, 0]}}
+    assert json.loads(clients[2].text[-1])["agents"] == {"a": {"position": [1, 0]}}
+
+    # Frames the binary layout can't carry fall back to JSON text
+    await manager.broadcast(_delta(3, {"a": {"state": "custom"}}))
+    await asyncio.sleep(0.05)
+    assert json.loads(clients[0].text[-1])["agents"] == {"a": {"state": "custom"}}
+    for ws in clients:
+        manager.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_lagging_client_resyncs_with_keyframe():
+    manager = ConnectionManager(frame_rate=50.0, keyframe_interval=None)
+    ws = RecordingWebSocket()
+    await manager.connect(ws, encoding="binary")
+    client = manager.connections[ws]
+    client.task.cancel() # Stop draining: the outbox fills up
+    await asyncio.sleep(0)
+
+    for seq in range(1, 150):
+        await manager.broadcast(_delta(seq, {"a": {"position": [seq, 0]}}))
+        manager.publish_frame()
+    assert client.needs_keyframe
+
+    while not client.queue.empty():
+        client.queue.get_nowait()
+    manager.publish_frame()
+    frame = client.queue.get_nowait().frame
+    assert frame["type"] == "keyframe"
+    assert frame["agents"] == {"a": {"position": [149, 0]}}
+    manager.disconnect(ws)
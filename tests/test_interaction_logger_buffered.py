@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import time
+import gc
+import weakref
+
+# Path Setup
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from agent_forge.utils.interaction_logger import InteractionLogger
+
+
+class TestBufferedInteractionLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "logs.db")
+        self.log_file = os.path.join(self.tmp.name, "events.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _row_count(self):
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+        conn.close()
+        return count
+
+    def test_rows_held_until_threshold(self):
+        logger = InteractionLogger(self.db_path, self.log_file, buffered=True, flush_rows=10, flush_interval=3600)
+        for i in range(9):
+            logger.log_interaction(f"A{i}", "MOVE", {"step": i}, 1.0, {"i": i})
+        self.assertEqual(self._row_count(), 0)
+
+        logger.log_interaction("A9", "MOVE", {"step": 9}, 1.0)
+        self.assertEqual(self._row_count(), 10)
+        logger.close()
+
+        with open(self.log_file) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e["agent_id"] for e in entries], [f"A{i}" for i in range(10)])
+        self.assertEqual(entries[3]["state"], {"step": 3})
+
+    def test_idle_rows_flushed_by_timer(self):
+        logger = InteractionLogger(self.db_path, self.log_file, buffered=True, flush_rows=1000, flush_interval=0.05)
+        logger.log_interaction("A", "MOVE", None, 0.0)
+        deadline = time.time() + 2
+        while self._row_count() == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self._row_count(), 1)
+        logger.close()
+
+    def test_dropped_logger_is_flushed_and_released(self):
+        logger = InteractionLogger(self.db_path, self.log_file, buffered=True, flush_rows=1000, flush_interval=3600)
+        logger.log_interaction("A", "MOVE", None, 0.0)
+        ref = weakref.ref(logger)
+        del logger
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(self._row_count(), 1)
+
+    def test_flush_and_close(self):
+        logger = InteractionLogger(self.db_path, self.log_file, buffered=True, flush_rows=1000, flush_interval=3600)
+        logger.log_interactions([
+            {"agent_id": "A", "action": "UP", "state": (0, 1), "reward": 0.5},
+            {"agent_id": "B", "action": "DOWN", "state": (1, 0), "reward": -0.5, "metadata": {"x": 1}},
+        ])
+        logger.flush()
+        self.assertEqual(self._row_count(), 2)
+
+        logger.log_interaction("C", "WAIT", None, 0.0)
+        # Reads flush first
+        self.assertEqual(len(logger.get_logs()), 3)
+        logger.close()
+        logger.close()
+
+    def test_matches_unbuffered_rows(self):
+        plain_db = os.path.join(self.tmp.name, "plain.db")
+        plain = InteractionLogger(plain_db, os.path.join(self.tmp.name, "plain.jsonl"))
+        buffered = InteractionLogger(self.db_path, self.log_file, buffered=True, flush_interval=0.0)
+        for logger in (plain, buffered):
+            logger.log_interaction("A", "MOVE", {"pos": [1, 2]}, 2.0, {"k": "v"}, state_hash="abc")
+        buffered.close()
+
+        def strip(rows):
+            return [row[2:] for row in rows] # drop id, timestamp
+        self.assertEqual(strip(plain.get_logs()), strip(buffered.get_logs()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+from agent_forge.core.justice_audit import merkle_root
+from agent_forge.core.justice_log import JusticeLogger
+
+
+def _fill(logger, count):
+    for i in range(count):
+        logger.log("EVENT", "agent", {"n": i})
+
+
+def _tamper(path, index):
+    with open(path) as f:
+        lines = f.readlines()
+    entry = json.loads(lines[index])
+    entry["data"]["n"] = -1
+    lines[index] = json.dumps(entry) + "\n"
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+def test_parallel_full_audit_matches_sequential(tmp_path):
+    logger = JusticeLogger(str(tmp_path / "log.jsonl"), segment_size=10, checkpoint_interval=0)
+    _fill(logger, 45)
+    parallel = logger.verify_integrity(full=True, workers=2)
+    sequential = JusticeLogger(str(tmp_path / "log.jsonl"), segment_size=10).verify_integrity(full=True, workers=1)
+    assert parallel["valid"] and sequential["valid"]
+    assert parallel["merkle_root"] == sequential["merkle_root"]
+    assert parallel["total_entries"] == 45
+
+
+def test_verification_resumes_from_checkpoint(tmp_path):
+    logger = JusticeLogger(str(tmp_path / "log.jsonl"), segment_size=10, checkpoint_interval=20)
+    _fill(logger, 25)
+    logger.wait_for_checkpoint()
+    assert logger.auditor.checkpoint["index"] == 20
+    assert len(logger.auditor.checkpoint["leaves"]) == 2
+
+    result = logger.verify_integrity()
+    assert result["valid"] and result["verified_from"] == 20
+    assert logger.auditor.checkpoint["index"] == 25
+
+    # A fresh logger picks the checkpoint up from disk
+    _fill(logger, 12)
+    logger.close()
+    reopened = JusticeLogger(str(tmp_path / "log.jsonl"), segment_size=10, checkpoint_interval=0)
+    result = reopened.verify_integrity()
+    assert result["valid"] and result["verified_from"] == 25
+    assert len(reopened.auditor.checkpoint["leaves"]) == 3
+    full = reopened.verify_integrity(full=True, workers=1)
+    assert full["merkle_root"] == result["merkle_root"] == merkle_root(reopened.auditor.checkpoint["leaves"])
+
+
+def test_tail_tampering_is_detected_incrementally(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    logger = JusticeLogger(path, segment_size=10, checkpoint_interval=10)
+    _fill(logger, 15)
+    logger.close()
+    _tamper(path, 12)
+    result = JusticeLogger(path, segment_size=10).verify_integrity()
+    assert not result["valid"] and result["failed_at_index"] == 12
+
+
+def test_full_audit_catches_tampering_behind_checkpoint(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    logger = JusticeLogger(path, segment_size=10, checkpoint_interval=10)
+    _fill(logger, 30)
+    logger.close()
+    _tamper(path, 4)
+
+    reopened = JusticeLogger(path, segment_size=10)
+    assert reopened.verify_integrity()["valid"] # covered by the checkpoint, tail is intact
+    result = reopened.verify_integrity(full=True, workers=2)
+    assert not result["valid"] and result["failed_at_index"] == 4
+
+
+def test_forged_checkpoint_is_ignored(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    logger = JusticeLogger(path, segment_size=10, checkpoint_interval=10)
+    _fill(logger, 10)
+    logger.wait_for_checkpoint()
+    with open(path + ".ckpt", "a") as f:
+        f.write(json.dumps({"index": 10, "chain_hash": "x", "segment_size": 10, "leaves": [], "mac": "0" * 64}) + "\n")
+    logger.close()
+
+    reopened = JusticeLogger(path, segment_size=10)
+    assert reopened.auditor.checkpoint["chain_hash"] == reopened.chain[9].signature
+    assert reopened.verify_integrity()["valid"]
+
+
+def test_periodic_checkpoint_runs_off_the_append_path(tmp_path):
+    import threading
+    logger = JusticeLogger(str(tmp_path / "log.jsonl"), segment_size=10, checkpoint_interval=10)
+    verify, threads = logger.auditor.verify, []
+
+    def recording_verify(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return verify(*args, **kwargs)
+
+    logger.auditor.verify = recording_verify
+    _fill(logger, 10)
+    logger.wait_for_checkpoint()
+    assert threads and threading.current_thread() not in threads
+    assert logger.auditor.checkpoint["index"] == 10
+    logger.close()
+
+
+def test_read_only_verification_writes_nothing(tmp_path):
+    import os
+    path = str(tmp_path / "log.jsonl")
+    logger = JusticeLogger(path, segment_size=10, checkpoint_interval=0)
+    _fill(logger, 15)
+    logger.close()
+
+    reader = JusticeLogger(path, segment_size=10, readonly=True)
+    assert reader.verify_integrity()["valid"]
+    assert reader.verify_integrity(full=True, workers=1)["valid"]
+    reader.close()
+    assert not os.path.exists(path + ".ckpt") and not os.path.exists(path + ".key")
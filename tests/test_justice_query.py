@@ -0,0 +1,107 @@
+import pytest
+import hashlib
+import json
+import os
+from agent_forge.core.justice_audit import entry_hash
+from agent_forge.core.justice_log import JusticeLogger
+from agent_forge.core.ontology import Agent, Asset, Goal, GovernanceStandard
+from agent_forge.core.risk import RiskMonitor
+from agent_forge.forensics.dossier import DossierGenerator
+
+
+def _populate(logger):
+    for i in range(30):
+        logger.log("STEP" if i % 3 else "RISK_EVENT", f"bot-{i % 2}", {"agent_id": f"bot-{i % 2}", "n": i})
+
+
+def test_filters_by_event_type_agent_and_time(tmp_path):
+    logger = JusticeLogger(str(tmp_path / "log.jsonl"))
+    _populate(logger)
+    everything = list(logger.chain)
+
+    risks = logger.query(event_type="RISK_EVENT")
+    assert [e.data["n"] for e in risks] == list(range(0, 30, 3))
+    assert [e.data["n"] for e in logger.query(event_type="RISK_EVENT", agent_id="bot-1")] == [3, 9, 15, 21, 27]
+    assert logger.count(agent_id="bot-0") == 15
+    assert logger.query(event_type="NOPE") == [] and logger.count(agent_id="ghost") == 0
+
+    window = logger.query(start_time=everything[10].timestamp, end_time=everything[20].timestamp)
+    assert [e.data["n"] for e in window] == list(range(10, 20))
+
+    page = logger.query(event_type="STEP", limit=3, offset=2, newest_first=True)
+    assert [e.data["n"] for e in page] == [26, 25, 23]
+    assert sorted(logger.event_types()) == ["RISK_EVENT", "STEP"]
+    assert sorted(logger.agents()) == ["bot-0", "bot-1"]
+    logger.close()
+
+
+def test_indexes_persist_and_rebuild(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    logger = JusticeLogger(path)
+    _populate(logger)
+    logger.close()
+
+    assert JusticeLogger(path).count(event_type="RISK_EVENT", agent_id="bot-0") == 5
+    os.remove(path + ".attr")
+    os.remove(path + ".keys")
+    rebuilt = JusticeLogger(path)
+    assert rebuilt.count(event_type="RISK_EVENT", agent_id="bot-0") == 5
+    rebuilt.close()
+
+
+def test_agent_index_comes_from_signed_data_and_hash_format_is_unchanged(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    data = {"agent_id": "legacy-bot", "n": 1}
+    signature = hashlib.sha256(f"STEP_1|1.5|GENESIS|{json.dumps(data, sort_keys=True)}".encode()).hexdigest()
+    assert entry_hash("STEP_1", 1.5, "GENESIS", data) == signature
+    with open(path, "w") as f:
+        f.write(json.dumps({"entry_id": "STEP_1", "timestamp": 1.5, "previous_hash": "GENESIS",
+                            "data": data, "signature": signature}) + "\n")
+
+    logger = JusticeLogger(path)
+    logger.log("STEP", "new-bot", {"agent_id": "new-bot", "n": 2})
+    logger.log("STEP", "unsigned-bot", {"n": 3})
+    assert logger.verify_integrity(full=True, workers=1)["valid"]
+    assert [e.entry_id for e in logger.query(agent_id="legacy-bot")] == ["STEP_1"]
+    assert logger.query(agent_id="new-bot")[0].data["n"] == 2
+    # Only the signed data attributes an entry to an agent
+    assert logger.count(agent_id="unsigned-bot") == 0
+    logger.close()
+
+
+def test_dossier_pulls_recorded_risk_events(tmp_path):
+    logger = JusticeLogger(str(tmp_path / "log.jsonl"))
+    monitor = RiskMonitor(latency_threshold=0.1, justice_log=logger)
+    monitor.record_violations("bot-1", [{"rule": "BATTERY_NEGATIVE", "step_duration": 0.5}])
+    monitor.record_violations("bot-2", [{"rule": "BOUNDARY", "step_duration": 0.0}])
+    logger.log("STEP", "bot-1", {"noise": True})
+
+    dossier = DossierGenerator(Agent(id="bot-1", type="Logistics-Bot", version="1.0"),
+                               [Asset(id="a", type="Inventory-Item", valuation_usd=1000.0)],
+                               [Goal(id="g", description="deliver", criticality=5, impact_description="late")],
+                               GovernanceStandard(name="std", version="1", rules=[]))
+    assert dossier.load_from_justice_log(logger) == 1
+    anchors = dossier.incidents[0]["evidence_anchors"]
+    assert anchors[-1]["signal_type"] == "JUSTICE_LOG_ENTRY"
+    assert anchors[-1]["measured_value"].startswith("RISK_EVENT_")
+    logger.close()
+
+
+@pytest.mark.asyncio
+async def test_runner_records_risk_events_for_the_incident_view(tmp_path):
+    from agent_forge.core.runner import HeadlessRunner
+    from agent_forge.ui.data_bridge import SimulationDataBridge
+
+    path = str(tmp_path / "log.jsonl")
+    runner = HeadlessRunner()
+    await runner.setup(num_agents=1, config={"justice_log": path})
+    try:
+        runner.engine.risk_monitor.record_violations("Agent-0", [{"rule": "BATTERY_LOW", "step_duration": 0.0}])
+        SimulationDataBridge.attach_runner(runner)
+        incidents = SimulationDataBridge.get_incidents(agent_id="Agent-0")
+        assert len(incidents) == 1 and incidents[0]["incident_id"].startswith("RISK_EVENT_")
+    finally:
+        SimulationDataBridge.set_justice_log(None)
+        await runner.stop()
+        runner.justice_log.close()
+    assert JusticeLogger(path, readonly=True).count(event_type="RISK_EVENT", agent_id="Agent-0") == 1
@@ -0,0 +1,180 @@
+import json
+import os
+from agent_forge.core.justice_log import JusticeLogger
+from agent_forge.core.justice_store import ChainStore
+
+
+def _fill(logger, count):
+    return [logger.log("EVENT", "agent", {"n": i}) for i in range(count)]
+
+
+def test_lookup_and_pagination_read_from_disk(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path, segment_size=16)
+    entries = _fill(logger, 50)
+
+    assert len(logger.chain) == 50
+    assert logger.get_entry_by_id(entries[37].entry_id) == entries[37]
+    assert logger.get_entry_by_id("missing") is None
+    page = logger.get_entries(limit=10, offset=12)
+    assert [e.data["n"] for e in page] == list(range(12, 22))
+    assert logger.chain[-1] == entries[-1]
+    assert logger.verify_integrity()["valid"]
+    logger.close()
+
+
+def test_id_index_grows_past_initial_capacity(tmp_path):
+    store = ChainStore(str(tmp_path / "log.jsonl"), segment_size=256)
+    for i in range(3000):
+        store.append((json.dumps({"entry_id": f"e{i}"}) + "\n").encode(), f"e{i}")
+    assert store.find("e0") == 0 and store.find("e2999") == 2999
+    assert len(list(store.iter_range(250, 520))) == 270
+    store.close()
+
+
+def test_reopen_continues_chain_and_indexes_unindexed_tail(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path)
+    _fill(logger, 5)
+    logger.close()
+
+    # Lines appended by another writer (or lost index writes) get indexed on open
+    donor = JusticeLogger(str(tmp_path / "donor.jsonl"))
+    donor.last_hash = JusticeLogger(path).last_hash
+    extra = _fill(donor, 3)
+    donor.close()
+    with open(path, "a") as f:
+        for entry in extra:
+            f.write(json.dumps(entry.to_dict()) + "\n")
+
+    reopened = JusticeLogger(path)
+    assert len(reopened.chain) == 8
+    assert reopened.get_entry_by_id(extra[1].entry_id) == extra[1]
+    reopened.log("EVENT", "agent", {"n": "after"})
+    assert reopened.verify_integrity()["valid"]
+    reopened.close()
+
+
+def test_indexes_are_rebuilt_if_log_was_replaced(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path)
+    entries = _fill(logger, 10)
+    logger.close()
+    with open(path, "w") as f:
+        for entry in entries[:4]:
+            f.write(json.dumps(entry.to_dict()) + "\n")
+
+    reopened = JusticeLogger(path)
+    assert len(reopened.chain) == 4
+    assert reopened.get_entry_by_id(entries[6].entry_id) is None
+    reopened.close()
+
+
+def test_verify_detects_tampering_on_disk(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path)
+    _fill(logger, 6)
+    logger.close()
+
+    with open(path) as f:
+        lines = f.readlines()
+    tampered = json.loads(lines[3])
+    tampered["data"]["n"] = 99
+    lines[3] = json.dumps(tampered) + "\n"
+    with open(path, "w") as f:
+        f.writelines(lines)
+    os.remove(path + ".idx")
+
+    result = JusticeLogger(path).verify_integrity()
+    assert not result["valid"] and result["failed_at_index"] == 3
+
+
+def _lines_on_disk(path):
+    with open(path) as f:
+        return [line for line in f if line.strip()]
+
+
+def test_appends_are_group_committed(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path, batch_size=10, flush_interval=60)
+    entries = _fill(logger, 9)
+    assert _lines_on_disk(path) == []
+    # Reads see buffered entries
+    assert logger.get_entry_by_id(entries[4].entry_id) == entries[4]
+
+    logger.log("EVENT", "agent", {"n": 9})
+    assert len(_lines_on_disk(path)) == 10
+    logger.log("EVENT", "agent", {"n": 10})
+    logger.flush()
+    assert len(_lines_on_disk(path)) == 11
+    logger.close()
+
+
+def test_flush_interval_writes_out_idle_batches(tmp_path):
+    import time
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path, batch_size=1000, flush_interval=0.05)
+    _fill(logger, 3)
+    deadline = time.time() + 2
+    while len(_lines_on_disk(path)) < 3 and time.time() < deadline:
+        time.sleep(0.02)
+    assert len(_lines_on_disk(path)) == 3
+    logger.close()
+
+
+def test_written_line_is_the_signed_serialization(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path, batch_size=1)
+    entry = logger.log("EVENT", "agent", {"b": [1, 2], "a": {"z": 1, "y": "é"}})
+    on_disk = json.loads(_lines_on_disk(path)[0])
+    assert on_disk == entry.to_dict()
+    assert logger._compute_hash(entry.entry_id, entry.timestamp, entry.previous_hash, on_disk["data"]) == entry.signature
+    logger.close()
+
+
+def test_concurrent_writers_keep_chain_order(tmp_path):
+    import threading
+    path = str(tmp_path / "justice_log.jsonl")
+    logger = JusticeLogger(path, batch_size=16)
+    threads = [threading.Thread(target=_fill, args=(logger, 200)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.close()
+
+    reopened = JusticeLogger(path)
+    assert len(reopened.chain) == 800
+    assert reopened.verify_integrity(full=True, workers=1)["valid"]
+
+
+def test_readonly_opener_never_writes_indexes(tmp_path):
+    path = str(tmp_path / "justice_log.jsonl")
+    writer = JusticeLogger(path, batch_size=1000, flush_interval=0)
+    entries = _fill(writer, 3)
+    writer.flush()
+    entries += [writer.log("EVENT", "late", {"agent_id": "late", "n": i}) for i in range(3)]
+    # The JSONL buffer spilled to disk before the indexes were committed
+    writer.store._data.flush()
+    side_files = [path + suffix for suffix in (".idx", ".ids", ".attr", ".keys")]
+    sizes = [os.path.getsize(p) for p in side_files]
+
+    reader = JusticeLogger(path, readonly=True)
+    assert len(reader.chain) == 6
+    assert reader.get_entry_by_id(entries[4].entry_id) == entries[4]
+    assert [e.data["n"] for e in reader.query(agent_id="late")] == [0, 1, 2]
+    assert reader.verify_integrity()["valid"]
+    assert [os.path.getsize(p) for p in side_files] == sizes
+    try:
+        reader.log("EVENT", "agent", {})
+        assert False, "read-only logger appended"
+    except PermissionError:
+        pass
+    reader.close()
+
+    writer.close()
+    reopened = JusticeLogger(path)
+    assert len(reopened.chain) == 6
+    assert reopened.get_entry_by_id(entries[5].entry_id) == entries[5]
+    reopened.close()
+    assert len(JusticeLogger(str(tmp_path / "missing.jsonl"), readonly=True).chain) == 0
@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+import sys
+import os
+
+# Path Setup
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from agent_forge.core.engine import SimulationEngine
+from agent_forge.envs.warehouse import WarehouseEnv
+
+
+class CountingWarehouseEnv(WarehouseEnv):
+    """WarehouseEnv that records how often each entry point is hit."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_calls = 0
+
+    def step_batch(self, actions):
+        self.batch_calls += 1
+        return super().step_batch(actions)
+
+
+class TestLockstepEngine(unittest.TestCase):
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def _make_engine(self, num_agents=3, **kwargs):
+        env = CountingWarehouseEnv(size=10, num_agents=num_agents)
+        engine = SimulationEngine(env=env, lockstep=True, **kwargs)
+        agent_ids = [f"Agent-{i}" for i in range(num_agents)]
+        for a_id in agent_ids:
+            env.get_agent_state(a_id)
+            engine.register_agent(a_id)
+        return env, engine, agent_ids
+
+    def test_tick_runs_one_batch(self):
+        """All registered agents' actions land in a single step_batch call."""
+        env, engine, agent_ids = self._make_engine()
+        updates = []
+        engine.on_step_callback = updates.append
+
+        async def tick():
+            return await asyncio.gather(*[
+                engine.perform_action(a_id, "CHARGE") for a_id in agent_ids
+            ])
+
+        results = self.run_async(tick())
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(env.batch_calls, 1)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0]["type"], "tick")
+        self.assertEqual(set(updates[0]["observations"]), set(agent_ids))
+
+    def test_per_agent_feedback(self):
+        """get_feedback returns each agent's own result in lockstep mode."""
+        env, engine, agent_ids = self._make_engine(num_agents=2)
+        env.agents["Agent-0"]["position"] = (0, 3)
+
+        async def tick():
+            await engine.step_tick({"Agent-0": "PICKUP", "Agent-1": "STAY"})
+            return (await engine.get_feedback("Agent-0"),
+                    await engine.get_feedback("Agent-1"))
+
+        fb0, fb1 = self.run_async(tick())
+        self.assertEqual(fb0["info"].get("event"), "picked_up")
+        self.assertNotIn("event", fb1["info"])
+
+    def test_tick_timeout_releases_stragglers(self):
+        """A partial tick runs once tick_timeout elapses."""
+        env, engine, agent_ids = self._make_engine(tick_timeout=0.05)
+
+        async def partial():
+            return await asyncio.wait_for(engine.perform_action("Agent-0", "STAY"), timeout=2.0)
+
+        self.assertTrue(self.run_async(partial()))
+        self.assertEqual(env.batch_calls, 1)
+
+    def test_dead_agent_leaves_barrier(self):
+        """An agent whose episode ends no longer holds up later ticks."""
+        env, engine, agent_ids = self._make_engine(num_agents=2)
+        engine.auditor.audit_state = lambda aid, state: []
+        env.agents["Agent-1"]["battery"] = 0.001
+
+        async def ticks():
+            first = await asyncio.gather(
+                engine.perform_action("Agent-0", "STAY"),
+                engine.perform_action("Agent-1", "STAY"),
+            )
+            second = await asyncio.wait_for(engine.perform_action("Agent-0", "STAY"), timeout=2.0)
+            return first, second
+
+        first, second = self.run_async(ticks())
+        self.assertEqual(first, [True, False])
+        self.assertTrue(second)
+        self.assertEqual(env.batch_calls, 2)
+
+    def test_failed_agent_leaves_barrier(self):
+        """An agent failing a critical audit doesn't hold up later ticks."""
+        env, engine, agent_ids = self._make_engine(num_agents=2)
+        env.agents["Agent-1"]["battery"] = -5.0
+
+        async def ticks():
+            first = await asyncio.gather(
+                engine.perform_action("Agent-0", "CHARGE"),
+                engine.perform_action("Agent-1", "STAY"),
+            )
+            engine.resume()
+            second = await asyncio.wait_for(engine.perform_action("Agent-0", "CHARGE"), timeout=2.0)
+            return first, second
+
+        first, second = self.run_async(ticks())
+        self.assertEqual(first, [True, False])
+        self.assertTrue(second)
+
+    def test_cancelled_flush_resolves_waiters(self):
+        """Cancelling the agent that runs the tick still releases the others."""
+        env, engine, agent_ids = self._make_engine(num_agents=2)
+
+        async def slow_tick(actions):
+            await asyncio.sleep(10)
+
+        engine.step_tick = slow_tick
+
+        async def cancel_flusher():
+            waiter = asyncio.ensure_future(engine.perform_action("Agent-0", "STAY"))
+            await asyncio.sleep(0)
+            flusher = asyncio.ensure_future(engine.perform_action("Agent-1", "STAY"))
+            await asyncio.sleep(0.01)
+            flusher.cancel()
+            return await asyncio.wait_for(waiter, timeout=2.0)
+
+        self.assertFalse(self.run_async(cancel_flusher()))
+
+    def test_clear_agents_resets_the_barrier(self):
+        """After clear_agents only newly registered agents gate a tick."""
+        env, engine, agent_ids = self._make_engine(num_agents=3)
+        engine.clear_agents()
+        engine.register_agent("Agent-0")
+
+        result = self.run_async(asyncio.wait_for(engine.perform_action("Agent-0", "STAY"), timeout=2.0))
+        self.assertTrue(result)
+        self.assertEqual(env.batch_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
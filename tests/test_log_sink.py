@@ -0,0 +1,128 @@
+import asyncio
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Path Setup
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from agent_forge.utils.log_sink import BackgroundLogSink
+from agent_forge.utils.interaction_logger import InteractionLogger
+
+
+class GatedWriter:
+    """write_batch that blocks until released, to simulate a stalled disk."""
+    def __init__(self):
+        self.gate = threading.Event()
+        self.records = []
+
+    def __call__(self, batch):
+        self.gate.wait(5)
+        self.records.extend(batch)
+
+
+class TestBackgroundLogSink(unittest.TestCase):
+
+    def test_block_is_lossless(self):
+        writer = GatedWriter()
+        writer.gate.set()
+        sink = BackgroundLogSink(writer, maxsize=4, policy="block", max_batch=2)
+        for i in range(100):
+            self.assertTrue(sink.put(i))
+        self.assertTrue(sink.flush(timeout=5))
+        sink.close()
+        self.assertEqual(writer.records, list(range(100)))
+        self.assertEqual(sink.stats()["dropped"], 0)
+
+    def test_block_never_stalls_an_event_loop(self):
+        writer = GatedWriter()
+        sink = BackgroundLogSink(writer, maxsize=3, policy="block", max_batch=1)
+        sink.put("first")
+        while sink.depth:
+            time.sleep(0.001)
+
+        async def produce():
+            for i in range(10):
+                sink.put(i)
+
+        started = time.monotonic()
+        asyncio.run(produce())
+        self.assertLess(time.monotonic() - started, 1.0)
+        writer.gate.set()
+        sink.close()
+        self.assertEqual(writer.records, ["first", 7, 8, 9])
+        self.assertEqual(sink.stats()["loop_overflows"], 7)
+
+    def test_drop_oldest_keeps_newest(self):
+        writer = GatedWriter()
+        sink = BackgroundLogSink(writer, maxsize=5, policy="drop_oldest", max_batch=1)
+        sink.put("first")  # picked up by the writer, which then stalls
+        while sink.depth:
+            time.sleep(0.001)
+        for i in range(20):
+            sink.put(i)
+        writer.gate.set()
+        sink.close()
+
+        self.assertEqual(writer.records, ["first", 15, 16, 17, 18, 19])
+        stats = sink.stats()
+        self.assertEqual(stats["dropped"], 15)
+        self.assertEqual(stats["written"], 6)
+
+    def test_sample_thins_under_pressure(self):
+        writer = GatedWriter()
+        sink = BackgroundLogSink(writer, maxsize=10, policy="sample", sample_rate=4, max_batch=1)
+        sink.put("first")
+        while sink.depth:
+            time.sleep(0.001)
+        accepted = sum(sink.put(i) for i in range(25))
+        writer.gate.set()
+        sink.close()
+
+        # 5 admitted freely up to half capacity, then 1 in 4 until full
+        self.assertEqual(accepted, 10)
+        self.assertEqual(sink.stats()["dropped"], 15)
+
+    def test_lag_counters(self):
+        writer = GatedWriter()
+        sink = BackgroundLogSink(writer, maxsize=100, lag_threshold=0.0)
+        sink.put("x")
+        writer.gate.set()
+        sink.flush(timeout=5)
+        sink.close()
+        self.assertEqual(sink.stats()["lagging"], 1)
+        self.assertGreater(sink.stats()["max_lag"], 0.0)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BackgroundLogSink(lambda batch: None, policy="ignore")
+
+
+class TestBackgroundInteractionLogger(unittest.TestCase):
+
+    def test_writes_happen_on_sink_thread(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "logs.db")
+            logger = InteractionLogger(db_path, os.path.join(tmp, "events.jsonl"), background=True)
+            state = {"position": [0, 0]}
+            for i in range(50):
+                logger.log_interaction("A", "MOVE", state, 1.0, {"i": i})
+            state["position"] = [9, 9] # Mutation after logging must not leak in
+
+            logger.flush()
+            self.assertEqual(logger.sink_stats()["written"], 50)
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute("SELECT state FROM interactions").fetchall()
+            conn.close()
+            self.assertEqual(len(rows), 50)
+            self.assertTrue(all(r[0] == str({"position": [0, 0]}) for r in rows))
+            logger.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import pytest
+import os
+import sqlite3
+import threading
+from agent_forge.utils.memory import Memory
+
+
+def _committed_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+    conn.close()
+    return count
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "group_commit.db")
+
+
+def test_rows_coalesce_until_window(db_path):
+    mem = Memory(db_path, group_commit=True, commit_interval=3600, max_batch=1000)
+    for i in range(20):
+        mem.add_memory("Agent_A", "action", f"step {i}", sim_context={"step": i})
+    assert _committed_rows(db_path) == 0
+
+    # Queries see queued rows
+    results = mem.query_memory(agent_id="Agent_A", limit=100)
+    assert len(results) == 20
+    assert results[0]["content"] == "step 19"
+    assert mem.writer.commits == 1
+    mem.close()
+
+
+def test_batch_threshold_triggers_commit(db_path):
+    mem = Memory(db_path, group_commit=True, commit_interval=3600, max_batch=10)
+    for i in range(10):
+        mem.add_memory("Agent_A", "action", i)
+    mem.writer._thread.join(0.5) # let the woken writer run
+    assert _committed_rows(db_path) == 10
+    mem.close()
+
+
+def test_agents_share_one_writer(db_path):
+    mems = [Memory(db_path, group_commit=True, commit_interval=0.01) for _ in range(8)]
+    assert len({id(m.writer) for m in mems}) == 1
+
+    def work(i, mem):
+        for j in range(50):
+            mem.add_memory(f"Agent_{i}", "message_sent", {"j": j})
+
+    threads = [threading.Thread(target=work, args=(i, m)) for i, m in enumerate(mems)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    mems[0].close()
+    assert mems[1].writer is not None # still referenced by the others
+    for m in mems[1:]:
+        m.close()
+    assert _committed_rows(db_path) == 400
+
+
+def test_private_writer_and_default_mode(db_path):
+    private = Memory(db_path, group_commit=True, shared_writer=False)
+    plain = Memory(db_path)
+    private.add_memory("A", "x", "queued")
+    plain.add_memory("B", "x", "direct")
+    assert _committed_rows(db_path) == 1
+    private.close()
+    assert _committed_rows(db_path) == 2
+    plain.close()
+
+
+def test_shared_writer_is_keyed_by_settings(db_path):
+    fast = Memory(db_path, group_commit=True, commit_interval=0.01)
+    slow = Memory(db_path, group_commit=True, commit_interval=3600)
+    same = Memory(db_path, group_commit=True, commit_interval=0.01)
+    assert fast.writer is same.writer
+    assert slow.writer is not fast.writer
+    assert slow.writer.commit_interval == 3600
+    for m in (fast, slow, same):
+        m.close()
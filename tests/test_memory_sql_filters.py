@@ -0,0 +1,71 @@
+import pytest
+import json
+import random
+from agent_forge.utils.memory import Memory
+
+
+def _python_filter(rows, filter_metadata):
+    return [r for r in rows if isinstance(r["sim_context"], dict)
+            and all(r["sim_context"].get(k) == v for k, v in filter_metadata.items())]
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = Memory(str(tmp_path / "filters.db"))
+    rng = random.Random(5)
+    for i in range(300):
+        ctx = {
+            "status": rng.choice(["idle", "running", None]),
+            "run": rng.randint(0, 3),
+            "ok": rng.choice([True, False]),
+            "pos": rng.choice([[0, 1], [1, 0]]),
+            "tag.name": rng.choice(["a", "b"])
+        }
+        if i % 7 == 0:
+            del ctx["run"]
+        mem.add_memory(f"Agent_{i % 3}", rng.choice(["x", "y"]), f"m{i}", sim_context=ctx)
+    # Rows add_memory would never write: invalid JSON and a non-object context
+    mem.conn.execute("INSERT INTO memories (agent_id, type, content, timestamp, sim_context) VALUES ('Agent_0', 'x', '\"bad\"', '9999', '{not json')")
+    mem.conn.execute("INSERT INTO memories (agent_id, type, content, timestamp, sim_context) VALUES ('Agent_0', 'x', '\"list\"', '9999', '[1, 2]')")
+    mem.conn.commit()
+    yield mem
+    mem.close()
+
+
+@pytest.mark.parametrize("filter_metadata", [
+    {"status": "running"},
+    {"status": None},
+    {"run": 2, "ok": True},
+    {"run": None},
+    {"ok": 0},
+    {"pos": [1, 0], "status": "idle"},
+    {"tag.name": "b"},
+    {"missing": "x"},
+])
+def test_sql_filters_match_python_semantics(memory, filter_metadata):
+    everything = memory.query_memory(agent_id="Agent_0", limit=10_000)
+    expected = _python_filter(everything, filter_metadata)[:20]
+    assert memory.query_memory(agent_id="Agent_0", filter_metadata=filter_metadata, limit=20) == expected
+
+
+def test_limit_pushed_into_sql(memory):
+    statements = []
+    memory.conn.set_trace_callback(statements.append)
+    memory.query_memory(agent_id="Agent_1", filter_metadata={"status": "idle"}, limit=5)
+    assert "LIMIT" in statements[-1]
+    assert "json_extract" not in statements[-1] # indexed key reads the generated column
+
+
+def test_indexed_key_uses_index(memory):
+    plan = memory.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM memories WHERE agent_id = ? AND ctx_status = ? ORDER BY timestamp DESC",
+        ("Agent_1", "idle")
+    ).fetchall()
+    assert any("idx_ctx_status" in str(step) for step in plan)
+
+
+def test_schema_upgrade_is_idempotent(memory):
+    reopened = Memory(memory.db_path, indexed_keys=("status", "run"))
+    reopened.add_memory("Agent_9", "x", "new", sim_context={"run": 7})
+    assert [r["content"] for r in reopened.query_memory(filter_metadata={"run": 7})] == ["new"]
+    reopened.close()
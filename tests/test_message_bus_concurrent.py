@@ -0,0 +1,101 @@
+import pytest
+import asyncio
+import time
+from agent_forge.utils.message_bus import MessageBus
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_stall_others():
+    bus = MessageBus(log_path=None, dispatch="concurrent")
+    await bus.start()
+    fast, slow = [], []
+
+    async def slow_handler(message):
+        await asyncio.sleep(0.5)
+        slow.append(message)
+
+    bus.subscribe("t", slow_handler)
+    bus.subscribe("t", fast.append)
+
+    for i in range(5):
+        await bus.publish("t", "sender", i)
+    await bus._queue.join()
+    await asyncio.sleep(0.05)
+    assert [m.payload for m in fast] == [0, 1, 2, 3, 4]
+    assert slow == []
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_chaos_latency_is_per_delivery():
+    bus = MessageBus(log_path=None, dispatch="concurrent")
+    bus.set_chaos(latency_min=0.1, latency_max=0.1)
+    await bus.start()
+    received = []
+    for i in range(20):
+        bus.subscribe(f"topic_{i}", lambda m: received.append(m))
+
+    start = time.monotonic()
+    for i in range(20):
+        await bus.publish(f"topic_{i}", "sender", i)
+    await bus.drain()
+    # Serial dispatch would take 20 x 0.1s
+    assert time.monotonic() - start < 1.0
+    assert sorted(m.payload for m in received) == list(range(20))
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow", ["drop", "dlq"])
+async def test_overflow_policies(overflow):
+    bus = MessageBus(log_path=None, dispatch="concurrent", inbox_size=2, overflow=overflow)
+    await bus.start()
+    gate = asyncio.Event()
+    received = []
+
+    async def stuck(message):
+        await gate.wait()
+        received.append(message.payload)
+
+    bus.subscribe("t", stuck)
+    for i in range(6):
+        await bus.publish("t", "sender", i)
+    await bus._queue.join()
+
+    # One message in the handler, two queued, three overflowed
+    stats = bus.subscriber_stats()[0]
+    assert stats["dropped"] == 3
+    assert len(bus.dlq) == (3 if overflow == "dlq" else 0)
+
+    gate.set()
+    await bus.drain()
+    assert received == [0, 1, 2]
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_block_is_lossless_and_unsubscribe_stops_worker():
+    bus = MessageBus(log_path=None, dispatch="concurrent", inbox_size=1, overflow="block")
+    await bus.start()
+    received = []
+
+    async def handler(message):
+        await asyncio.sleep(0.001)
+        received.append(message.payload)
+
+    bus.subscribe("t", handler)
+    for i in range(20):
+        await bus.publish("t", "sender", i)
+    await bus.drain()
+    assert received == list(range(20))
+
+    bus.unsubscribe("t", handler)
+    assert bus.subscriber_stats() == []
+    await bus.stop()
+
+
+def test_invalid_modes():
+    with pytest.raises(ValueError):
+        MessageBus(log_path=None, dispatch="parallel")
+    with pytest.raises(ValueError):
+        MessageBus(log_path=None, overflow="spill")
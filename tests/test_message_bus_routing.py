@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+from agent_forge.utils.message_bus import MessageBus
+
+
+class Inbox:
+    """Minimal agent-like subscriber: a bound method on an object with agent_id."""
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.received = []
+
+    async def receive_message(self, message):
+        self.received.append(message)
+
+
+@pytest.mark.asyncio
+async def test_directed_message_reaches_only_receiver():
+    bus = MessageBus(log_path=None)
+    await bus.start()
+    agents = [Inbox(f"agent_{i}") for i in range(500)]
+    for agent in agents:
+        bus.subscribe("orders", agent.receive_message)
+    observed = []
+    bus.subscribe("orders", observed.append)
+
+    await bus.publish("orders", "system", {"qty": 1}, receiver="agent_42")
+    await bus._queue.join()
+
+    assert [len(a.received) for a in agents].count(1) == 1
+    assert len(agents[42].received) == 1
+    assert len(observed) == 1 # observers still see directed traffic
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_and_all_reach_everyone():
+    bus = MessageBus(log_path=None)
+    await bus.start()
+    agents = [Inbox(f"agent_{i}") for i in range(5)]
+    for agent in agents:
+        bus.subscribe("news", agent.receive_message)
+
+    await bus.publish("news", "system", "a")
+    await bus.publish("news", "system", "b", receiver="all")
+    await bus._queue.join()
+
+    assert all(len(a.received) == 2 for a in agents)
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_explicit_owner_and_unsubscribe():
+    bus = MessageBus(log_path=None)
+    await bus.start()
+    got = []
+    handler = got.append
+    bus.subscribe("jobs", handler, owner="worker")
+
+    await bus.publish("jobs", "system", 1, receiver="someone_else")
+    await bus.publish("jobs", "system", 2, receiver="worker")
+    await bus._queue.join()
+    assert [m.payload for m in got] == [2]
+
+    bus.unsubscribe("jobs", handler)
+    assert bus._routes["jobs"] == {}
+    await bus.publish("jobs", "system", 3, receiver="worker")
+    await bus._queue.join()
+    assert [m.payload for m in got] == [2]
+    await bus.stop()
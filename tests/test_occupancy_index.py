@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import copy
+import threading
+
+# Path Setup
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from agent_forge.utils.occupancy import OccupancyIndex
+from agent_forge.environments.warehouse_env import WarehouseEnv as GridWarehouseEnv
+from agent_forge.envs.warehouse import WarehouseEnv
+from agent_forge.core.engine import SimulationEngine
+
+
+class TestOccupancyIndex(unittest.TestCase):
+
+    def test_assignment_updates_index(self):
+        agents = OccupancyIndex()
+        agents["A"] = {"position": (1, 1), "battery": 100}
+        self.assertTrue(agents.is_occupied((1, 1)))
+        self.assertFalse(agents.is_occupied((1, 1), exclude_agent="A"))
+
+        state = agents["A"]
+        state["position"] = (2, 1)
+        agents["A"] = state
+        self.assertFalse(agents.is_occupied((1, 1)))
+        self.assertEqual(agents.agents_at((2, 1)), {"A"})
+
+        del agents["A"]
+        self.assertFalse(agents.is_occupied((2, 1)))
+
+    def test_reindex_after_in_place_mutation(self):
+        agents = OccupancyIndex({"A": {"position": (0, 0)}})
+        agents["A"]["position"] = (3, 3)
+        agents.reindex("A")
+        self.assertTrue(agents.is_occupied((3, 3)))
+        self.assertFalse(agents.is_occupied((0, 0)))
+
+    def test_deepcopy_keeps_index(self):
+        agents = OccupancyIndex({"A": {"position": (0, 0)}, "B": {"position": (0, 0)}})
+        clone = copy.deepcopy(agents)
+        clone.pop("A")
+        self.assertTrue(clone.is_occupied((0, 0)))
+        self.assertEqual(agents.agents_at((0, 0)), {"A", "B"})
+
+    def test_lookup_while_another_thread_moves_agents(self):
+        # Agents query from the loop while env.step moves them on a step thread
+        agents = OccupancyIndex({"A": {"position": (0, 0)}, "B": {"position": (0, 0)}})
+        done = threading.Event()
+
+        def mover():
+            while not done.is_set():
+                agents["B"] = {"position": (1, 0)}
+                agents["B"] = {"position": (0, 0)}
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        thread = threading.Thread(target=mover)
+        thread.start()
+        try:
+            for _ in range(100000):
+                agents.is_occupied((0, 0), exclude_agent="A")
+        finally:
+            done.set()
+            thread.join()
+            sys.setswitchinterval(interval)
+
+
+class TestWarehouseOccupancy(unittest.TestCase):
+
+    def test_collision_uses_index(self):
+        env = GridWarehouseEnv(size=5, num_agents=2)
+        env.reset()
+        env.agents["A"] = {"position": (0, 0), "battery": 100, "carrying": None}
+        env.agents["B"] = {"position": (0, 1), "battery": 100, "carrying": None}
+
+        state, _, _, info = env.step("UP", agent_id="A")
+        self.assertEqual(state["position"], (0, 0))
+
+        env.step("RIGHT", agent_id="B")
+        state, _, _, _ = env.step("UP", agent_id="A")
+        self.assertEqual(state["position"], (0, 1))
+        self.assertTrue(env.is_occupied((0, 1)))
+        self.assertFalse(env.is_occupied((0, 0)))
+
+    def test_spawn_is_collision_free(self):
+        env = WarehouseEnv(size=10, num_agents=30)
+        positions = [env.get_agent_state(f"A{i}")["position"] for i in range(30)]
+        self.assertEqual(len(set(positions)), 30)
+
+    def test_engine_answers_from_env_index(self):
+        env = WarehouseEnv(size=10, num_agents=2)
+        engine = SimulationEngine(env=env)
+        pos = env.get_agent_state("A")["position"]
+        self.assertTrue(engine.is_occupied(pos))
+        self.assertFalse(engine.is_occupied(pos, exclude_agent="A"))
+
+
+if __name__ == "__main__":
+    unittest.main()
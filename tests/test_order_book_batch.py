@@ -0,0 +1,88 @@
+import pytest
+import random
+from environments.order_book_env import OrderBook, PriceLevelOrderBook, OrderBookEnv
+
+
+def _make_env(book_cls, **kwargs):
+    env = OrderBookEnv(start_cash=1000.0, book_cls=book_cls, **kwargs)
+    env.reset()
+    for i in range(6):
+        env.portfolios[f"agent{i}"] = {'cash': 2000.0, 'inventory': 20}
+    return env
+
+
+def _random_orders(rng, count):
+    orders = []
+    for i in range(count):
+        if rng.random() < 0.25:
+            orders.append({'type': 'CANCEL', 'id': f"o{rng.randrange(i + 1)}", 'agent_id': f"agent{i % 6}"})
+        else:
+            orders.append({
+                'type': 'LIMIT',
+                'side': rng.choice(['BUY', 'SELL']),
+                'price': round(100.0 + rng.uniform(-2, 2), 1),
+                'quantity': rng.randint(1, 15),
+                'id': f"o{i}",
+                'agent_id': f"agent{i % 6}"
+            })
+    return orders
+
+
+class TestOrderBookBatch:
+    @pytest.mark.parametrize("book_cls", [OrderBook, PriceLevelOrderBook])
+    def test_step_many_matches_sequential_steps(self, book_cls):
+        """Batches reproduce successive step() calls, including checks that depend on earlier fills."""
+        orders = _random_orders(random.Random(11), 600)
+        sequential, batched = _make_env(book_cls), _make_env(book_cls)
+
+        expected, got = [], []
+        for start in range(0, len(orders), 50):
+            chunk = orders[start:start + 50]
+            expected.extend(sequential.step(dict(o))[3] for o in chunk)
+            _, infos = batched.step_many([dict(o) for o in chunk])
+            got.extend(infos)
+            assert batched.last_trades == sequential.last_trades
+
+        assert got == expected
+        assert batched.portfolios == sequential.portfolios
+        assert batched.book.get_snapshot() == sequential.book.get_snapshot()
+        assert batched._get_mid_price() == sequential._get_mid_price()
+
+    def test_in_batch_fill_funds_later_order(self):
+        """A sale earlier in the batch provides the cash a later buy in the same batch needs."""
+        env = OrderBookEnv(start_cash=0.0)
+        env.reset()
+        env.portfolios['seller'] = {'cash': 0.0, 'inventory': 10}
+        env.portfolios['buyer'] = {'cash': 1000.0, 'inventory': 0}
+        env.book.add_order('BUY', 100.0, 10, 'resting', 'buyer')
+
+        obs, infos = env.step_many([
+            {'type': 'LIMIT', 'side': 'SELL', 'price': 100.0, 'quantity': 10, 'id': 's', 'agent_id': 'seller'},
+            {'type': 'LIMIT', 'side': 'BUY', 'price': 90.0, 'quantity': 10, 'id': 'b', 'agent_id': 'seller'},
+        ])
+
+        assert len(infos[0]['trades']) == 1
+        assert 'rejected' not in infos[1]
+        assert env.portfolios['seller'] == {'cash': 1000.0, 'inventory': 0}
+        assert obs['market_snapshot']['bids'][0]['id'] == 'b'
+
+    def test_malformed_order_is_rejected_alone(self):
+        env = _make_env(OrderBook)
+        obs, infos = env.step_many([
+            {'type': 'LIMIT', 'side': 'BUY', 'agent_id': 'agent0'},
+            {'type': 'LIMIT', 'side': 'BUY', 'price': 99.0, 'quantity': 1, 'id': 'ok', 'agent_id': 'agent0'},
+        ])
+        assert infos[0]['rejected']
+        assert 'rejected' not in infos[1]
+        assert obs['market_snapshot']['bids'][0]['id'] == 'ok'
+
+    def test_delta_mode_emits_one_frame(self):
+        env = _make_env(PriceLevelOrderBook, delta_mode=True)
+        frame, infos = env.step_many([
+            {'type': 'LIMIT', 'side': 'SELL', 'price': 101.0, 'quantity': 5, 'id': 'a', 'agent_id': 'agent0'},
+            {'type': 'LIMIT', 'side': 'BUY', 'price': 101.0, 'quantity': 2, 'id': 'b', 'agent_id': 'agent1'},
+        ])
+        assert frame['type'] == 'delta'
+        assert frame['levels']['asks'] == [(101.0, 3)]
+        assert set(frame['portfolios']) == {'agent0', 'agent1'}
+        assert len(frame['trades']) == 1
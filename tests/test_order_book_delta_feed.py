@@ -0,0 +1,116 @@
+import pytest
+import random
+from environments.order_book_env import OrderBook, PriceLevelOrderBook, OrderBookEnv, MarketDataBook
+from core.financial_risk import SystemicRiskMonitor
+from agents.strategy_agents import MomentumTrader
+
+
+def _random_flow(env, rng, steps):
+    frames = []
+    for i in range(steps):
+        agent = f"agent{i % 5}"
+        if rng.random() < 0.3:
+            action = {'type': 'CANCEL', 'id': f"o{rng.randrange(i + 1)}", 'agent_id': agent}
+        else:
+            action = {
+                'type': 'LIMIT',
+                'side': rng.choice(['BUY', 'SELL']),
+                'price': round(100.0 + rng.uniform(-3, 3), 1),
+                'quantity': rng.randint(1, 20),
+                'id': f"o{i}",
+                'agent_id': agent
+            }
+        obs, _, _, _ = env.step(action)
+        frames.append(obs)
+    return frames
+
+
+class TestOrderBookDeltaFeed:
+    @pytest.mark.parametrize("book_cls", [OrderBook, PriceLevelOrderBook])
+    def test_deltas_rebuild_the_book(self, book_cls):
+        """Applying every frame reproduces the env's own L2 levels and portfolios."""
+        env = OrderBookEnv(start_cash=1e9, book_cls=book_cls, delta_mode=True, snapshot_interval=50)
+        for i in range(5):
+            env.portfolios[f"agent{i}"] = {'cash': 1e9, 'inventory': 10_000}
+
+        client = MarketDataBook()
+        client.apply(env.get_full_snapshot())
+        for frame in _random_flow(env, random.Random(3), 400):
+            assert client.apply(frame)
+
+        levels = env.book.get_levels()
+        assert client.bids == levels['bids']
+        assert client.asks == levels['asks']
+        assert client.portfolios == env.portfolios
+        assert client.mid_price == env._get_mid_price()
+
+    def test_snapshot_mode_does_not_track_changed_levels(self):
+        """Nothing drains the change set outside delta mode, so nothing is recorded."""
+        env = OrderBookEnv(start_cash=1e9, book_cls=PriceLevelOrderBook)
+        env.reset()
+        _random_flow(env, random.Random(2), 200)
+        assert not env.book.track_changes
+        assert env.book._changed_levels == set()
+
+        assert OrderBookEnv(book_cls=PriceLevelOrderBook, delta_mode=True).book.track_changes
+
+    def test_periodic_snapshot_and_gap_resync(self):
+        env = OrderBookEnv(book_cls=PriceLevelOrderBook, delta_mode=True, snapshot_interval=10)
+        env.reset()
+        frames = _random_flow(env, random.Random(1), 30)
+        assert [f['seq'] for f in frames if f['type'] == 'snapshot'] == [10, 20, 30]
+
+        # reset() emitted seq 1, so frames[i] carries seq i + 2
+        client = MarketDataBook()
+        assert not client.apply(frames[0])
+        assert client.apply(frames[8])
+        # Skipping a frame keeps the client out of sync until the next snapshot
+        assert not client.apply(frames[10])
+        assert not client.apply(frames[11])
+        assert client.apply(frames[18])
+
+    def test_delta_only_carries_touched_portfolios(self):
+        env = OrderBookEnv(book_cls=PriceLevelOrderBook, delta_mode=True)
+        env.reset()
+        env.portfolios['maker'] = {'cash': 0.0, 'inventory': 100}
+        env.portfolios['bystander'] = {'cash': 5.0, 'inventory': 0}
+        env.step({'type': 'LIMIT', 'side': 'SELL', 'price': 100.0, 'quantity': 10, 'id': 'a', 'agent_id': 'maker'})
+        frame, _, _, _ = env.step({'type': 'LIMIT', 'side': 'BUY', 'price': 100.0, 'quantity': 4, 'id': 'b', 'agent_id': 'taker'})
+
+        assert frame['type'] == 'delta'
+        assert set(frame['portfolios']) == {'maker', 'taker'}
+        assert frame['levels'] == {'bids': [], 'asks': [(100.0, 6)]}
+        assert len(frame['trades']) == 1
+
+    def test_consumers_accept_frames(self):
+        env = OrderBookEnv(book_cls=PriceLevelOrderBook, delta_mode=True)
+        snapshot = env.reset()
+        monitor = SystemicRiskMonitor()
+        trader = MomentumTrader("mom", 10000.0)
+        trader.decide(snapshot)
+
+        env.portfolios['maker'] = {'cash': 0.0, 'inventory': 100}
+        env.step({'type': 'LIMIT', 'side': 'SELL', 'price': 101.0, 'quantity': 10, 'id': 'a', 'agent_id': 'maker'})
+        frame, _, _, _ = env.step({'type': 'LIMIT', 'side': 'BUY', 'price': 101.0, 'quantity': 10, 'id': 'b', 'agent_id': 'taker'})
+
+        monitor.update(frame)
+        assert monitor.agent_volume == {'taker': 10, 'maker': 10}
+        assert trader.decide(frame)['type'] == 'HOLD'
+        assert not trader.market.in_sync # Missed the maker's frame
+
+    def test_strategy_decides_from_the_maintained_book(self):
+        env = OrderBookEnv(book_cls=PriceLevelOrderBook, delta_mode=True)
+        trader = MomentumTrader("mom", 10000.0)
+        trader.decide(env.reset())
+        env.portfolios['maker'] = {'cash': 1e6, 'inventory': 100}
+        for action in (
+            {'type': 'LIMIT', 'side': 'BUY', 'price': 99.0, 'quantity': 5, 'id': 'b', 'agent_id': 'maker'},
+            {'type': 'LIMIT', 'side': 'SELL', 'price': 103.0, 'quantity': 5, 'id': 'a', 'agent_id': 'maker'},
+        ):
+            frame, _, _, _ = env.step(action)
+            trader.decide(frame)
+
+        # The last frame only carries the ask level; the bid comes from earlier frames
+        assert frame['levels']['bids'] == []
+        assert (trader.best_bid, trader.best_ask) == (99.0, 103.0)
+        assert trader.mid_price == trader.market.mid_price == 101.0
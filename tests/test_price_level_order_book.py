@@ -0,0 +1,81 @@
+import pytest
+import random
+from environments.order_book_env import OrderBook, PriceLevelOrderBook, OrderBookEnv
+
+
+class TestPriceLevelOrderBook:
+    @pytest.fixture
+    def book(self):
+        return PriceLevelOrderBook()
+
+    def test_matches_heap_book_on_random_flow(self):
+        """Same order flow (with cancels) yields identical trades and snapshots."""
+        rng = random.Random(7)
+        heap_book, level_book = OrderBook(), PriceLevelOrderBook()
+        live_ids = []
+
+        for i in range(3000):
+            if live_ids and rng.random() < 0.4:
+                order_id = live_ids.pop(rng.randrange(len(live_ids)))
+                assert heap_book.cancel_order(order_id) == level_book.cancel_order(order_id)
+            else:
+                side = rng.choice(['BUY', 'SELL'])
+                price = round(100.0 + rng.uniform(-5, 5), 1)
+                qty = rng.randint(1, 50)
+                order_id = f"o{i}"
+                args = (side, price, qty, order_id, f"agent{i % 7}")
+                assert heap_book.add_order(*args) == level_book.add_order(*args)
+                live_ids.append(order_id)
+
+            if i % 100 == 0:
+                assert heap_book.get_snapshot(depth=5) == level_book.get_snapshot(depth=5)
+                assert heap_book.best_bid() == level_book.best_bid()
+                assert heap_book.best_ask() == level_book.best_ask()
+
+    def test_cancel_keeps_fifo_within_level(self, book):
+        book.add_order('BUY', 100.0, 10, 'a', 'A')
+        book.add_order('BUY', 100.0, 10, 'b', 'B')
+        book.add_order('BUY', 100.0, 10, 'c', 'C')
+        assert book.cancel_order('b')
+        assert not book.cancel_order('b')
+
+        trades = book.add_order('SELL', 100.0, 15, 's', 'S')
+        assert [t['buy_order_id'] for t in trades] == ['a', 'c']
+        assert book.get_depth(depth=1)['bids'] == [(100.0, 5)]
+
+    def test_empty_level_is_removed(self, book):
+        book.add_order('SELL', 101.0, 5, 'x', 'X')
+        book.add_order('SELL', 102.0, 5, 'y', 'Y')
+        book.cancel_order('x')
+        assert book.best_ask() == 102.0
+        assert 101.0 not in book.ask_levels
+        assert book.ask_prices == [102.0]
+
+    def test_snapshot_cache_invalidated_on_change(self, book):
+        book.add_order('BUY', 99.0, 10, 'a', 'A')
+        first = book.get_snapshot()
+        first['bids'][0]['quantity'] = 0
+        first['bids'].clear()
+        assert book.get_snapshot()['bids'][0]['quantity'] == 10
+        book.add_order('BUY', 99.5, 10, 'b', 'B')
+        assert book.get_snapshot()['bids'][0]['id'] == 'b'
+
+    def test_pop_best(self, book):
+        book.add_order('BUY', 99.0, 10, 'a', 'A')
+        book.add_order('BUY', 99.5, 10, 'b', 'B')
+        popped = book.pop_best('BUY')
+        assert (popped.order_id, popped.quantity) == ('b', 10)
+        assert 'b' not in book.orders
+        assert book.best_bid() == 99.0
+        assert book.pop_best('SELL') is None
+
+    def test_env_drop_in(self):
+        env = OrderBookEnv(start_cash=10000.0, book_cls=PriceLevelOrderBook)
+        env.reset()
+        env.portfolios['seller'] = {'cash': 0.0, 'inventory': 100}
+        env.step({'type': 'LIMIT', 'side': 'SELL', 'price': 101.0, 'quantity': 10, 'id': 's1', 'agent_id': 'seller'})
+        obs, _, _, info = env.step({'type': 'LIMIT', 'side': 'BUY', 'price': 99.0, 'quantity': 10, 'id': 'b1', 'agent_id': 'buyer'})
+        assert obs['mid_price'] == 100.0
+        obs, _, _, info = env.step({'type': 'CANCEL', 'id': 'b1', 'agent_id': 'buyer'})
+        assert info['cancel_success']
+        assert obs['market_snapshot']['bids'] == []
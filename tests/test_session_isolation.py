@@ -0,0 +1,163 @@
+import pytest
+import asyncio
+import os
+from agent_forge.core.process_runner import ProcessSessionRunner
+from agent_forge.server.api import SessionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+CONFIG = {"num_agents": 2, "grid_size": 10, "start_delay_max": 0}
+
+
+@pytest.mark.asyncio
+async def test_session_streams_do_not_cross_talk():
+    manager = SessionManager()
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await manager.connect_ws(ws_a, session_id="a")
+    await manager.connect_ws(ws_b, session_id="b")
+    await manager.create_session("a")
+    await manager.create_session("b")
+    try:
+        await manager.control_session("a", "start", dict(CONFIG))
+        await manager.control_session("b", "start", dict(CONFIG))
+        await asyncio.sleep(1.0)
+        assert ws_a.sent and ws_b.sent
+
+        # Session "a" paused: its subscribers go quiet while "b" keeps streaming
+        await manager.control_session("a", "pause")
+        await asyncio.sleep(0.3)
+        seen_a, seen_b = len(ws_a.sent), len(ws_b.sent)
+        await asyncio.sleep(1.0)
+        assert len(ws_a.sent) == seen_a
+        assert len(ws_b.sent) > seen_b
+    finally:
+        for session_id in ("a", "b"):
+            await manager.close_session(session_id)
+
+
+@pytest.mark.asyncio
+async def test_control_is_not_serialized_across_sessions():
+    manager = SessionManager()
+    await manager.create_session("a")
+    await manager.create_session("b")
+    await manager.control_session("a", "start", dict(CONFIG))
+    try:
+        async with manager._lock_for("a"):
+            # "a" is busy; "b" must not wait for it
+            result = await asyncio.wait_for(manager.control_session("b", "start", dict(CONFIG)), timeout=10)
+            assert result["is_running"]
+    finally:
+        for session_id in ("a", "b"):
+            await manager.close_session(session_id)
+
+
+@pytest.mark.asyncio
+async def test_isolated_session_runs_in_worker_process():
+    manager = SessionManager()
+    ws = FakeWebSocket()
+    await manager.connect_ws(ws, session_id="iso")
+    await manager.create_session("iso")
+    try:
+        result = await manager.control_session("iso", "start", dict(CONFIG, isolated=True))
+        runner = manager.sessions["iso"]
+        assert isinstance(runner, ProcessSessionRunner)
+        assert result["is_running"] and runner.status == "RUNNING"
+        assert runner.pid and runner.pid != os.getpid()
+
+        await asyncio.sleep(1.5)
+        assert any(msg.get("type") == "step" for msg in ws.sent if isinstance(msg, dict))
+        snapshot = await runner.get_snapshot()
+        assert set(snapshot) == {"Agent-0", "Agent-1"}
+
+        await manager.control_session("iso", "stop")
+        assert runner.status == "STOPPED" and not runner.is_running
+    finally:
+        process = manager.sessions["iso"]._process
+        await manager.close_session("iso")
+    assert "iso" not in manager.sessions
+    assert process is None or not process.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_legacy_feed_carries_only_the_default_session():
+    manager = SessionManager()
+    legacy = FakeWebSocket()
+    await manager.connect_ws(legacy)
+    await manager.create_session("a")
+    try:
+        await manager.control_session("a", "start", dict(CONFIG))
+        await asyncio.sleep(0.5)
+        assert manager.sessions["a"].is_running
+        assert legacy.sent == []
+    finally:
+        await manager.close_session("a")
+
+
+@pytest.mark.asyncio
+async def test_unknown_sessions_are_not_created_or_kept():
+    from agent_forge.server.api import SessionNotFoundError
+
+    manager = SessionManager()
+    for action in ("start", "stop"):
+        with pytest.raises(SessionNotFoundError):
+            await manager.control_session("ghost", action, dict(CONFIG))
+    assert "ghost" not in manager.sessions
+    assert "ghost" not in manager._locks
+
+    ws = FakeWebSocket()
+    await manager.connect_ws(ws, session_id="ghost")
+    manager.disconnect_ws(ws, "ghost")
+    assert "ghost" not in manager.session_streams
+
+
+@pytest.mark.asyncio
+async def test_worker_side_failure_reaches_the_parent(monkeypatch):
+    from agent_forge.core.runner import HeadlessRunner
+
+    start = HeadlessRunner.start
+
+    async def start_then_fail(self):
+        await start(self)
+        asyncio.get_running_loop().call_later(0.3, lambda: asyncio.ensure_future(self.fail("boom")))
+
+    # Forked, so the worker inherits the patched runner
+    monkeypatch.setattr(HeadlessRunner, "start", start_then_fail)
+    runner = ProcessSessionRunner(start_method="fork")
+    try:
+        await runner.setup(**{k: CONFIG[k] for k in ("num_agents", "grid_size")}, config=dict(CONFIG))
+        await runner.start()
+        assert runner.status == "RUNNING"
+        for _ in range(50):
+            if runner.status == "FAILED":
+                break
+            await asyncio.sleep(0.1)
+        assert runner.status == "FAILED" and not runner.is_running
+        assert runner.error_message == "boom"
+    finally:
+        await runner.close()
+
+
+@pytest.mark.asyncio
+async def test_closing_a_session_keeps_its_lock():
+    manager = SessionManager()
+    await manager.create_session("a")
+    lock = manager._lock_for("a")
+    await manager.close_session("a")
+    # Anyone who was waiting on the old lock still excludes new callers
+    assert manager._lock_for("a") is lock
@@ -0,0 +1,105 @@
+import pytest
+import asyncio
+import json
+from agent_forge.core.engine import SimulationEngine
+from agent_forge.core.state_delta import StateDeltaEncoder, DeltaConflator
+from agent_forge.envs.warehouse import WarehouseEnv
+from agent_forge.server.api import ConnectionManager
+from agent_forge.server.frame_codec import decode_frame
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.sent.append(decode_frame(data))
+
+
+def test_encoder_emits_only_changed_fields():
+    encoder = StateDeltaEncoder()
+    first = encoder.frame(1, {"a": {"position": (1, 1), "battery": 99.96, "carrying": None}}, {})
+    assert first["agents"] == {"a": {"position": (1, 1), "battery": 100.0, "carrying": None}}
+
+    moved = encoder.frame(2, {"a": {"position": (1, 2), "battery": 99.98, "carrying": None}}, {})
+    assert moved["agents"] == {"a": {"position": (1, 2)}}
+
+    # Sub-precision battery drift and no events: nothing to send
+    assert encoder.frame(3, {"a": {"position": (1, 2), "battery": 99.97, "carrying": None}}, {}) is None
+
+    event = encoder.frame(4, {"a": {"position": (1, 2), "battery": 99.97, "carrying": None}},
+                          {"a": {"event": "blocked"}})
+    assert event["agents"] == {}
+    assert event["events"] == [{"agent_id": "a", "event": "blocked"}]
+
+
+def test_conflator_keeps_latest_fields_and_all_events():
+    conflator = DeltaConflator(max_events=2)
+    conflator.add({"seq_id": 1, "agents": {"a": {"position": [0, 0], "battery": 90.0}}, "events": [{"event": "x"}]})
+    conflator.add({"seq_id": 2, "agents": {"a": {"position": [0, 1]}, "b": {"battery": 50.0}}, "events": [{"event": "y"}]})
+    conflator.add({"seq_id": 3, "agents": {}, "events": [{"event": "z"}]})
+
+    frame = conflator.take()
+    assert frame["from_seq"] == 1 and frame["seq_id"] == 3
+    assert frame["agents"] == {"a": {"position": [0, 1], "battery": 90.0}, "b": {"battery": 50.0}}
+    assert [e["event"] for e in frame["events"]] == ["y", "z"]
+    assert conflator.events_dropped == 1
+    assert not conflator.pending
+
+
+@pytest.mark.asyncio
+async def test_engine_delta_mode_skips_full_updates():
+    env = WarehouseEnv(size=10, num_agents=2)
+    engine = SimulationEngine(env, lockstep=True, delta_updates=True)
+    for agent_id in ("A", "B"):
+        env.get_agent_state(agent_id)
+        engine.register_agent(agent_id)
+    updates = []
+    engine.on_step_callback = updates.append
+
+    await asyncio.gather(engine.perform_action("A", "CHARGE"), engine.perform_action("B", "CHARGE"))
+    assert len(updates) == 1
+    frame = updates[0]
+    assert frame["type"] == "delta"
+    assert set(frame["agents"]) == {"A", "B"}
+    assert "grid_state" not in frame and "observations" not in frame
+    engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_gets_keyframe_then_conflated_deltas():
+    manager = ConnectionManager(frame_rate=20.0, keyframe_interval=None)
+    for seq in range(1, 4):
+        await manager.broadcast({"type": "delta", "seq_id": seq, "timestamp": 0.0, "events": [],
+                                 "agents": {f"agent{seq}": {"position": [seq, 0]}}})
+
+    ws = FakeWebSocket()
+    await manager.connect(ws)
+    await asyncio.sleep(0.08)
+    assert ws.sent[0]["type"] == "keyframe"
+    assert set(ws.sent[0]["agents"]) == {"agent1", "agent2", "agent3"}
+
+    for i in range(20):
+        await manager.broadcast({"type": "delta", "seq_id": 4 + i, "timestamp": 0.0, "events": [],
+                                 "agents": {"agent1": {"position": [i, i]}}})
+    await asyncio.sleep(0.1)
+    deltas = [m for m in ws.sent if m["type"] == "delta"]
+    # 20 engine frames arrived within one frame interval -> merged into one send
+    assert len(deltas) == 1
+    assert deltas[0]["agents"] == {"agent1": {"position": [19, 19]}}
+    assert deltas[0]["from_seq"] == 4 and deltas[0]["seq_id"] == 23
+
+    # Discrete messages are not conflated
+    await manager.broadcast({"type": "error", "error": "boom"})
+    await asyncio.sleep(0.02)
+    assert ws.sent[-1]["type"] == "error"
+    manager.disconnect(ws)
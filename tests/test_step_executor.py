@@ -0,0 +1,89 @@
+import pytest
+import asyncio
+import time
+from agent_forge.core.engine import SimulationEngine
+from agent_forge.core.step_executor import StepExecutor, step_env
+from agent_forge.environments.grid_world import GridWorld
+from agent_forge.envs.warehouse import WarehouseEnv
+
+
+class SlowGridWorld(GridWorld):
+    def step(self, action, agent_id="default"):
+        time.sleep(0.005)
+        return super().step(action, agent_id=agent_id)
+
+
+@pytest.mark.asyncio
+async def test_auto_goes_inline_for_cheap_env():
+    env = WarehouseEnv(size=10, num_agents=1)
+    env.get_agent_state("Agent-0")
+    engine = SimulationEngine(env, step_mode="auto")
+    for _ in range(30):
+        assert await engine.perform_action("Agent-0", "CHARGE")
+    stats = engine.executor.stats()
+    assert stats["active_mode"] == "inline"
+    assert stats["steps"]["inline"] > 0
+    assert sum(stats["steps"].values()) == 30
+    engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_auto_keeps_thread_pool_for_slow_env():
+    executor = StepExecutor(mode="auto", sample_size=5)
+    env = SlowGridWorld(size=50)
+    for _ in range(10):
+        await executor.run(env, step_env, "a", "RIGHT")
+    assert executor.active_mode == "thread"
+    assert executor.steps["inline"] == 0
+    executor.close()
+
+
+@pytest.mark.asyncio
+async def test_auto_returns_to_thread_when_steps_get_expensive():
+    executor = StepExecutor(mode="auto", sample_size=5)
+    env = GridWorld(size=100)
+    for _ in range(10):
+        await executor.run(env, step_env, "a", "RIGHT")
+    assert executor.active_mode == "inline"
+
+    env.__class__ = SlowGridWorld
+    for _ in range(10):
+        await executor.run(env, step_env, "a", "RIGHT")
+    assert executor.active_mode == "thread"
+    assert executor.switches == 2
+    executor.close()
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_enforces_timeout():
+    executor = StepExecutor(mode="thread")
+    env = GridWorld()
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run(env, lambda e: time.sleep(0.5), timeout=0.05)
+    executor.close()
+
+
+def test_engine_defaults_to_thread_and_rejects_process():
+    engine = SimulationEngine(WarehouseEnv(size=10, num_agents=1))
+    assert engine.executor.mode == "thread"
+    # No process mode: the engine and its agents read env directly
+    with pytest.raises(ValueError):
+        engine.set_step_mode("process")
+    with pytest.raises(ValueError):
+        SimulationEngine(step_mode="process")
+    assert engine.executor.mode == "thread"
+    engine.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_auto_measurements_are_consistent_under_concurrent_steps():
+    executor = StepExecutor(mode="auto", sample_size=10**9)
+    env = GridWorld(size=10)
+    await asyncio.gather(*(executor.run(env, lambda e: None) for _ in range(400)))
+    assert executor.samples == 400
+    executor.close()
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        StepExecutor(mode="gpu")
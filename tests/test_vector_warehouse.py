@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Path Setup
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from agent_forge.envs.vector_warehouse import VectorWarehouseEnv
+
+
+class TestVectorWarehouse(unittest.TestCase):
+
+    def _place(self, env, agent_id, pos, battery=100.0):
+        """Moves an already spawned agent, keeping the occupancy grid consistent."""
+        idx = env.agent_index(agent_id)
+        old = tuple(env.positions[idx])
+        env.occupancy[old] -= 1
+        env.positions[idx] = pos
+        env.occupancy[pos] += 1
+        env.batteries[idx] = battery
+
+    def test_spawn_is_collision_free(self):
+        env = VectorWarehouseEnv(size=10, num_agents=20)
+        positions = {env.get_agent_state(f"A{i}")["position"] for i in range(20)}
+        self.assertEqual(len(positions), 20)
+        self.assertEqual(int(env.occupancy.sum()), 20)
+
+    def test_pickup_and_dropoff(self):
+        env = VectorWarehouseEnv(size=10, num_agents=2)
+        env.get_agent_state("A")
+        env.get_agent_state("B")
+        self._place(env, "A", (0, 4))
+        self._place(env, "B", (9, 4))
+
+        results = env.step_batch({"A": "PICKUP", "B": "DROPOFF"})
+        state_a, reward_a, _, info_a = results["A"]
+        state_b, reward_b, _, info_b = results["B"]
+
+        self.assertEqual(state_a["carrying"], "package")
+        self.assertEqual(info_a["event"], "picked_up")
+        self.assertAlmostEqual(reward_a, 0.9)
+        # B carries nothing, so the dropoff is illegal
+        self.assertIsNone(state_b["carrying"])
+        self.assertAlmostEqual(reward_b, -0.6)
+
+    def test_safety_rails_clamp(self):
+        env = VectorWarehouseEnv(size=10, num_agents=1, config={"safety_rails": True})
+        env.get_agent_state("A")
+        self._place(env, "A", (9, 9))
+
+        state, reward, _, _ = env.step("RIGHT", agent_id="A")
+        self.assertEqual(state["position"], (9, 9))
+        self.assertAlmostEqual(reward, -1.1)
+
+    def test_out_of_bounds_without_rails(self):
+        env = VectorWarehouseEnv(size=10, num_agents=1)
+        env.get_agent_state("A")
+        self._place(env, "A", (9, 5))
+
+        state, _, _, _ = env.step("RIGHT", agent_id="A")
+        self.assertEqual(state["position"], (10, 5))
+        # Off-grid agents are not on the occupancy grid
+        self.assertEqual(int(env.occupancy.sum()), 0)
+
+    def test_battery_depletion(self):
+        env = VectorWarehouseEnv(size=10, num_agents=1)
+        env.get_agent_state("A")
+        self._place(env, "A", (5, 5), battery=0.001)
+
+        _, _, done, info = env.step("STAY", agent_id="A")
+        self.assertTrue(done)
+        self.assertEqual(info["event"], "battery_depleted")
+
+    def test_occupancy_tracks_moves(self):
+        env = VectorWarehouseEnv(size=10, num_agents=2)
+        env.get_agent_state("A")
+        env.get_agent_state("B")
+        self._place(env, "A", (4, 4))
+        self._place(env, "B", (6, 6))
+
+        env.step_batch({"A": "RIGHT", "B": "LEFT"})
+        self.assertTrue(env.is_occupied((5, 4)))
+        self.assertTrue(env.is_occupied((5, 6)))
+        self.assertFalse(env.is_occupied((4, 4)))
+        self.assertFalse(env.is_occupied((5, 4), exclude_agent="A"))
+
+    def test_agents_view_writes_through(self):
+        """env.agents[a][field] = value updates the arrays and the occupancy grid."""
+        env = VectorWarehouseEnv(size=10, num_agents=1)
+        env.get_agent_state("A")
+        env.agents["A"]["battery"] = 5.0
+        env.agents["A"]["position"] = (2, 3)
+        env.agents["A"]["carrying"] = "package"
+
+        self.assertEqual(env.get_agent_state("A")["battery"], 5.0)
+        self.assertEqual(env.agents["A"]["position"], (2, 3))
+        self.assertEqual(dict(env.agents["A"])["carrying"], "package")
+        self.assertTrue(env.is_occupied((2, 3)))
+        self.assertEqual(int(env.occupancy.sum()), 1)
+        with self.assertRaises(KeyError):
+            env.agents["A"]["color"] = "red"
+
+    def test_large_fleet_batch(self):
+        """1000 agents on a 1000x1000 grid step in one call and capacity grows past num_agents."""
+        env = VectorWarehouseEnv(size=1000, num_agents=500, config={"safety_rails": True})
+        actions = {f"A{i}": ["UP", "DOWN", "LEFT", "RIGHT"][i % 4] for i in range(1000)}
+
+        results = env.step_batch(actions)
+        self.assertEqual(len(results), 1000)
+        self.assertEqual(int(env.occupancy.sum()), 1000)
+        self.assertTrue(np.all(env.batteries[:1000] < 100.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
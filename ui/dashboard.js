@@ -1,3 +1,51 @@
+// Binary live-feed frames (layout in src/agent_forge/server/frame_codec.py)
+function decodeFrame(buffer) {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const utf8 = new TextDecoder();
+    let offset = 0;
+    const kind = view.getUint8(offset);
+    const seqId = view.getUint32(offset + 2, true);
+    const fromSeq = view.getUint32(offset + 6, true);
+    const count = view.getUint32(offset + 10, true);
+    const timestamp = view.getFloat64(offset + 14, true);
+    offset = 22;
+
+    const readStr = () => {
+        const len = view.getUint16(offset, true);
+        offset += 2;
+        if (len === 0xFFFF) return null;
+        const value = utf8.decode(bytes.subarray(offset, offset + len));
+        offset += len;
+        return value;
+    };
+
+    const agents = {};
+    for (let i = 0; i < count; i++) {
+        const id = readStr();
+        const mask = view.getUint8(offset);
+        offset += 1;
+        const fields = {};
+        if (mask & 0x01) {
+            fields.position = [view.getInt32(offset, true), view.getInt32(offset + 4, true)];
+            offset += 8;
+        }
+        if (mask & 0x02) {
+            fields.battery = Math.round(view.getFloat32(offset, true) * 1000) / 1000;
+            offset += 4;
+        }
+        if (mask & 0x04) {
+            fields.carrying = readStr();
+        }
+        agents[id] = fields;
+    }
+
+    const eventsLen = view.getUint32(offset, true);
+    offset += 4;
+    const events = eventsLen ? JSON.parse(utf8.decode(bytes.subarray(offset, offset + eventsLen))) : [];
+    return { type: kind === 2 ? "keyframe" : "delta", seq_id: seqId, from_seq: fromSeq, agents, events, timestamp };
+}
+
 function Dashboard() {
     const [status, setStatus] = useState("DISCONNECTED");
     const [agents, setAgents] = useState({});
@@ -12,13 +60,14 @@ function Dashboard() {
     useEffect(() => {
         // Portable connection
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const ws = new WebSocket(`${protocol}//${window.location.host}/ws/state`);
+        const ws = new WebSocket(`${protocol}//${window.location.host}/ws/state/default?encoding=binary`);
+        ws.binaryType = "arraybuffer";
 
         ws.onopen = () => setStatus("CONNECTED");
         ws.onclose = () => setStatus("DISCONNECTED");
 
         ws.onmessage = (event) => {
-            const msg = JSON.parse(event.data);
+            const msg = typeof event.data === "string" ? JSON.parse(event.data) : decodeFrame(event.data);
 
             if (msg.type === "step") {
                 // Update specific agent
@@ -39,6 +88,29 @@ function Dashboard() {
                     // setRiskScore(prev => Math.min(100, prev + 1)); 
                     addLog(`BLOCKED: ${msg.agent_id} waiting at ${msg.observation.position}`, "warning");
                 }
+            } else if (msg.type === "tick") {
+                // Lockstep tick: one frame carries every agent's observation
+                setAgents(prev => ({
+                    ...prev,
+                    ...msg.observations
+                }));
+            } else if (msg.type === "delta" || msg.type === "keyframe") {
+                // Compact feed: deltas carry only changed fields, keyframes the full state
+                setAgents(prev => {
+                    const next = msg.type === "keyframe" ? {} : { ...prev };
+                    for (const [id, fields] of Object.entries(msg.agents)) {
+                        next[id] = { ...(msg.type === "keyframe" ? {} : next[id]), ...fields };
+                    }
+                    return next;
+                });
+                for (const ev of msg.events || []) {
+                    if (ev.event === "collision" || ev.severity === "critical") {
+                        setRiskScore(prev => Math.min(100, prev + 20));
+                        addLog(`${ev.event.toUpperCase()}: ${ev.agent_id}`, "critical");
+                    } else if (ev.event === "blocked") {
+                        addLog(`BLOCKED: ${ev.agent_id}`, "warning");
+                    }
+                }
             } else if (msg.type === "snapshot") {
                 // Full state replace
                 setAgents(msg.data);
@@ -154,7 +226,7 @@ function Dashboard() {
                     <div className="bg-slate-900 p-4 rounded-lg border border-slate-700">
                         <h3 className="text-slate-400 mb-2">CONTROLS</h3>
                         <div className="flex gap-2">
-                            <button onClick={() => fetch('/api/sim/start', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ vertical: 'logistics' }) })}
+                            <button onClick={() => fetch('/api/sim/start', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ vertical: 'logistics', delta_updates: true }) })}
                                 className="px-4 py-2 bg-blue-600 hover:bg-blue-500 rounded text-white font-bold w-full">
                                 START FLEET
                             </button>